@@ -32,6 +32,17 @@ log_info() {
   echo "[$(date -u '+%Y-%m-%dT%H:%M:%SZ')] INFO: $1" >> "$ERROR_LOG"
 }
 
+# Detach from the vibe.db watcher started by session-start.sh; the last
+# session on this project to detach stops it
+HOOK_INPUT=""
+[ -t 0 ] || HOOK_INPUT="$(cat 2>/dev/null || true)"
+SESSION_ID="$(printf '%s' "$HOOK_INPUT" | sed -n 's/.*"session_id"[[:space:]]*:[[:space:]]*"\([^"]*\)".*/\1/p' | head -n 1)"
+VIBE_SYNC_SCRIPT="$HOME/.claude/scripts/vibe-sync.py"
+if [ -f "$MEMORY_DIR/vibe-watch.sessions" ] && [ -f "$VIBE_SYNC_SCRIPT" ]; then
+  python3 "$VIBE_SYNC_SCRIPT" watch --detach ${SESSION_ID:+--session "$SESSION_ID"} >/dev/null 2>&1 \
+    || log_error "vibe watcher detach failed"
+fi
+
 # Check if Workshop is available
 if ! command -v claude-workshop >/dev/null 2>&1; then
   echo "Workshop not installed - session not captured"
@@ -89,7 +100,7 @@ if [ "$CHANGED_FILES" -gt 0 ] || [ -n "$RECENT_COMMIT" ]; then
   fi
 
   claude-workshop --workspace "$MEMORY_DIR" note "$SESSION_SUMMARY" \
-    --tags "session" "auto-captured" 2>/dev/null || true
+    --tags "session" --tags "auto-captured" 2>/dev/null || true
 fi
 
 # ============================================================
@@ -103,7 +114,15 @@ if [ -d "$TEMP_DIR" ]; then
   find "$TEMP_DIR" -type d -empty -delete 2>/dev/null || true
 fi
 
-# Manual pruning: workshop clear "30 days ago" --type note
+# ============================================================
+# RETENTION: Expire old auto-captured entries (at most once a day)
+# ============================================================
+
+# Policies: .claude/memory/retention.json (defaults expire only
+# auto-imported/auto-captured entries). Manual pruning:
+#   claude-workshop prune --type note --older-than 30
+claude-workshop --workspace "$MEMORY_DIR" prune --min-interval 24 >/dev/null 2>>"$ERROR_LOG" \
+  || log_error "Workshop prune failed"
 
 # ============================================================
 # SUMMARY
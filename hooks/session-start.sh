@@ -29,6 +29,11 @@ WORKSHOP_DIR=".claude/memory"
 VIBE_DB="$WORKSHOP_DIR/vibe.db"
 VIBE_SYNC_SCRIPT="$HOME/.claude/scripts/vibe-sync.py"
 
+# Hook input (JSON on stdin); its session_id attaches us to the vibe watcher
+HOOK_INPUT=""
+[ -t 0 ] || HOOK_INPUT="$(cat 2>/dev/null || true)"
+SESSION_ID="$(printf '%s' "$HOOK_INPUT" | sed -n 's/.*"session_id"[[:space:]]*:[[:space:]]*"\([^"]*\)".*/\1/p' | head -n 1)"
+
 # ============================================================
 # UTILITIES
 # ============================================================
@@ -111,8 +116,11 @@ if [ -f "$VIBE_DB" ]; then
 
   # Optionally sync on session start (if vibe-sync.py exists)
   if [ -f "$VIBE_SYNC_SCRIPT" ] && command -v python3 >/dev/null 2>&1; then
-    # Run sync in background to not block startup
-    (python3 "$VIBE_SYNC_SCRIPT" sync >/dev/null 2>&1 &) || {
+    # Run sync in background to not block startup, then keep vibe.db live
+    # with one watcher per project (watch attaches this session and exits at
+    # once if one is running; session-end.sh detaches it)
+    ( (python3 "$VIBE_SYNC_SCRIPT" sync
+       python3 "$VIBE_SYNC_SCRIPT" watch ${SESSION_ID:+--session "$SESSION_ID"}) >/dev/null 2>&1 &) || {
       log_error "vibe" "Background sync failed"
     }
   fi
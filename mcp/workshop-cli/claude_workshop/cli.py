@@ -1,5 +1,9 @@
 """
 CLI interface for claude-workshop.
+
+Hooks call this many times per session, so module import stays light: rich
+and the transcript importer load only on the paths that use them, and the
+--json outputs never import rich.
 """
 
 import json
@@ -9,15 +13,28 @@ from datetime import datetime
 from typing import Optional
 
 import click
-from rich.console import Console
-from rich.table import Table
 
 from . import __version__
 from .db import Database
-from .import_jsonl import import_transcripts
+from .dedup import SIMILARITY_THRESHOLD
+from .models import Entry
 from .search import extract_domain, rank_entries, strip_domain_prefix
 
-console = Console()
+
+class _LazyConsole:
+    """rich Console, created on first use."""
+
+    _console = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
 
 
 def get_default_workspace() -> str:
@@ -278,55 +295,61 @@ def recent(ctx, limit: int):
 
 
 @main.command()
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
 @click.pass_context
-def context(ctx):
+def context(ctx, as_json: bool):
     """Get session context summary."""
     workspace = ctx.obj["workspace"]
     db = Database(workspace)
 
     if not db.exists():
-        console.print("Workshop not initialized. Run: claude-workshop init")
+        if as_json:
+            click.echo("{}")
+        else:
+            click.echo("Workshop not initialized. Run: claude-workshop init")
         return
 
-    stats = db.get_stats()
-    decisions = db.get_entries_by_type("decision", limit=5)
-    gotchas = db.get_entries_by_type("gotcha", limit=5)
-    recent = db.get_recent_entries(limit=3)
+    # Materialized summary: a single query, whatever the size of the DB
+    summary = db.get_context_summary()
     db.close()
 
-    console.print("\n[bold]Workshop Context Summary[/bold]\n")
-    console.print(f"Total entries: {stats['total']}")
-    for t, count in stats.get("by_type", {}).items():
-        console.print(f"  - {t}s: {count}")
-    console.print()
+    if as_json:
+        click.echo(json.dumps(summary, indent=2))
+        return
 
-    if decisions:
-        console.print("[blue]Recent Decisions:[/blue]")
-        for d in decisions[:3]:
-            domain_str = f"[{d.domain}] " if d.domain else ""
-            console.print(f"  - {domain_str}{d.content[:60]}")
-        console.print()
+    # Plain text: this runs at every session start, so no rich
+    lines = ["", "Workshop Context Summary", ""]
+    lines.append(f"Total entries: {summary['total']}")
+    for t, count in summary["by_type"].items():
+        lines.append(f"  - {t}s: {count}")
+    lines.append("")
 
-    if gotchas:
-        console.print("[red]Active Gotchas:[/red]")
-        for g in gotchas[:3]:
-            domain_str = f"[{g.domain}] " if g.domain else ""
-            console.print(f"  - {domain_str}{g.content[:60]}")
-        console.print()
+    for key, title in (("decisions", "Recent Decisions:"), ("gotchas", "Active Gotchas:")):
+        if summary[key]:
+            lines.append(title)
+            for e in summary[key]:
+                domain_str = f"[{e['domain']}] " if e["domain"] else ""
+                lines.append(f"  - {domain_str}{e['content'][:60]}")
+            lines.append("")
 
-    if recent:
-        console.print("[green]Latest Activity:[/green]")
-        for r in recent:
-            date_str = r.created_at.strftime("%Y-%m-%d %H:%M")
-            console.print(f"  [{date_str}] {r.type}: {r.content[:50]}")
-        console.print()
+    if summary["recent"]:
+        lines.append("Latest Activity:")
+        for r in summary["recent"]:
+            date_str = r["timestamp"][:16].replace("T", " ")
+            lines.append(f"  [{date_str}] {r['type']}: {r['content'][:50]}")
+        lines.append("")
+
+    click.echo("\n".join(lines))
 
 
 @main.command("import")
 @click.option("--execute", is_flag=True, help="Actually import (default: preview)")
 @click.option("--path", default=None, help="Path to search for JSONL files")
+@click.option("--near-dups", is_flag=True, help="Also merge near-duplicate entries (MinHash/LSH)")
+@click.option("--similarity", default=SIMILARITY_THRESHOLD, show_default=True,
+              type=click.FloatRange(0, 1), help="Jaccard similarity for --near-dups")
 @click.pass_context
-def import_cmd(ctx, execute: bool, path: Optional[str]):
+def import_cmd(ctx, execute: bool, path: Optional[str], near_dups: bool, similarity: float):
     """Import from JSONL transcripts."""
     workspace = ctx.obj["workspace"]
     db = Database(workspace)
@@ -335,7 +358,11 @@ def import_cmd(ctx, execute: bool, path: Optional[str]):
         console.print("[red]Database not initialized. Run: claude-workshop init[/red]")
         sys.exit(1)
 
-    summary = import_transcripts(db, base_path=path, execute=execute)
+    from .import_jsonl import import_transcripts
+
+    summary = import_transcripts(
+        db, base_path=path, execute=execute, near_duplicates=near_dups, threshold=similarity
+    )
     db.close()
 
     if execute:
@@ -343,6 +370,9 @@ def import_cmd(ctx, execute: bool, path: Optional[str]):
         console.print(f"  Files processed: {summary['files_found']}")
         console.print(f"  Files skipped (already imported): {summary['files_skipped']}")
         console.print(f"  Entries imported: {summary['entries_imported']}")
+        console.print(f"  Duplicates merged: {summary['entries_duplicate']}")
+        if near_dups:
+            console.print(f"  Near duplicates merged: {summary['entries_near_duplicate']}")
     else:
         console.print(f"\n[yellow]Import preview (use --execute to import):[/yellow]")
         console.print(f"  Files found: {summary['files_found']}")
@@ -426,29 +456,41 @@ def delete(ctx, entry_id: int):
 @main.command()
 @click.option("-t", "--type", "entry_type", help="Filter by type")
 @click.option("--full", is_flag=True, help="Show full content")
-@click.option("--limit", default=50, help="Maximum entries")
+@click.option("--limit", default=50, type=click.IntRange(min=1), help="Entries per page")
+@click.option("--cursor", default=None, help="Continue after a previous page")
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
 @click.pass_context
-def read(ctx, entry_type: Optional[str], full: bool, limit: int):
-    """Read entries with optional filters."""
+def read(ctx, entry_type: Optional[str], full: bool, limit: int, cursor: Optional[str],
+         as_json: bool):
+    """Read entries with optional filters, newest first, a page at a time."""
     workspace = ctx.obj["workspace"]
     db = Database(workspace)
 
     if not db.exists():
-        console.print("[red]Database not initialized.[/red]")
+        if as_json:
+            click.echo(json.dumps({"entries": [], "next_cursor": None}))
+        else:
+            console.print("[red]Database not initialized.[/red]")
         return
 
-    if entry_type:
-        entries = db.get_entries_by_type(entry_type, limit=limit)
-    else:
-        entries = db.get_recent_entries(limit=limit)
-
+    try:
+        entries, next_cursor = db.get_entries_page(entry_type, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--cursor")
     db.close()
 
+    if as_json:
+        click.echo(json.dumps(
+            {"entries": [e.to_dict() for e in entries], "next_cursor": next_cursor}, indent=2))
+        return
+
     if not entries:
         console.print("[yellow]No entries found.[/yellow]")
         return
 
     # Create table
+    from rich.table import Table
+
     table = Table(title=f"Entries ({len(entries)})")
     table.add_column("ID", style="cyan", width=6)
     table.add_column("Date", style="green", width=12)
@@ -473,6 +515,171 @@ def read(ctx, entry_type: Optional[str], full: bool, limit: int):
             table.add_row(str(entry.id), date_str, entry.type, content)
 
     console.print(table)
+    if next_cursor:
+        click.echo(f"Next page: claude-workshop read --cursor '{next_cursor}'")
+
+
+@main.command()
+@click.option("--format", "fmt", type=click.Choice(["jsonl"]), default="jsonl",
+              help="Output format")
+@click.option("-t", "--type", "entry_type", help="Filter by type")
+@click.option("--query", default=None, help="Only entries containing this text")
+@click.option("-o", "--output", type=click.File("w"), default="-", help="Output file (default: stdout)")
+@click.pass_context
+def export(ctx, fmt: str, entry_type: Optional[str], query: Optional[str], output):
+    """Stream entries out, newest first, in constant memory."""
+    workspace = ctx.obj["workspace"]
+    db = Database(workspace)
+
+    if not db.exists():
+        click.echo("Database not initialized. Run: claude-workshop init", err=True)
+        sys.exit(1)
+
+    count = 0
+    for row, tags in db.iter_entry_rows(type=entry_type, query=query):
+        output.write(json.dumps(Entry.from_row(row, tags).to_dict()) + "\n")
+        count += 1
+    db.close()
+
+    click.echo(f"Exported {count} entries", err=True)
+
+
+@main.command()
+@click.argument("source", type=click.File("r"), default="-")
+@click.option("--batch-size", default=1000, type=click.IntRange(min=1),
+              help="Entries per transaction")
+@click.pass_context
+def load(ctx, source, batch_size: int):
+    """Load entries from JSONL (as written by export)."""
+    workspace = ctx.obj["workspace"]
+    db = Database(workspace)
+
+    if not db.exists():
+        click.echo("Database not initialized. Run: claude-workshop init", err=True)
+        sys.exit(1)
+
+    parse_errors = 0
+
+    def records():
+        nonlocal parse_errors
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                parse_errors += 1
+
+    stats = db.load_entries(records(), batch_size=batch_size)
+    db.close()
+
+    click.echo(f"Loaded {stats['loaded']} entries, {stats['duplicates']} duplicates merged "
+               f"({stats['errors'] + parse_errors} skipped)", err=True)
+
+
+@main.command()
+@click.option("-t", "--type", "entry_type", help="Only entries of this type")
+@click.option("--tag", default=None, help="Only entries with this tag")
+@click.option("--older-than", type=click.IntRange(min=0), default=None,
+              help="Remove entries not recorded for this many days")
+@click.option("--max-rows", type=click.IntRange(min=0), default=None,
+              help="Keep only this many most recently recorded entries")
+@click.option("--dry-run", is_flag=True, help="Count what would be removed")
+@click.option("--min-interval", type=click.FloatRange(min=0), default=0,
+              help="Skip if the last prune was less than this many hours ago")
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+@click.pass_context
+def prune(ctx, entry_type: Optional[str], tag: Optional[str], older_than: Optional[int],
+          max_rows: Optional[int], dry_run: bool, min_interval: float, as_json: bool):
+    """Remove expired entries and reclaim their space.
+
+    With --older-than/--max-rows, applies that one policy (narrowed by
+    --type/--tag). Otherwise applies the workspace's retention.json, or the
+    defaults, which only expire auto-imported and auto-captured entries.
+    """
+    from .models import RetentionPolicy
+    from .retention import load_policies
+
+    workspace = ctx.obj["workspace"]
+    db = Database(workspace)
+
+    if not db.exists():
+        click.echo("Database not initialized. Run: claude-workshop init", err=True)
+        sys.exit(1)
+
+    if older_than is not None or max_rows is not None:
+        policies = [RetentionPolicy(entry_type, tag, older_than, max_rows)]
+    elif entry_type or tag:
+        raise click.UsageError("--type/--tag need --older-than or --max-rows")
+    else:
+        try:
+            policies = load_policies(workspace)
+        except ValueError as e:
+            raise click.ClickException(f"Invalid retention policy: {e}")
+
+    last_run = db.get_last_maintenance("prune")
+    if min_interval and not dry_run and last_run \
+            and (datetime.utcnow() - last_run).total_seconds() < min_interval * 3600:
+        db.close()
+        if as_json:
+            click.echo(json.dumps({"skipped": True, "last_run": last_run.isoformat() + "Z"}))
+        return
+
+    counts = db.prune(policies, dry_run=dry_run)
+    vacuum = None if dry_run else db.incremental_vacuum()
+    db.close()
+
+    if as_json:
+        click.echo(json.dumps({
+            "dry_run": dry_run,
+            "policies": [dict(p.to_dict(), removed=n) for p, n in zip(policies, counts)],
+            "removed": sum(counts),
+            "vacuum": vacuum,
+        }, indent=2))
+        return
+
+    verb = "Would remove" if dry_run else "Removed"
+    for policy, count in zip(policies, counts):
+        scope = ", ".join(f"{k}={v}" for k, v in policy.to_dict().items())
+        click.echo(f"  {count:6d}  {scope}")
+    click.echo(f"{verb} {sum(counts)} entries")
+    if vacuum:
+        kb = vacuum["freed_pages"] * vacuum["page_size"] // 1024
+        converted = " (converted to auto_vacuum=INCREMENTAL)" if vacuum["converted"] else ""
+        click.echo(f"Reclaimed {vacuum['freed_pages']} pages ({kb} KB){converted}")
+
+
+@main.command()
+@click.pass_context
+def serve(ctx):
+    """Serve JSON-RPC/MCP requests on stdin/stdout (keeps the DB open)."""
+    from .server import WorkshopServer
+
+    WorkshopServer(ctx.obj["workspace"]).serve()
+
+
+@main.command()
+@click.option("--query", default="database", help="Query for the timed why calls")
+@click.option("--runs", default=20, help="Calls per mode")
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+@click.pass_context
+def bench(ctx, query: str, runs: int, as_json: bool):
+    """Compare per-call latency of CLI calls and the serve mode."""
+    from .server import benchmark
+
+    report = benchmark(ctx.obj["workspace"], query=query, runs=max(1, runs))
+
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+
+    click.echo(f"why --json '{query}', {report['runs']} calls per mode (ms)")
+    for label, key in (("CLI process per call", "cli_ms"), ("serve, one per call", "serve_ms")):
+        t = report[key]
+        click.echo(f"  {label:<22} p50 {t['p50']:8.2f}  mean {t['mean']:8.2f}  max {t['max']:8.2f}")
+    click.echo(f"  {'serve, one batch':<22} {report['batch_ms_per_call']:8.3f} per call")
+    click.echo(f"  serve start-up {report['serve_startup_ms']:.1f} ms, "
+               f"p50 speedup {report['speedup_p50']}x")
 
 
 if __name__ == "__main__":
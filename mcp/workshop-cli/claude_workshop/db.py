@@ -2,13 +2,17 @@
 Database operations for claude-workshop.
 """
 
+import json
 import os
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
-from .models import Entry, ImportRecord
+from .dedup import content_hash
+from .models import Entry, ImportRecord, RetentionPolicy
+from .retention import AUTO_TAGS
 
 SCHEMA = """
 -- Entries table
@@ -48,6 +52,164 @@ CREATE INDEX IF NOT EXISTS idx_tags_entry ON tags(entry_id);
 CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);
 """
 
+# Materialized `context` summary. entry_counts is kept exact by triggers;
+# context_summary holds the summary as JSON and is marked stale by any change
+# to entries or tags, whoever makes it. Database.refresh_context_summary()
+# rebuilds it from a few LIMIT-3 index probes, so neither writes nor
+# `context` reads scale with the size of the table.
+CONTEXT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entry_counts (
+    type TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR REPLACE INTO entry_counts (type, count)
+    SELECT type, COUNT(*) FROM entries GROUP BY type;
+
+CREATE TABLE IF NOT EXISTS context_summary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    summary TEXT,
+    stale INTEGER NOT NULL DEFAULT 1,
+    updated_at TEXT
+);
+INSERT OR IGNORE INTO context_summary (id, stale) VALUES (1, 1);
+
+CREATE INDEX IF NOT EXISTS idx_entries_type_created ON entries(type, created_at DESC);
+
+CREATE TRIGGER IF NOT EXISTS trg_entries_insert AFTER INSERT ON entries BEGIN
+    INSERT OR IGNORE INTO entry_counts (type, count) VALUES (NEW.type, 0);
+    UPDATE entry_counts SET count = count + 1 WHERE type = NEW.type;
+    UPDATE context_summary SET stale = 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE entry_counts SET count = count - 1 WHERE type = OLD.type;
+    UPDATE context_summary SET stale = 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_entries_update AFTER UPDATE ON entries BEGIN
+    UPDATE entry_counts SET count = count - 1 WHERE type = OLD.type;
+    INSERT OR IGNORE INTO entry_counts (type, count) VALUES (NEW.type, 0);
+    UPDATE entry_counts SET count = count + 1 WHERE type = NEW.type;
+    UPDATE context_summary SET stale = 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tags_insert AFTER INSERT ON tags BEGIN
+    UPDATE context_summary SET stale = 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_tags_delete AFTER DELETE ON tags BEGIN
+    UPDATE context_summary SET stale = 1 WHERE id = 1;
+END;
+"""
+
+# Keyset pagination walks (created_at, id) newest first. Scanning these
+# ascending indexes backwards serves ORDER BY created_at DESC, id DESC with
+# no sort step; they replace the single-column created_at indexes.
+KEYSET_SCHEMA = """
+DROP INDEX IF EXISTS idx_entries_created;
+DROP INDEX IF EXISTS idx_entries_type_created;
+CREATE INDEX IF NOT EXISTS idx_entries_created_id ON entries(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_entries_type_created_id ON entries(type, created_at, id);
+"""
+
+# Exact duplicates (same type, domain and normalized content, see
+# dedup.content_hash) collapse into one row whose occurrences counts how often
+# the entry was recorded. Existing duplicates are folded into their oldest
+# copy, keeping the union of their tags, except that a group with a
+# hand-recorded member (no auto-* tag, see retention.AUTO_TAGS) loses its
+# auto-* tags so retention doesn't expire it. entry_lsh holds the near-duplicate
+# index (dedup.NearDuplicateIndex), filled only when near-duplicate checks run.
+DEDUP_SCHEMA = """
+ALTER TABLE entries ADD COLUMN content_hash TEXT;
+ALTER TABLE entries ADD COLUMN occurrences INTEGER NOT NULL DEFAULT 1;
+UPDATE entries SET content_hash = workshop_content_hash(type, content, domain);
+CREATE INDEX idx_entries_hash_migrate ON entries(content_hash, id);
+
+CREATE TEMP TABLE duplicate_of (id INTEGER PRIMARY KEY, keep INTEGER NOT NULL);
+INSERT INTO duplicate_of (id, keep)
+    SELECT e.id, (SELECT MIN(k.id) FROM entries k WHERE k.content_hash = e.content_hash)
+    FROM entries e;
+CREATE INDEX temp.idx_duplicate_of_keep ON duplicate_of(keep);
+DELETE FROM tags WHERE tag IN ('auto-imported', 'auto-captured') AND entry_id IN (
+    SELECT d.id FROM duplicate_of d
+    WHERE d.keep IN (SELECT keep FROM duplicate_of WHERE id != keep)
+    AND EXISTS (
+        SELECT 1 FROM duplicate_of o WHERE o.keep = d.keep AND NOT EXISTS (
+            SELECT 1 FROM tags t
+            WHERE t.entry_id = o.id AND t.tag IN ('auto-imported', 'auto-captured'))));
+DELETE FROM duplicate_of WHERE id = keep;
+INSERT INTO tags (entry_id, tag)
+    SELECT DISTINCT d.keep, t.tag FROM duplicate_of d JOIN tags t ON t.entry_id = d.id
+    WHERE NOT EXISTS (SELECT 1 FROM tags x WHERE x.entry_id = d.keep AND x.tag = t.tag);
+UPDATE entries SET occurrences = occurrences
+    + (SELECT COUNT(*) FROM duplicate_of d WHERE d.keep = entries.id)
+    WHERE id IN (SELECT keep FROM duplicate_of);
+DELETE FROM entries WHERE id IN (SELECT id FROM duplicate_of);
+DROP TABLE duplicate_of;
+
+DROP INDEX idx_entries_hash_migrate;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_content_hash ON entries(content_hash);
+
+CREATE TABLE IF NOT EXISTS entry_lsh (
+    bucket INTEGER NOT NULL,
+    entry_id INTEGER NOT NULL,
+    PRIMARY KEY (bucket, entry_id),
+    FOREIGN KEY (entry_id) REFERENCES entries(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entry_lsh_entry ON entry_lsh(entry_id);
+"""
+
+# When maintenance tasks (prune) last ran, so hooks can run them cheaply
+# at most once per interval
+MAINTENANCE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS maintenance (
+    task TEXT PRIMARY KEY,
+    last_run_at TEXT NOT NULL
+);
+"""
+
+# Entries per list in the context summary
+CONTEXT_ITEMS = 3
+
+# Rows per keyset page when streaming
+PAGE_SIZE = 500
+
+# Schema migrations keyed on PRAGMA user_version: (version, SQL script).
+# Scripts above a DB's version run in order in one transaction, so new
+# tables, backfilled indexes and FTS rebuilds
+# (INSERT INTO t(t) VALUES('rebuild')) reach existing workshop.db files.
+MIGRATIONS = [
+    (1, SCHEMA),
+    (2, CONTEXT_SCHEMA),
+    (3, KEYSET_SCHEMA),
+    (4, DEDUP_SCHEMA),
+    (5, MAINTENANCE_SCHEMA),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def encode_cursor(created_at: str, entry_id: int) -> str:
+    """Opaque keyset position: the last (created_at, id) already seen."""
+    return f"{created_at}|{entry_id}"
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    """Inverse of encode_cursor(); raises ValueError on a malformed cursor."""
+    created_at, sep, entry_id = cursor.rpartition("|")
+    if not sep or not created_at:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return created_at, int(entry_id)
+
+
+def _iter_statements(script: str):
+    """Split a SQL script into statements (executescript() would commit)."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
 
 class Database:
     """SQLite database wrapper for workshop memory."""
@@ -68,6 +230,10 @@ class Database:
         if self._conn is None:
             self._conn = sqlite3.connect(str(self.db_path))
             self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.create_function(
+                "workshop_content_hash", 3, content_hash, deterministic=True
+            )
+            self.migrate()
         return self._conn
 
     def close(self):
@@ -90,10 +256,38 @@ class Database:
         self.workspace.mkdir(parents=True, exist_ok=True)
 
         created = not self.exists()
-        self.conn.executescript(SCHEMA)
-        self.conn.commit()
+        self.conn  # connecting applies the schema migrations
         return created
 
+    def migrate(self) -> int:
+        """Bring the schema up to SCHEMA_VERSION.
+
+        Returns:
+            Number of migrations applied
+        """
+        conn = self._conn
+        current = conn.execute("PRAGMA user_version").fetchone()[0]
+        pending = [(v, script) for v, script in MIGRATIONS if v > current]
+        if not pending:
+            return 0
+
+        if current == 0:
+            # New database: free pages can be returned with incremental_vacuum.
+            # Only takes effect before the first table is created.
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for _, script in pending:
+                for statement in _iter_statements(script):
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return len(pending)
+
     def add_entry(
         self,
         type: str,
@@ -105,27 +299,132 @@ class Database:
     ) -> int:
         """Add a new entry.
 
+        An exact duplicate of an existing entry (same type, domain and
+        normalized content) is not inserted again: the existing entry's
+        occurrences is incremented and the duplicate's tags and reasoning
+        are merged into it (see _add_occurrence).
+
         Returns:
-            Entry ID
+            Entry ID (of the existing entry for a duplicate)
         """
+        entry_id, _ = self._insert_entry(
+            type, content, reasoning, context, domain, datetime.utcnow().isoformat(), tags
+        )
+        self.refresh_context_summary()
+        self.conn.commit()
+        return entry_id
+
+    def _insert_entry(
+        self,
+        type: str,
+        content: str,
+        reasoning: Optional[str],
+        context: Optional[str],
+        domain: Optional[str],
+        created_at: str,
+        tags: Optional[Iterable[str]],
+        occurrences: int = 1,
+    ) -> tuple[int, bool]:
+        """Insert an entry or count another occurrence of it (caller commits).
+
+        Returns:
+            (entry ID, True if a new row was inserted)
+        """
+        digest = content_hash(type, content, domain)
         cursor = self.conn.execute(
             """
-            INSERT INTO entries (type, content, reasoning, context, domain, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO entries
+                (type, content, reasoning, context, domain, created_at, content_hash, occurrences)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(content_hash) DO NOTHING
             """,
-            (type, content, reasoning, context, domain, datetime.utcnow().isoformat()),
+            (type, content, reasoning, context, domain, created_at, digest, occurrences),
         )
-        entry_id = cursor.lastrowid
+        if cursor.rowcount:
+            entry_id, inserted = cursor.lastrowid, True
+        else:
+            entry_id = self.conn.execute(
+                "SELECT id FROM entries WHERE content_hash = ?", (digest,)
+            ).fetchone()[0]
+            self._add_occurrence(entry_id, reasoning, seen_at=created_at, tags=tags,
+                                 count=occurrences)
+            return entry_id, False
+        self._add_tags(entry_id, tags)
+        return entry_id, True
+
+    def _add_occurrence(
+        self,
+        entry_id: int,
+        reasoning: Optional[str],
+        seen_at: str,
+        tags: Optional[Iterable[str]],
+        count: int = 1,
+    ):
+        """Count more occurrences of an entry, merging in their tags and reasoning.
+
+        Provenance tags (AUTO_TAGS) stay only while every occurrence has one:
+        a hand-recorded duplicate of an auto-imported entry removes them, and
+        an auto-imported duplicate of a hand-recorded entry doesn't add them,
+        so retention never expires something recorded by hand. Likewise a
+        hand-recorded reasoning replaces the stored one, while an automatic
+        one only fills it in when missing.
+        """
+        tags = [str(tag).lower() for tag in tags or []]
+        placeholders = ", ".join("?" * len(AUTO_TAGS))
+        incoming_auto = any(tag in AUTO_TAGS for tag in tags)
+        existing_auto = self.conn.execute(
+            f"SELECT 1 FROM tags WHERE entry_id = ? AND tag IN ({placeholders})",
+            (entry_id, *AUTO_TAGS),
+        ).fetchone() is not None
+
+        if not (incoming_auto and existing_auto):
+            self.conn.execute(
+                f"DELETE FROM tags WHERE entry_id = ? AND tag IN ({placeholders})",
+                (entry_id, *AUTO_TAGS),
+            )
+            tags = [tag for tag in tags if tag not in AUTO_TAGS]
+        merged_reasoning = "COALESCE(reasoning, ?)" if incoming_auto else "COALESCE(?, reasoning)"
+        self.conn.execute(
+            f"""
+            UPDATE entries
+            SET occurrences = occurrences + ?, updated_at = ?, reasoning = {merged_reasoning}
+            WHERE id = ?
+            """,
+            (count, seen_at, reasoning, entry_id),
+        )
+        self._add_tags(entry_id, tags)
 
-        if tags:
-            for tag in tags:
-                self.conn.execute(
-                    "INSERT INTO tags (entry_id, tag) VALUES (?, ?)",
-                    (entry_id, tag.lower()),
-                )
+    def _add_tags(self, entry_id: int, tags: Optional[Iterable[str]]):
+        """Add tags the entry doesn't have yet."""
+        for tag in dict.fromkeys(str(tag).lower() for tag in tags or []):
+            self.conn.execute(
+                """
+                INSERT INTO tags (entry_id, tag)
+                SELECT ?, ? WHERE NOT EXISTS (SELECT 1 FROM tags WHERE entry_id = ? AND tag = ?)
+                """,
+                (entry_id, tag, entry_id, tag),
+            )
 
+    def find_duplicate(
+        self, type: str, content: str, domain: Optional[str] = None
+    ) -> Optional[int]:
+        """ID of the exact duplicate of this entry, if one exists."""
+        row = self.conn.execute(
+            "SELECT id FROM entries WHERE content_hash = ?",
+            (content_hash(type, content, domain),),
+        ).fetchone()
+        return row[0] if row else None
+
+    def add_occurrence(
+        self,
+        entry_id: int,
+        reasoning: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+    ):
+        """Count another occurrence of an entry (e.g. a near duplicate of it)."""
+        self._add_occurrence(entry_id, reasoning, datetime.utcnow().isoformat(), tags)
+        self.refresh_context_summary()
         self.conn.commit()
-        return entry_id
 
     def get_entry(self, entry_id: int) -> Optional[Entry]:
         """Get entry by ID."""
@@ -146,6 +445,25 @@ class Database:
         )
         return [row[0] for row in cursor.fetchall()]
 
+    def _get_tags_for(self, entry_ids: list[int]) -> dict[int, list[str]]:
+        """Get tags for many entries in one query."""
+        tags: dict[int, list[str]] = {}
+        if not entry_ids:
+            return tags
+        placeholders = ",".join("?" for _ in entry_ids)
+        cursor = self.conn.execute(
+            f"SELECT entry_id, tag FROM tags WHERE entry_id IN ({placeholders})",
+            entry_ids,
+        )
+        for entry_id, tag in cursor:
+            tags.setdefault(entry_id, []).append(tag)
+        return tags
+
+    def _entries_from_rows(self, rows: list[tuple]) -> list[Entry]:
+        """Build entries from rows, loading all their tags at once."""
+        tags = self._get_tags_for([row[0] for row in rows])
+        return [Entry.from_row(row, tags.get(row[0], [])) for row in rows]
+
     def get_entries_by_type(
         self, type: str, limit: int = 50
     ) -> list[Entry]:
@@ -159,11 +477,7 @@ class Database:
             """,
             (type, limit),
         )
-        entries = []
-        for row in cursor.fetchall():
-            tags = self._get_tags(row[0])
-            entries.append(Entry.from_row(row, tags))
-        return entries
+        return self._entries_from_rows(cursor.fetchall())
 
     def get_recent_entries(self, limit: int = 10) -> list[Entry]:
         """Get most recent entries of all types."""
@@ -175,11 +489,7 @@ class Database:
             """,
             (limit,),
         )
-        entries = []
-        for row in cursor.fetchall():
-            tags = self._get_tags(row[0])
-            entries.append(Entry.from_row(row, tags))
-        return entries
+        return self._entries_from_rows(cursor.fetchall())
 
     def search_entries(
         self,
@@ -212,11 +522,177 @@ class Database:
                 (query_lower, query_lower, query_lower, limit),
             )
 
-        entries = []
-        for row in cursor.fetchall():
-            tags = self._get_tags(row[0])
-            entries.append(Entry.from_row(row, tags))
-        return entries
+        return self._entries_from_rows(cursor.fetchall())
+
+    def iter_entry_rows(
+        self,
+        type: Optional[str] = None,
+        query: Optional[str] = None,
+        cursor: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+    ) -> Iterator[tuple[tuple, list[str]]]:
+        """Yield (row, tags) newest first, one keyset page at a time.
+
+        Each page is an index range scan after the previous page's last
+        (created_at, id), so memory stays flat and late pages cost the same
+        as the first.
+
+        Args:
+            type: Only entries of this type
+            query: Only entries whose content, reasoning or domain contains this
+            cursor: Start after this position (see encode_cursor)
+            page_size: Rows fetched per query
+        """
+        where, params = [], []
+        if type:
+            where.append("type = ?")
+            params.append(type)
+        if query:
+            query_lower = f"%{query.lower()}%"
+            where.append("(LOWER(content) LIKE ? OR LOWER(reasoning) LIKE ? OR LOWER(domain) LIKE ?)")
+            params += [query_lower] * 3
+
+        position = decode_cursor(cursor) if cursor else None
+        while True:
+            clauses, page_params = list(where), list(params)
+            if position:
+                clauses.append("(created_at, id) < (?, ?)")
+                page_params += position
+            sql = "SELECT * FROM entries"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " ORDER BY created_at DESC, id DESC LIMIT ?"
+
+            rows = self.conn.execute(sql, page_params + [page_size]).fetchall()
+            tags = self._get_tags_for([row[0] for row in rows])
+            for row in rows:
+                yield row, tags.get(row[0], [])
+            if len(rows) < page_size:
+                return
+            position = (rows[-1][6], rows[-1][0])
+
+    def get_entries_page(
+        self,
+        type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> tuple[list[Entry], Optional[str]]:
+        """Get one page of entries, newest first.
+
+        Returns:
+            (entries, cursor for the next page or None if this was the last)
+
+        Raises:
+            ValueError: limit is below 1, or the cursor is malformed
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        # One row past the page tells whether there is a next page
+        rows = list(islice(self.iter_entry_rows(type=type, cursor=cursor, page_size=limit + 1),
+                           limit + 1))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last, _ = rows[-1]
+            next_cursor = encode_cursor(last[6], last[0])
+        return [Entry.from_row(row, tags) for row, tags in rows], next_cursor
+
+    def load_entries(self, records: Iterable[dict], batch_size: int = 1000) -> dict:
+        """Insert exported entries (Entry.to_dict() form), batch_size per transaction.
+
+        Records keep their type, content, reasoning, context, domain, tags and
+        timestamp; ids are reassigned. Exact duplicates of existing entries
+        add to their occurrences. Invalid records are counted and skipped.
+
+        Returns:
+            {"loaded": n, "duplicates": n, "errors": n}
+        """
+        stats = {"loaded": 0, "duplicates": 0, "errors": 0}
+        conn = self.conn
+        pending = 0
+        conn.execute("BEGIN")
+        try:
+            for record in records:
+                # A bad record must not leave a half-written entry behind
+                conn.execute("SAVEPOINT load_entry")
+                try:
+                    timestamp = record.get("timestamp") or datetime.utcnow().isoformat()
+                    tags = [str(tag) for tag in record.get("tags") or []]
+                    _, inserted = self._insert_entry(
+                        record["type"], record["content"], record.get("reasoning"),
+                        record.get("context"), record.get("domain"), timestamp.rstrip("Z"), tags,
+                        max(1, int(record.get("occurrences") or 1)),
+                    )
+                except (KeyError, TypeError, ValueError, AttributeError, sqlite3.IntegrityError):
+                    conn.execute("ROLLBACK TO load_entry")
+                    stats["errors"] += 1
+                    continue
+                finally:
+                    conn.execute("RELEASE load_entry")
+                stats["loaded" if inserted else "duplicates"] += 1
+                pending += 1
+                if pending >= batch_size:
+                    self.refresh_context_summary()
+                    conn.commit()
+                    conn.execute("BEGIN")
+                    pending = 0
+            self.refresh_context_summary()
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return stats
+
+    # Near-duplicate index (see dedup.NearDuplicateIndex)
+
+    def get_unindexed_entries(self) -> list[tuple[int, str, str]]:
+        """(id, type, content) of entries with no entry_lsh buckets."""
+        return self.conn.execute(
+            """
+            SELECT id, type, content FROM entries
+            WHERE NOT EXISTS (SELECT 1 FROM entry_lsh WHERE entry_id = entries.id)
+            """
+        ).fetchall()
+
+    def add_lsh_buckets(self, items: Iterable[tuple[int, list[int]]]) -> int:
+        """Store (entry ID, bucket keys) pairs in one transaction.
+
+        Returns:
+            Number of entries stored
+        """
+        count = 0
+        for entry_id, buckets in items:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO entry_lsh (bucket, entry_id) VALUES (?, ?)",
+                [(bucket, entry_id) for bucket in buckets],
+            )
+            count += 1
+        self.conn.commit()
+        return count
+
+    def get_lsh_candidates(
+        self, type: str, buckets: list[int], limit: int = 50
+    ) -> list[tuple[int, str]]:
+        """(id, content) of entries of this type sharing buckets, most shared first.
+
+        More shared bands means a likelier match, so only the top `limit`
+        candidates are returned for verification.
+        """
+        placeholders = ",".join("?" for _ in buckets)
+        cursor = self.conn.execute(
+            f"""
+            SELECT e.id, e.content
+            FROM (
+                SELECT entry_id, COUNT(*) AS shared FROM entry_lsh
+                WHERE bucket IN ({placeholders})
+                GROUP BY entry_id ORDER BY shared DESC LIMIT ?
+            ) c
+            JOIN entries e ON e.id = c.entry_id
+            WHERE e.type = ?
+            """,
+            list(buckets) + [limit, type],
+        )
+        return cursor.fetchall()
 
     def get_decisions(self, query: str, limit: int = 10) -> list[Entry]:
         """Get decisions matching query (for 'why' command)."""
@@ -231,6 +707,8 @@ class Database:
         cursor = self.conn.execute(
             "DELETE FROM entries WHERE id = ?", (entry_id,)
         )
+        if cursor.rowcount:
+            self.refresh_context_summary()
         self.conn.commit()
         return cursor.rowcount > 0
 
@@ -238,8 +716,9 @@ class Database:
         """Get database statistics."""
         stats = {"total": 0, "by_type": {}}
 
+        # Trigger-maintained counts: one row per type, not a table scan
         cursor = self.conn.execute(
-            "SELECT type, COUNT(*) FROM entries GROUP BY type"
+            "SELECT type, count FROM entry_counts WHERE count > 0 ORDER BY type"
         )
         for row in cursor.fetchall():
             stats["by_type"][row[0]] = row[1]
@@ -247,6 +726,142 @@ class Database:
 
         return stats
 
+    def refresh_context_summary(self) -> dict:
+        """Rebuild the materialized context summary (caller commits).
+
+        Returns:
+            Summary dict: total, by_type, decisions, gotchas, recent
+        """
+        stats = self.get_stats()
+        summary = {
+            "total": stats["total"],
+            "by_type": stats["by_type"],
+            "decisions": [e.to_dict() for e in self.get_entries_by_type("decision", CONTEXT_ITEMS)],
+            "gotchas": [e.to_dict() for e in self.get_entries_by_type("gotcha", CONTEXT_ITEMS)],
+            "recent": [e.to_dict() for e in self.get_recent_entries(CONTEXT_ITEMS)],
+        }
+        self.conn.execute(
+            """
+            UPDATE context_summary SET summary = ?, stale = 0, updated_at = ?
+            WHERE id = 1
+            """,
+            (json.dumps(summary), datetime.utcnow().isoformat()),
+        )
+        return summary
+
+    def get_context_summary(self) -> dict:
+        """Get the session context summary: one query unless it went stale."""
+        row = self.conn.execute(
+            "SELECT summary, stale FROM context_summary WHERE id = 1"
+        ).fetchone()
+        if row and row[0] and not row[1]:
+            return json.loads(row[0])
+
+        summary = self.refresh_context_summary()
+        self.conn.commit()
+        return summary
+
+    # Retention
+
+    def prune(self, policies: list[RetentionPolicy], dry_run: bool = False) -> list[int]:
+        """Delete entries past their retention policies, in one transaction.
+
+        Tags and near-duplicate buckets go with their entries.
+
+        Returns:
+            Entries deleted (or that would be, with dry_run) per policy
+        """
+        counts = []
+        try:
+            for policy in policies:
+                ids_sql, params = self._expired_ids_query(policy)
+                if dry_run:
+                    counts.append(self.conn.execute(
+                        f"SELECT COUNT(*) FROM ({ids_sql})", params
+                    ).fetchone()[0])
+                else:
+                    counts.append(self.conn.execute(
+                        f"DELETE FROM entries WHERE id IN ({ids_sql})", params
+                    ).rowcount)
+            if dry_run:
+                self.conn.rollback()
+                return counts
+            if any(counts):
+                self.refresh_context_summary()
+            self._mark_maintenance("prune")
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        return counts
+
+    @staticmethod
+    def _expired_ids_query(policy: RetentionPolicy) -> tuple[str, list]:
+        """SELECT of the entry ids a policy expires, with its parameters."""
+        where, where_params = ["1"], []
+        if policy.type:
+            where.append("type = ?")
+            where_params.append(policy.type)
+        if policy.tag:
+            where.append("id IN (SELECT entry_id FROM tags WHERE tag = ?)")
+            where_params.append(policy.tag.lower())
+        matching = " AND ".join(where)
+        last_recorded = "COALESCE(updated_at, created_at)"
+
+        selects, params = [], []
+        if policy.max_age_days is not None:
+            cutoff = datetime.utcnow() - timedelta(days=policy.max_age_days)
+            selects.append(f"SELECT id FROM entries WHERE {matching} AND {last_recorded} < ?")
+            params += where_params + [cutoff.isoformat()]
+        if policy.max_rows is not None:
+            selects.append(
+                f"SELECT id FROM (SELECT id FROM entries WHERE {matching} "
+                f"ORDER BY {last_recorded} DESC, id DESC LIMIT -1 OFFSET ?)"
+            )
+            params += where_params + [policy.max_rows]
+        if not selects:
+            raise ValueError("Retention policy needs max_age_days or max_rows")
+        return " UNION ".join(selects), params
+
+    def incremental_vacuum(self) -> dict:
+        """Return free pages to the filesystem.
+
+        A database created before auto_vacuum=INCREMENTAL is converted with
+        one full VACUUM; after that this only truncates the free pages.
+
+        Returns:
+            {"converted": bool, "freed_pages": n, "page_size": bytes}
+        """
+        conn = self.conn
+        converted = False
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            converted = True
+
+        free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # execute() would stop after the first step, freeing a single page
+        conn.executescript("PRAGMA incremental_vacuum")
+        free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return {
+            "converted": converted,
+            "freed_pages": free_before - free_after,
+            "page_size": conn.execute("PRAGMA page_size").fetchone()[0],
+        }
+
+    def get_last_maintenance(self, task: str) -> Optional[datetime]:
+        """When a maintenance task last ran, or None."""
+        row = self.conn.execute(
+            "SELECT last_run_at FROM maintenance WHERE task = ?", (task,)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def _mark_maintenance(self, task: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO maintenance (task, last_run_at) VALUES (?, ?)",
+            (task, datetime.utcnow().isoformat()),
+        )
+
     # Import history methods
 
     def is_file_imported(self, file_path: str) -> bool:
@@ -0,0 +1,143 @@
+"""
+Duplicate detection for claude-workshop entries.
+
+Exact duplicates share a content hash of the normalized text (see
+Database.add_entry). Near duplicates ("Make sure to run migrations first"
+vs. "make sure to run the migrations first!") are found with MinHash over
+character shingles, banded for locality-sensitive hashing: each entry gets
+LSH_BANDS bucket keys in the entry_lsh table, entries sharing a bucket are
+candidates, and candidates are confirmed by exact Jaccard similarity.
+
+hashlib (OpenSSL) is imported on first use: every CLI call imports this
+module through db.py, and read-only commands never hash anything.
+"""
+
+from typing import Optional
+
+# Character shingle length
+SHINGLE_SIZE = 5
+
+# MinHash signature: LSH_BANDS bands of LSH_ROWS values. 16x4 makes an entry
+# pair at Jaccard 0.7 a candidate ~99% of the time and at 0.3 ~12%.
+LSH_BANDS = 16
+LSH_ROWS = 4
+SIGNATURE_SIZE = LSH_BANDS * LSH_ROWS
+
+# Default Jaccard similarity for a near duplicate
+SIMILARITY_THRESHOLD = 0.7
+
+_STRIP_CHARS = " \t\n.,;:!?'\"`"
+
+
+def normalize_content(text: str) -> str:
+    """Lowercase, collapse whitespace and trim surrounding punctuation."""
+    return " ".join(text.lower().split()).strip(_STRIP_CHARS)
+
+
+def content_hash(type: str, content: str, domain: Optional[str] = None) -> str:
+    """Hash identifying exact duplicates: same type, domain and normalized text."""
+    import hashlib
+
+    key = f"{type}\x1f{domain or ''}\x1f{normalize_content(content)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def shingles(content: str) -> set[str]:
+    """Character shingles of the normalized text."""
+    text = normalize_content(content)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set: set[str]) -> list[int]:
+    """MinHash signature of SIGNATURE_SIZE values.
+
+    One-permutation MinHash: each shingle is hashed once, the hash picks a
+    bin and the minimum per bin is kept; empty bins borrow the next filled
+    bin's value so short texts still get a full signature. This is one hash
+    per shingle instead of SIGNATURE_SIZE.
+    """
+    if not shingle_set:
+        return []
+    import hashlib
+
+    bins: list[Optional[int]] = [None] * SIGNATURE_SIZE
+    for shingle in shingle_set:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        b, value = h % SIGNATURE_SIZE, h // SIGNATURE_SIZE
+        if bins[b] is None or value < bins[b]:
+            bins[b] = value
+
+    signature = []
+    for i in range(SIGNATURE_SIZE):
+        offset = 0
+        while bins[(i + offset) % SIGNATURE_SIZE] is None:
+            offset += 1
+        # Offset keeps a borrowed value distinct from the bin it came from
+        signature.append(bins[(i + offset) % SIGNATURE_SIZE] + offset * (1 << 58))
+    return signature
+
+
+def lsh_buckets(type: str, content: str) -> list[int]:
+    """LSH bucket keys (signed 64-bit, one per band) for an entry."""
+    signature = minhash(shingles(content))
+    if not signature:
+        return []
+    import hashlib
+
+    buckets = []
+    for band in range(LSH_BANDS):
+        values = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        key = f"{type}:{band}:" + ",".join(map(str, values))
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class NearDuplicateIndex:
+    """LSH index over a workshop database's entries, kept in entry_lsh."""
+
+    def __init__(self, db, threshold: float = SIMILARITY_THRESHOLD):
+        """
+        Args:
+            db: Database instance
+            threshold: Minimum Jaccard similarity for a near duplicate
+        """
+        self.db = db
+        self.threshold = threshold
+
+    def backfill(self) -> int:
+        """Index entries that have no buckets yet (e.g. added without the index).
+
+        Returns:
+            Number of entries indexed
+        """
+        rows = self.db.get_unindexed_entries()
+        return self.db.add_lsh_buckets(
+            (entry_id, lsh_buckets(type, content)) for entry_id, type, content in rows
+        )
+
+    def find(self, type: str, content: str) -> Optional[int]:
+        """ID of the most similar entry of the same type at or above the threshold."""
+        buckets = lsh_buckets(type, content)
+        if not buckets:
+            return None
+        query = shingles(content)
+        best_id, best = None, self.threshold
+        for entry_id, candidate in self.db.get_lsh_candidates(type, buckets):
+            similarity = jaccard(query, shingles(candidate))
+            if similarity >= best:
+                best_id, best = entry_id, similarity
+        return best_id
+
+    def add(self, entry_id: int, type: str, content: str):
+        """Index a newly added entry."""
+        self.db.add_lsh_buckets([(entry_id, lsh_buckets(type, content))])
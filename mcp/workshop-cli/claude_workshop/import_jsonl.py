@@ -12,6 +12,7 @@ from pathlib import Path
 from typing import Optional
 
 from .db import Database
+from .dedup import SIMILARITY_THRESHOLD, NearDuplicateIndex, normalize_content
 
 
 # Patterns to extract different entry types from assistant messages
@@ -139,11 +140,11 @@ def extract_entries_from_jsonl(file_path: Path) -> list[dict]:
         # Silently skip files that can't be read
         pass
 
-    # Deduplicate by content
+    # Deduplicate by type and normalized content
     seen = set()
     unique = []
     for entry in entries:
-        key = entry["content"].lower()
+        key = (entry["type"], normalize_content(entry["content"]))
         if key not in seen:
             seen.add(key)
             unique.append(entry)
@@ -182,16 +183,25 @@ def import_transcripts(
     db: Database,
     base_path: Optional[str] = None,
     execute: bool = False,
+    near_duplicates: bool = False,
+    threshold: float = SIMILARITY_THRESHOLD,
 ) -> dict:
     """Import entries from JSONL transcripts.
 
+    An entry already in the database (an exact duplicate, or with
+    near_duplicates a near duplicate of the same type) is not imported again;
+    the existing entry's occurrence count goes up instead.
+
     Args:
         db: Database instance
         base_path: Base path to search for JSONL files
         execute: If True, actually import. If False, just preview.
+        near_duplicates: Also merge near duplicates (MinHash/LSH)
+        threshold: Jaccard similarity for a near duplicate
 
     Returns:
-        Summary dict with files_found, entries_found, entries_imported
+        Summary dict with files_found, entries_found, entries_imported,
+        entries_duplicate, entries_near_duplicate
     """
     files = find_jsonl_files(base_path)
 
@@ -200,9 +210,16 @@ def import_transcripts(
         "files_skipped": 0,
         "entries_found": 0,
         "entries_imported": 0,
+        "entries_duplicate": 0,
+        "entries_near_duplicate": 0,
         "details": [],
     }
 
+    index = None
+    if execute and near_duplicates:
+        index = NearDuplicateIndex(db, threshold)
+        index.backfill()
+
     for file_path in files:
         file_str = str(file_path)
 
@@ -227,15 +244,29 @@ def import_transcripts(
             })
 
         if execute and entries:
-            # Import entries
+            # Import entries, merging duplicates into what's already there
             for entry in entries:
-                db.add_entry(
+                existing = db.find_duplicate(entry["type"], entry["content"])
+                if existing is not None:
+                    summary["entries_duplicate"] += 1
+                elif index:
+                    existing = index.find(entry["type"], entry["content"])
+                    if existing is not None:
+                        summary["entries_near_duplicate"] += 1
+
+                if existing is not None:
+                    db.add_occurrence(existing, entry.get("reasoning"), tags=["auto-imported"])
+                    continue
+
+                entry_id = db.add_entry(
                     type=entry["type"],
                     content=entry["content"],
                     reasoning=entry.get("reasoning"),
                     tags=["auto-imported"],
                 )
-            summary["entries_imported"] += len(entries)
+                if index:
+                    index.add(entry_id, entry["type"], entry["content"])
+                summary["entries_imported"] += 1
 
             # Record import
             file_hash = compute_file_hash(file_path)
@@ -20,6 +20,7 @@ class Entry:
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = None
     tags: list[str] = field(default_factory=list)
+    occurrences: int = 1  # times recorded (exact/near duplicates are merged)
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
@@ -32,6 +33,7 @@ class Entry:
             "domain": self.domain,
             "timestamp": self.created_at.isoformat() + "Z",
             "tags": self.tags,
+            "occurrences": self.occurrences,
         }
 
     @classmethod
@@ -47,6 +49,7 @@ class Entry:
             created_at=datetime.fromisoformat(row[6]) if row[6] else datetime.utcnow(),
             updated_at=datetime.fromisoformat(row[7]) if row[7] else None,
             tags=tags or [],
+            occurrences=row[9] if len(row) > 9 else 1,
         )
 
 
@@ -70,3 +73,44 @@ class ImportRecord:
             imported_at=datetime.fromisoformat(row[3]) if row[3] else datetime.utcnow(),
             entries_extracted=row[4],
         )
+
+
+@dataclass
+class RetentionPolicy:
+    """Which entries prune removes.
+
+    Entries matching type and tag (either may be None for any) are removed
+    once not recorded for max_age_days, and beyond the max_rows most
+    recently recorded. An entry is last recorded when it was added or last
+    seen again as a duplicate.
+    """
+
+    type: Optional[str] = None
+    tag: Optional[str] = None
+    max_age_days: Optional[int] = None
+    max_rows: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary, leaving out unset fields."""
+        return {k: v for k, v in self.__dict__.items() if v is not None}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RetentionPolicy":
+        """Create RetentionPolicy from a retention.json entry.
+
+        Raises:
+            ValueError: Unknown keys, bad values, or no limit set
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Policy must be an object: {data!r}")
+        unknown = set(data) - {"type", "tag", "max_age_days", "max_rows"}
+        if unknown:
+            raise ValueError(f"Unknown policy keys: {', '.join(sorted(unknown))}")
+        for key in ("max_age_days", "max_rows"):
+            value = data.get(key)
+            if value is not None and (not isinstance(value, int) or value < 0):
+                raise ValueError(f"{key} must be a non-negative integer: {data!r}")
+        policy = cls(**data)
+        if policy.max_age_days is None and policy.max_rows is None:
+            raise ValueError(f"Policy needs max_age_days or max_rows: {data!r}")
+        return policy
@@ -0,0 +1,54 @@
+"""
+Retention policies for claude-workshop.
+
+Policies come from retention.json in the workspace, a JSON list such as:
+
+    [
+        {"tag": "auto-imported", "max_age_days": 180, "max_rows": 5000},
+        {"type": "note", "max_age_days": 30}
+    ]
+
+Without the file, DEFAULT_POLICIES apply: only automatically captured
+entries expire; decisions, gotchas and notes recorded by hand are kept.
+"""
+
+import json
+from pathlib import Path
+
+from .models import RetentionPolicy
+
+RETENTION_FILE = "retention.json"
+
+# Tags marking entries added by hooks and importers rather than by hand.
+# Database.add_entry drops them when an entry is also recorded by hand.
+AUTO_TAGS = ("auto-imported", "auto-captured")
+
+DEFAULT_POLICIES = [
+    RetentionPolicy(tag="auto-imported", max_age_days=180, max_rows=5000),
+    RetentionPolicy(tag="auto-captured", max_age_days=30),
+]
+
+
+def load_policies(workspace: str) -> list[RetentionPolicy]:
+    """Load the workspace's retention policies.
+
+    Args:
+        workspace: Path to .claude/memory directory
+
+    Returns:
+        Policies from retention.json, or DEFAULT_POLICIES if it doesn't exist
+
+    Raises:
+        ValueError: retention.json is not a valid list of policies
+    """
+    path = Path(workspace) / RETENTION_FILE
+    if not path.exists():
+        return list(DEFAULT_POLICIES)
+
+    try:
+        data = json.loads(path.read_text())
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: {e}")
+    if not isinstance(data, list):
+        raise ValueError(f"{path}: expected a list of policies")
+    return [RetentionPolicy.from_dict(item) for item in data]
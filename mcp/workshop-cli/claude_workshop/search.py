@@ -35,6 +35,7 @@ def _score_entry(entry: Entry, query_terms: list[str]) -> float:
     - Reasoning match: 30 points per term
     - Domain match: 20 points per term
     - Tag match: 15 points per term
+    - Recurrence: 5 points per repeat occurrence, up to 50
 
     Args:
         entry: Entry to score
@@ -50,6 +51,9 @@ def _score_entry(entry: Entry, query_terms: list[str]) -> float:
     age_days = (now - entry.created_at).days
     score += max(100 - age_days, 0)
 
+    # Recurrence: an entry recorded many times is a stronger signal
+    score += min(entry.occurrences - 1, 10) * 5
+
     # Keyword matching
     content_lower = entry.content.lower()
     reasoning_lower = (entry.reasoning or "").lower()
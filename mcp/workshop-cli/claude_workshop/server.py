@@ -0,0 +1,403 @@
+"""
+Long-lived JSON-RPC server for claude-workshop.
+
+`claude-workshop serve` reads newline-delimited JSON-RPC 2.0 from stdin and
+writes one response line per request (the MCP stdio transport). The
+workshop.db connection stays open between calls, so SQLite's per-connection
+statement cache keeps every query prepared, and agents and hooks skip the
+interpreter, click and connection start-up that each CLI call pays.
+
+A line may hold a single request or a batch (JSON array); a batch gets one
+array response. Notifications (no "id") get no response.
+
+Methods:
+    initialize, ping, tools/list, tools/call    MCP handshake and tools
+    why, search, recent, read, context, stats,  reads
+    get
+    decision, gotcha, note, delete              writes
+"""
+
+import inspect
+import json
+import sys
+from typing import Any, Callable, Optional
+
+from . import __version__
+from .db import Database
+from .search import extract_domain, rank_entries, strip_domain_prefix
+
+PROTOCOL_VERSION = "2024-11-05"
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+NOT_INITIALIZED = -32000  # workshop.db missing
+
+
+class RpcError(Exception):
+    """Error returned to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def _schema(required: list[str], **properties: dict) -> dict:
+    return {"type": "object", "properties": properties, "required": required}
+
+
+_STRING = {"type": "string"}
+_INTEGER = {"type": "integer"}
+_LIMIT = {"type": "integer", "minimum": 1}
+_TAGS = {"type": "array", "items": {"type": "string"}}
+
+# MCP tool definitions; each tool name is also a plain JSON-RPC method
+TOOLS = [
+    {
+        "name": "why",
+        "description": "Query past decisions, best match first",
+        "inputSchema": _schema(["query"], query=_STRING, limit=_LIMIT),
+    },
+    {
+        "name": "search",
+        "description": "Search all entries, optionally by type (decision/gotcha/note)",
+        "inputSchema": _schema(["query"], query=_STRING, type=_STRING, limit=_LIMIT),
+    },
+    {
+        "name": "recent",
+        "description": "Most recent entries",
+        "inputSchema": _schema([], limit=_LIMIT),
+    },
+    {
+        "name": "read",
+        "description": "Page through entries newest first; pass next_cursor back for the next page",
+        "inputSchema": _schema([], type=_STRING, cursor=_STRING, limit=_LIMIT),
+    },
+    {
+        "name": "context",
+        "description": "Session context summary: counts, recent decisions and gotchas",
+        "inputSchema": _schema([]),
+    },
+    {
+        "name": "decision",
+        "description": "Record an architectural decision ('[domain] text' sets the domain)",
+        "inputSchema": _schema(["text", "reason"], text=_STRING, reason=_STRING, tags=_TAGS),
+    },
+    {
+        "name": "gotcha",
+        "description": "Record a gotcha/warning/pitfall",
+        "inputSchema": _schema(["text"], text=_STRING, tags=_TAGS),
+    },
+    {
+        "name": "note",
+        "description": "Add a general note",
+        "inputSchema": _schema(["text"], text=_STRING, tags=_TAGS),
+    },
+]
+
+
+# Params of every method that takes any: the tool schemas, plus the plain
+# JSON-RPC methods that aren't tools
+PARAM_SCHEMAS = {
+    **{tool["name"]: tool["inputSchema"] for tool in TOOLS},
+    "get": _schema(["id"], id=_INTEGER),
+    "delete": _schema(["id"], id=_INTEGER),
+}
+
+_JSON_TYPES = {"string": str, "integer": int, "array": list}
+
+
+def _check_value(name: str, value: Any, schema: dict):
+    """Raise INVALID_PARAMS unless value matches schema (types, items, minimum)."""
+    expected = _JSON_TYPES[schema["type"]]
+    # bool is an int subclass, but not a JSON integer
+    if not isinstance(value, expected) or isinstance(value, bool):
+        raise RpcError(INVALID_PARAMS, f"{name} must be of type {schema['type']}")
+    if "minimum" in schema and value < schema["minimum"]:
+        raise RpcError(INVALID_PARAMS, f"{name} must be at least {schema['minimum']}")
+    if "items" in schema:
+        for i, item in enumerate(value):
+            _check_value(f"{name}[{i}]", item, schema["items"])
+
+
+class WorkshopServer:
+    """Dispatches JSON-RPC requests against one open workshop database."""
+
+    def __init__(self, workspace: str):
+        self.db = Database(workspace)
+        self.methods: dict[str, Callable[..., Any]] = {
+            "initialize": self.initialize,
+            "ping": lambda: {},
+            "tools/list": lambda cursor=None: {"tools": TOOLS},
+            "tools/call": self.call_tool,
+            "why": self.why,
+            "search": self.search,
+            "recent": self.recent,
+            "read": self.read,
+            "context": self.context,
+            "stats": self.stats,
+            "get": self.get,
+            "decision": self.decision,
+            "gotcha": self.gotcha,
+            "note": self.note,
+            "delete": self.delete,
+        }
+
+    # MCP
+
+    def initialize(self, protocolVersion: str = PROTOCOL_VERSION, **_) -> dict:
+        return {
+            "protocolVersion": protocolVersion,
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "claude-workshop", "version": __version__},
+        }
+
+    def call_tool(self, name: str, arguments: Optional[dict] = None) -> dict:
+        """MCP tools/call: tool failures are results with isError, not RPC errors."""
+        if name not in {tool["name"] for tool in TOOLS}:
+            raise RpcError(INVALID_PARAMS, f"Unknown tool: {name}")
+        try:
+            result = self._invoke(self.methods[name], arguments or {}, PARAM_SCHEMAS[name])
+        except RpcError as e:
+            return {"content": [{"type": "text", "text": e.message}], "isError": True}
+        return {"content": [{"type": "text", "text": json.dumps(result)}], "isError": False}
+
+    # Reads
+
+    def _ready(self) -> bool:
+        return self.db.exists()
+
+    def why(self, query: str, limit: int = 10) -> list[dict]:
+        if not self._ready():
+            return []
+        entries = self.db.get_decisions(query, limit=limit * 2)  # Get more for ranking
+        return [e.to_dict() for e in rank_entries(entries, query)[:limit]]
+
+    def search(self, query: str, type: Optional[str] = None, limit: int = 20) -> list[dict]:
+        if not self._ready():
+            return []
+        entries = self.db.search_entries(query, type=type, limit=limit * 2)
+        return [e.to_dict() for e in rank_entries(entries, query)[:limit]]
+
+    def recent(self, limit: int = 10) -> list[dict]:
+        if not self._ready():
+            return []
+        return [e.to_dict() for e in self.db.get_recent_entries(limit=limit)]
+
+    def read(self, type: Optional[str] = None, cursor: Optional[str] = None,
+             limit: int = 50) -> dict:
+        if not self._ready():
+            return {"entries": [], "next_cursor": None}
+        try:
+            entries, next_cursor = self.db.get_entries_page(type, cursor=cursor, limit=limit)
+        except ValueError as e:
+            raise RpcError(INVALID_PARAMS, str(e))
+        return {"entries": [e.to_dict() for e in entries], "next_cursor": next_cursor}
+
+    def context(self) -> dict:
+        if not self._ready():
+            return {"total": 0, "by_type": {}, "decisions": [], "gotchas": [], "recent": []}
+        return self.db.get_context_summary()
+
+    def stats(self) -> dict:
+        if not self._ready():
+            return {"total": 0, "by_type": {}}
+        return self.db.get_stats()
+
+    def get(self, id: int) -> Optional[dict]:
+        if not self._ready():
+            return None
+        entry = self.db.get_entry(id)
+        return entry.to_dict() if entry else None
+
+    # Writes
+
+    def _add(self, type: str, text: str, reasoning: Optional[str], tags: Optional[list]) -> dict:
+        if not self._ready():
+            raise RpcError(NOT_INITIALIZED, "Database not initialized. Run: claude-workshop init")
+        # Extract domain from [domain] prefix if present
+        domain = extract_domain(text)
+        content = strip_domain_prefix(text) if domain else text
+        entry_id = self.db.add_entry(
+            type=type,
+            content=content,
+            reasoning=reasoning,
+            domain=domain,
+            tags=list(tags or []),
+        )
+        return {"id": entry_id}
+
+    def decision(self, text: str, reason: str, tags: Optional[list] = None) -> dict:
+        return self._add("decision", text, reason, tags)
+
+    def gotcha(self, text: str, tags: Optional[list] = None) -> dict:
+        return self._add("gotcha", text, None, tags)
+
+    def note(self, text: str, tags: Optional[list] = None) -> dict:
+        return self._add("note", text, None, tags)
+
+    def delete(self, id: int) -> dict:
+        if not self._ready():
+            raise RpcError(NOT_INITIALIZED, "Database not initialized. Run: claude-workshop init")
+        return {"deleted": self.db.delete_entry(id)}
+
+    # Dispatch
+
+    @staticmethod
+    def _invoke(fn: Callable[..., Any], params: Any, schema: Optional[dict] = None) -> Any:
+        """Call fn with params after checking them against its signature and schema.
+
+        null is accepted only for optional params that default to None.
+        """
+        if isinstance(params, dict):
+            args, kwargs = (), params
+        elif isinstance(params, list):
+            args, kwargs = params, {}
+        else:
+            raise RpcError(INVALID_PARAMS, "params must be an object or array")
+        signature = inspect.signature(fn)
+        try:
+            bound = signature.bind(*args, **kwargs)
+        except TypeError as e:
+            raise RpcError(INVALID_PARAMS, str(e))
+        properties = schema["properties"] if schema else {}
+        for name, value in bound.arguments.items():
+            if name not in properties:
+                continue
+            if value is None and signature.parameters[name].default is None:
+                continue
+            _check_value(name, value, properties[name])
+        return fn(*args, **kwargs)
+
+    def handle(self, message: Any) -> Optional[dict]:
+        """Handle one request object; None for notifications."""
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0" \
+                or not isinstance(message.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid Request")
+
+        is_notification = "id" not in message
+        request_id = message.get("id")
+        fn = self.methods.get(message["method"])
+        try:
+            if fn is None:
+                if message["method"].startswith("notifications/"):
+                    return None
+                raise RpcError(METHOD_NOT_FOUND, f"Method not found: {message['method']}")
+            result = self._invoke(fn, message.get("params", {}),
+                                  PARAM_SCHEMAS.get(message["method"]))
+        except RpcError as e:
+            response = _error(request_id, e.code, e.message)
+        except Exception as e:
+            response = _error(request_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return None if is_notification else response
+
+    def handle_line(self, line: str) -> Optional[str]:
+        """Handle one input line (request or batch); returns the response line."""
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return json.dumps(_error(None, PARSE_ERROR, "Parse error"))
+
+        if isinstance(message, list):
+            if not message:
+                return json.dumps(_error(None, INVALID_REQUEST, "Invalid Request"))
+            responses = [r for r in (self.handle(m) for m in message) if r is not None]
+            return json.dumps(responses) if responses else None
+
+        response = self.handle(message)
+        return json.dumps(response) if response is not None else None
+
+    def serve(self, stdin=None, stdout=None):
+        """Answer requests until stdin closes."""
+        stdin = stdin or sys.stdin
+        stdout = stdout or sys.stdout
+        try:
+            while True:
+                line = stdin.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = self.handle_line(line)
+                if response is not None:
+                    stdout.write(response + "\n")
+                    stdout.flush()
+        finally:
+            self.db.close()
+
+
+def _error(request_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def benchmark(workspace: str, query: str = "database", runs: int = 20) -> dict:
+    """Per-call latency of `why --json` as CLI processes vs. one `serve` process.
+
+    Times each CLI call end to end, each serve request round trip (after
+    the initialize handshake), and one batch holding `runs` requests.
+    """
+    import os
+    import statistics
+    import subprocess
+    import time
+    from pathlib import Path
+
+    env = dict(os.environ)
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (package_root, env.get("PYTHONPATH")) if p)
+    cli = [sys.executable, "-m", "claude_workshop.cli", "-w", workspace]
+
+    def summary(samples: list[float]) -> dict:
+        return {
+            "p50": round(statistics.median(samples), 2),
+            "mean": round(statistics.mean(samples), 2),
+            "max": round(max(samples), 2),
+        }
+
+    cli_ms = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(cli + ["why", "--json", query], env=env, capture_output=True, check=True)
+        cli_ms.append((time.perf_counter() - t0) * 1000)
+
+    request = {"jsonrpc": "2.0", "method": "why", "params": {"query": query}}
+    proc = subprocess.Popen(cli + ["serve"], env=env, text=True, bufsize=1,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        def call(payload: Any) -> Any:
+            proc.stdin.write(json.dumps(payload) + "\n")
+            proc.stdin.flush()
+            return json.loads(proc.stdout.readline())
+
+        t0 = time.perf_counter()
+        call({"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {}})
+        startup_ms = (time.perf_counter() - t0) * 1000
+
+        serve_ms = []
+        for i in range(runs):
+            t0 = time.perf_counter()
+            call(dict(request, id=i + 1))
+            serve_ms.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        call([dict(request, id=i + 1) for i in range(runs)])
+        batch_ms = (time.perf_counter() - t0) * 1000
+    finally:
+        proc.stdin.close()
+        proc.wait()
+
+    return {
+        "query": query,
+        "runs": runs,
+        "cli_ms": summary(cli_ms),
+        "serve_startup_ms": round(startup_ms, 2),
+        "serve_ms": summary(serve_ms),
+        "batch_ms_per_call": round(batch_ms / runs, 3),
+        "speedup_p50": round(statistics.median(cli_ms) / statistics.median(serve_ms), 1),
+    }
@@ -2,147 +2,243 @@
 """
 Memory indexing and management for vibe.db
 Creates and maintains the local SQLite database for code search
+
+Files are split into chunks (markdown by section, everything else by size)
+and kept in code_chunks plus its FTS5 index, so searches are indexed
+bm25-ranked lookups with snippet/highlight. --index-dir writes a whole tree
+in one transaction. Source files vibe-sync indexes (its SYNC_EXTENSIONS)
+are handed to vibe-sync instead, so their function/class chunks and
+symbols stay intact.
 """
 
 import sqlite3
-import json
 import argparse
+import importlib.util
 import sys
 from pathlib import Path
 from datetime import datetime
 
+def load_vibe_sync():
+    """Load vibe-sync.py (installed alongside this script), which owns the vibe.db schema"""
+    path = Path(__file__).with_name('vibe-sync.py')
+    if not path.exists():
+        print(f"Error: {path} not found (it defines the vibe.db schema)")
+        sys.exit(1)
+    spec = importlib.util.spec_from_file_location('vibe_sync', path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['vibe_sync'] = module
+    spec.loader.exec_module(module)
+    return module
+
 def create_database(db_path):
-    """Create vibe.db with proper schema"""
+    """Create vibe.db, or migrate an existing one to the current schema"""
+    vibe_sync = load_vibe_sync()
+    vibe_sync.ensure_schema(Path(db_path))
+
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
-    # Create tables
-    cursor.executescript("""
-        -- Code chunks table (simple table for now, FTS5 can be added later)
-        CREATE TABLE IF NOT EXISTS code_chunks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            file_path TEXT NOT NULL,
-            content TEXT NOT NULL,
-            language TEXT,
-            chunk_type TEXT,
-            metadata TEXT
-        );
-
-        -- Events table for tracking changes
-        CREATE TABLE IF NOT EXISTS events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
-            event_type TEXT NOT NULL,
-            file_path TEXT,
-            description TEXT,
-            metadata TEXT
-        );
-
-        -- Decisions table (mirrors Workshop for redundancy)
-        CREATE TABLE IF NOT EXISTS decisions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            created_at TEXT NOT NULL,
-            decision TEXT NOT NULL,
-            reasoning TEXT,
-            tags TEXT
-        );
-
-        -- Index for events
-        CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp);
-        CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type);
-
-        -- Metadata table
-        CREATE TABLE IF NOT EXISTS metadata (
-            key TEXT PRIMARY KEY,
-            value TEXT,
-            updated_at TEXT
-        );
-    """)
-
     # Set metadata
     now = datetime.utcnow().isoformat()
     cursor.execute("""
-        INSERT OR REPLACE INTO metadata (key, value, updated_at)
-        VALUES ('version', '1.0', ?)
-    """, (now,))
-    cursor.execute("""
-        INSERT OR REPLACE INTO metadata (key, value, updated_at)
+        INSERT OR IGNORE INTO metadata (key, value, updated_at)
         VALUES ('created_at', ?, ?)
     """, (now, now))
 
     conn.commit()
     conn.close()
-    print(f"✓ Created database: {db_path}")
+    print(f"✓ Database ready: {db_path} (schema v{vibe_sync.SCHEMA_VERSION})")
 
-def index_file(db_path, file_path, content=None):
-    """Index a file into vibe.db"""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+# Detect language from extension
+EXT_TO_LANG = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'typescript',
+    '.jsx': 'javascript',
+    '.tsx': 'typescript',
+    '.sh': 'bash',
+    '.md': 'markdown',
+    '.json': 'json',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+}
 
-    # Read content if not provided
-    if content is None:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"Error reading {file_path}: {e}")
-            return
-
-    # Detect language from extension
-    ext_to_lang = {
-        '.py': 'python',
-        '.js': 'javascript',
-        '.ts': 'typescript',
-        '.jsx': 'javascript',
-        '.tsx': 'typescript',
-        '.sh': 'bash',
-        '.md': 'markdown',
-        '.json': 'json',
-        '.yaml': 'yaml',
-        '.yml': 'yaml',
-    }
-
-    file_ext = Path(file_path).suffix
-    language = ext_to_lang.get(file_ext, 'text')
-
-    # Insert into code_chunks
-    cursor.execute("""
-        INSERT INTO code_chunks (file_path, content, language, chunk_type, metadata)
-        VALUES (?, ?, ?, 'file', ?)
-    """, (str(file_path), content, language, json.dumps({'indexed_at': datetime.utcnow().isoformat()})))
+CHUNK_MAX_CHARS = 4000          # chunks are split on line boundaries past this
+MAX_FILE_BYTES = 512 * 1024     # --index-dir skips larger files
+
+def chunk_content(content, language):
+    """Split a file into (start_line, end_line, name, text) chunks.
+
+    Markdown is split at headings (the heading names the chunk); everything
+    else, and any section over CHUNK_MAX_CHARS, at line boundaries by size.
+    """
+    lines = content.splitlines(keepends=True)
+    sections = []  # (start index, name)
+    if language == 'markdown':
+        for i, line in enumerate(lines):
+            if line.startswith('#'):
+                sections.append((i, line.lstrip('#').strip()))
+    if not sections or sections[0][0] != 0:
+        sections.insert(0, (0, None))
 
-    # Log event
+    chunks = []
+    bounds = [start for start, _ in sections[1:]] + [len(lines)]
+    for (start, name), end in zip(sections, bounds):
+        chunk_start, size = start, 0
+        for i in range(start, end):
+            size += len(lines[i])
+            if size >= CHUNK_MAX_CHARS or i == end - 1:
+                text = ''.join(lines[chunk_start:i + 1])
+                if text.strip():
+                    chunks.append((chunk_start + 1, i + 1, name, text))
+                chunk_start, size = i + 1, 0
+    return chunks
+
+def write_file_chunks(cursor, project_path, file_path, content, language):
+    """Replace a file's chunks in code_chunks and code_chunks_fts; returns the chunk count"""
+    # External-content FTS: old rows must be deleted with their old values
     cursor.execute("""
-        INSERT INTO events (timestamp, event_type, file_path, description)
-        VALUES (?, 'index', ?, 'File indexed')
-    """, (datetime.utcnow().isoformat(), str(file_path)))
+        INSERT INTO code_chunks_fts(code_chunks_fts, rowid, content, file_path, chunk_type, name)
+        SELECT 'delete', id, content, file_path, chunk_type, name
+        FROM code_chunks WHERE project_path = ? AND file_path = ?
+    """, (project_path, file_path))
+    cursor.execute(
+        "DELETE FROM code_chunks WHERE project_path = ? AND file_path = ?",
+        (project_path, file_path))
 
-    conn.commit()
-    conn.close()
-    print(f"✓ Indexed: {file_path}")
+    chunks = chunk_content(content, language)
+    chunk_type = 'section' if language == 'markdown' else 'block'
+    for index, (start, end, name, text) in enumerate(chunks):
+        cursor.execute("""
+            INSERT INTO code_chunks (project_path, file_path, chunk_index, content, language,
+                                     chunk_type, name, start_line, end_line)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (project_path, file_path, index, text, language, chunk_type, name, start, end))
+        cursor.execute("""
+            INSERT INTO code_chunks_fts(rowid, content, file_path, chunk_type, name)
+            VALUES (?, ?, ?, ?, ?)
+        """, (cursor.lastrowid, text, file_path, chunk_type, name))
+    return len(chunks)
+
+def synced_by_vibe(rel_path, vibe_sync):
+    """True for project files vibe-sync chunks itself (code in SYNC_EXTENSIONS)"""
+    path = Path(rel_path)
+    return (not path.is_absolute()
+            and path.suffix.lower() in vibe_sync.SYNC_EXTENSIONS
+            and vibe_sync.SYNC_EXCLUDED_DIRS.isdisjoint(path.parts[:-1]))
+
+def index_files(db_path, files, project_path, vibe_sync=None):
+    """Index (abs_path, rel_path, language) files into vibe.db
+
+    Files vibe-sync owns go through vibe_sync.sync_files(), which replaces
+    their chunks together with their symbol rows; the rest are chunked
+    here in one transaction.
+    """
+    vibe_sync = vibe_sync or load_vibe_sync()
+    files = list(files)
+    stats = {'files': 0, 'chunks': 0, 'errors': 0}
+
+    owned = [rel_path for _, rel_path, _ in files if synced_by_vibe(rel_path, vibe_sync)]
+    if owned:
+        synced = vibe_sync.sync_files(Path(project_path), Path(db_path), owned)
+        stats['files'] += synced['files']
+        stats['chunks'] += synced['code_chunks']
 
-def search(db_path, query, limit=10):
-    """Search vibe.db using LIKE for now"""
     conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
+    written = 0
+    last_path = None
 
-    # Simple LIKE search for now
-    results = cursor.execute("""
-        SELECT file_path, substr(content, 1, 200) as snippet
-        FROM code_chunks
-        WHERE content LIKE ?
-        LIMIT ?
-    """, (f'%{query}%', limit)).fetchall()
+    try:
+        for abs_path, rel_path, language in files:
+            if synced_by_vibe(rel_path, vibe_sync):
+                continue
+            try:
+                with open(abs_path, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            except Exception as e:
+                print(f"Error reading {rel_path}: {e}")
+                stats['errors'] += 1
+                continue
+            stats['chunks'] += write_file_chunks(cursor, project_path, rel_path, content, language)
+            stats['files'] += 1
+            written += 1
+            last_path = rel_path
 
-    conn.close()
-    return results
+        # Log event
+        cursor.execute("""
+            INSERT INTO events (timestamp, type, file_path, data)
+            VALUES (?, 'index', ?, ?)
+        """, (datetime.utcnow().isoformat(),
+              last_path if stats['files'] == 1 else None,
+              f"Indexed {stats['files']} files ({stats['chunks']} chunks)"))
+        if written:
+            # Cached searches, the ANN index and federated results check this
+            vibe_sync.bump_db_generation(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return stats
+
+def _rel_to_project(path, project_path):
+    path = Path(path).resolve()
+    try:
+        return str(path.relative_to(project_path))
+    except ValueError:
+        return str(path)
+
+def index_dir(db_path, directory, project_path, vibe_sync):
+    """Index every supported file under directory (gitignore-aware walk)"""
+    directory = Path(directory).resolve()
+    files = (
+        (abs_path, _rel_to_project(abs_path, project_path), language)
+        for abs_path, _, language, _ in vibe_sync.iter_source_files(
+            directory, MAX_FILE_BYTES, extensions=EXT_TO_LANG)
+    )
+    return index_files(db_path, files, str(project_path), vibe_sync)
+
+def search(db_path, query, limit=10, vibe_sync=None):
+    """Search code_chunks through FTS5, best bm25 first
+
+    Returns (file_path, start_line, snippet, highlighted chunk) rows. All
+    terms must match; if nothing does, any term may.
+    """
+    vibe_sync = vibe_sync or load_vibe_sync()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        for mode in ('and', 'or'):
+            fts_query = vibe_sync.build_fts_query(query, mode)
+            if not fts_query:
+                return []
+            results = cursor.execute("""
+                SELECT c.file_path, c.start_line,
+                       snippet(code_chunks_fts, 0, '>>>', '<<<', '...', 24),
+                       highlight(code_chunks_fts, 0, '>>>', '<<<')
+                FROM code_chunks_fts
+                JOIN code_chunks c ON c.id = code_chunks_fts.rowid
+                WHERE code_chunks_fts MATCH ?
+                ORDER BY bm25(code_chunks_fts)
+                LIMIT ?
+            """, (fts_query, limit)).fetchall()
+            if results:
+                return results
+        return []
+    finally:
+        conn.close()
 
 def main():
     parser = argparse.ArgumentParser(description='Manage vibe.db memory index')
     parser.add_argument('--init', action='store_true', help='Initialize database')
     parser.add_argument('--db', default='.claude/memory/vibe.db', help='Database path')
-    parser.add_argument('--index', help='Index a file')
+    parser.add_argument('--index', nargs='+', metavar='FILE', help='Index one or more files')
+    parser.add_argument('--index-dir', metavar='DIR', help='Index every supported file under DIR')
     parser.add_argument('--search', help='Search the database')
+    parser.add_argument('--highlight', action='store_true', help='Print whole matching chunks with matches marked')
     parser.add_argument('--limit', type=int, default=10, help='Search result limit')
 
     args = parser.parse_args()
@@ -152,23 +248,35 @@ def main():
         db_path.parent.mkdir(parents=True, exist_ok=True)
         create_database(db_path)
 
-    elif args.index:
+    elif args.index or args.index_dir:
         if not Path(args.db).exists():
             print(f"Error: Database {args.db} doesn't exist. Run with --init first.")
             sys.exit(1)
-        index_file(args.db, args.index)
+        vibe_sync = load_vibe_sync()
+        vibe_sync.ensure_schema(Path(args.db))
+        project_path = vibe_sync.get_project_root().resolve()
+
+        if args.index_dir:
+            stats = index_dir(args.db, args.index_dir, project_path, vibe_sync)
+        else:
+            files = [(f, _rel_to_project(f, project_path), EXT_TO_LANG.get(Path(f).suffix, 'text'))
+                     for f in args.index]
+            stats = index_files(args.db, files, str(project_path), vibe_sync)
+        print(f"✓ Indexed {stats['files']} files ({stats['chunks']} chunks)")
 
     elif args.search:
         if not Path(args.db).exists():
             print(f"Error: Database {args.db} doesn't exist. Run with --init first.")
             sys.exit(1)
-        results = search(args.db, args.search, args.limit)
-        for path, snippet in results:
-            print(f"{path}:")
-            print(f"  {snippet}\n")
+        vibe_sync = load_vibe_sync()
+        vibe_sync.ensure_schema(Path(args.db))
+        results = search(args.db, args.search, args.limit, vibe_sync)
+        for path, line, snippet, highlighted in results:
+            print(f"{path}:{line}:")
+            print(f"  {highlighted if args.highlight else snippet}\n")
 
     else:
         parser.print_help()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
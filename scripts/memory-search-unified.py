@@ -4,9 +4,18 @@ memory-search-unified.py
 ========================
 
 Unified memory search across:
-- ProjectContextServer's per-project vibe.db
+- The per-project vibe.db (.claude/memory, else ProjectContextServer's)
 - Workshop's per-project workshop.db (via the `workshop` CLI)
 
+Every source is queried concurrently on a small thread pool (each vibe.db
+source gets its own read-only SQLite connection) under a per-source timeout.
+The per-source rankings are merged with reciprocal-rank fusion (RRF) into a
+single top-k list, so one slow or huge source can't stall or flood the answer.
+
+Complete (non-timed-out) answers are kept in a small on-disk LRU cache keyed
+by (query, mode, top-k) and validated against the size/mtime of the source
+databases, so a repeat query is a single lookup until memory changes.
+
 Intended install location:
   ~/.claude/scripts/memory-search-unified.py
 
@@ -18,6 +27,7 @@ Usage:
   python3 ~/.claude/scripts/memory-search-unified.py "database schema" \\
     --mode all \\
     --top-k 20 \\
+    --timeout 1.5 \\
     --json
 
 Modes (soft semantics):
@@ -35,8 +45,20 @@ import os
 import sqlite3
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Reciprocal-rank fusion constant (Cormack et al. use 60; it damps the
+# advantage of the very first rank so no single source dominates).
+RRF_K = 60
+
+# Default per-source time budget in seconds.
+DEFAULT_SOURCE_TIMEOUT = 2.0
+
+# Max cached answers kept in .claude/memory-search-cache.db (LRU).
+CACHE_MAX_ENTRIES = 128
 
 
 def get_project_root() -> Path:
@@ -59,137 +81,207 @@ def get_project_root() -> Path:
   return Path(os.environ.get("PWD", os.getcwd()))
 
 
-def search_vibe_db(
-  project_root: Path, query: str, mode: str, top_k: int
-) -> List[Dict[str, Any]]:
+def get_vibe_db_path(project_root: Path) -> Path:
+  """
+  The project's vibe.db: .claude/memory/vibe.db (vibe-sync.py owns its schema,
+  including decisions/task_history/events), else ProjectContextServer's
+  .claude/project/vibe.db.
   """
-  Search the per-project vibe.db if present.
+  memory_db = project_root / ".claude" / "memory" / "vibe.db"
+  if memory_db.exists():
+    return memory_db
+  return project_root / ".claude" / "project" / "vibe.db"
 
-  We keep this intentionally simple: use LIKE-based search across key text
-  fields and return a small structured summary.
+
+def connect_readonly(db_path: Path, deadline: float) -> sqlite3.Connection:
   """
-  db_path = project_root / ".claude" / "project" / "vibe.db"
-  if not db_path.exists():
-    return []
+  Open a read-only connection whose queries abort once `deadline` passes.
 
-  results: List[Dict[str, Any]] = []
-  con = sqlite3.connect(str(db_path))
+  The progress handler is polled by SQLite every N VM instructions; returning
+  a truthy value interrupts the running statement, so a LIKE scan over a huge
+  table gives up instead of holding its worker thread past the timeout.
+  """
+  from urllib.parse import quote
+  # Quoted so '?', '#' or '%' in the project path stay part of the file name
+  con = sqlite3.connect(f"file:{quote(str(db_path))}?mode=ro", uri=True, timeout=1.0)
   con.row_factory = sqlite3.Row
+  con.set_progress_handler(lambda: time.monotonic() > deadline, 10_000)
+  return con
+
+
+# ------------------------------------------------------------
+# vibe.db sources
+# ------------------------------------------------------------
+# Each source returns its own ranked list (best first). Rows whose primary
+# field matches sort ahead of rows that only match in secondary text; recency
+# breaks ties.
+
+
+def search_vibe_decisions(
+  db_path: Path, query: str, top_k: int, deadline: float
+) -> List[Dict[str, Any]]:
   pattern = f"%{query}%"
+  con = connect_readonly(db_path, deadline)
+  try:
+    rows = con.execute(
+      """
+      SELECT id, timestamp, domain, decision, reasoning
+      FROM decisions
+      WHERE decision LIKE ? OR reasoning LIKE ?
+      ORDER BY (decision LIKE ?) DESC, timestamp DESC
+      LIMIT ?
+      """,
+      (pattern, pattern, pattern, top_k),
+    ).fetchall()
+  finally:
+    con.close()
+  return [
+    {
+      "source": "vibe.decisions",
+      "id": r["id"],
+      "timestamp": r["timestamp"],
+      "domain": r["domain"],
+      "snippet": (r["decision"] or "")[:200],
+    }
+    for r in rows
+  ]
+
 
+def search_vibe_task_history(
+  db_path: Path, query: str, top_k: int, deadline: float
+) -> List[Dict[str, Any]]:
+  pattern = f"%{query}%"
+  con = connect_readonly(db_path, deadline)
   try:
-    # Decisions
-    if mode in ("all", "decisions"):
-      try:
-        rows = con.execute(
-          """
-          SELECT id, timestamp, domain, decision, reasoning
-          FROM decisions
-          WHERE decision LIKE ? OR reasoning LIKE ?
-          ORDER BY timestamp DESC
-          LIMIT ?
-          """,
-          (pattern, pattern, top_k),
-        ).fetchall()
-        for r in rows:
-          results.append(
-            {
-              "source": "vibe.decisions",
-              "id": r["id"],
-              "timestamp": r["timestamp"],
-              "domain": r["domain"],
-              "snippet": (r["decision"] or "")[:200],
-            }
-          )
-      except Exception:
-        pass
+    rows = con.execute(
+      """
+      SELECT id, timestamp, domain, task, learnings
+      FROM task_history
+      WHERE task LIKE ? OR learnings LIKE ?
+      ORDER BY (task LIKE ?) DESC, timestamp DESC
+      LIMIT ?
+      """,
+      (pattern, pattern, pattern, top_k),
+    ).fetchall()
+  finally:
+    con.close()
+  return [
+    {
+      "source": "vibe.task_history",
+      "id": r["id"],
+      "timestamp": r["timestamp"],
+      "domain": r["domain"],
+      "snippet": (r["task"] or "")[:200],
+    }
+    for r in rows
+  ]
 
-    # Task history
-    if mode in ("all", "decisions"):
-      try:
-        rows = con.execute(
-          """
-          SELECT id, timestamp, domain, task, learnings
-          FROM task_history
-          WHERE task LIKE ? OR learnings LIKE ?
-          ORDER BY timestamp DESC
-          LIMIT ?
-          """,
-          (pattern, pattern, top_k),
-        ).fetchall()
-        for r in rows:
-          results.append(
-            {
-              "source": "vibe.task_history",
-              "id": r["id"],
-              "timestamp": r["timestamp"],
-              "domain": r["domain"],
-              "snippet": (r["task"] or "")[:200],
-            }
-          )
-      except Exception:
-        pass
 
-    # Events (if any)
-    if mode in ("all", "events"):
-      try:
-        rows = con.execute(
-          """
-          SELECT id, timestamp, type, data
-          FROM events
-          WHERE type LIKE ? OR data LIKE ?
-          ORDER BY timestamp DESC
-          LIMIT ?
-          """,
-          (pattern, pattern, top_k),
-        ).fetchall()
-        for r in rows:
-          results.append(
-            {
-              "source": "vibe.events",
-              "id": r["id"],
-              "timestamp": r["timestamp"],
-              "event_type": r["type"],
-              "snippet": (r["data"] or "")[:200],
-            }
-          )
-      except Exception:
-        pass
+def search_vibe_events(
+  db_path: Path, query: str, top_k: int, deadline: float
+) -> List[Dict[str, Any]]:
+  pattern = f"%{query}%"
+  con = connect_readonly(db_path, deadline)
+  try:
+    rows = con.execute(
+      """
+      SELECT id, timestamp, type, data
+      FROM events
+      WHERE type LIKE ? OR data LIKE ?
+      ORDER BY (type LIKE ?) DESC, timestamp DESC
+      LIMIT ?
+      """,
+      (pattern, pattern, pattern, top_k),
+    ).fetchall()
   finally:
     con.close()
+  return [
+    {
+      "source": "vibe.events",
+      "id": r["id"],
+      "timestamp": r["timestamp"],
+      "event_type": r["type"],
+      "snippet": (r["data"] or "")[:200],
+    }
+    for r in rows
+  ]
 
-  return results
 
+# ------------------------------------------------------------
+# Workshop source
+# ------------------------------------------------------------
 
-def search_workshop(project_root: Path, query: str) -> Tuple[str, int]:
-  """
-  Use the `workshop` CLI to search the per-project Workshop DB, if available.
-  Returns (output, returncode).
-  """
+
+def get_workshop_workspace(project_root: Path) -> Path:
   workspace = project_root / ".claude" / "memory"
   if not workspace.exists():
     # Fall back to legacy locations if needed
     legacy = project_root / ".workshop"
     if legacy.exists():
       workspace = legacy
+  return workspace
 
-  if not workspace.exists():
-    return ("Workshop workspace not found (expected .claude/memory or .workshop).", 1)
 
-  if not shutil_which("workshop"):
-    return ("`workshop` CLI not found on PATH.", 1)
+def search_workshop(
+  project_root: Path, query: str, top_k: int = 10, timeout: Optional[float] = None
+) -> Tuple[str, int, List[Dict[str, Any]]]:
+  """
+  Use the Workshop CLI to search the per-project Workshop DB, if available.
+
+  Prefers `claude-workshop search --json` so its hits can take part in rank
+  fusion; falls back to the legacy `workshop` CLI, whose plain-text output is
+  passed through as-is.
+
+  Returns (output, returncode, ranked_results).
+  """
+  workspace = get_workshop_workspace(project_root)
+
+  if not workspace.exists():
+    return ("Workshop workspace not found (expected .claude/memory or .workshop).", 1, [])
+
+  if shutil_which("claude-workshop"):
+    cmd = [
+      "claude-workshop", "--workspace", str(workspace),
+      "search", query, "--json", "--limit", str(top_k),
+    ]
+  elif shutil_which("workshop"):
+    cmd = ["workshop", "--workspace", str(workspace), "search", query]
+  else:
+    return ("`workshop` CLI not found on PATH.", 1, [])
 
   try:
     proc = subprocess.run(
-      ["workshop", "--workspace", str(workspace), "search", query],
+      cmd,
       capture_output=True,
       text=True,
       check=False,
+      timeout=timeout,
     )
-    output = proc.stdout.strip() or proc.stderr.strip()
-    return (output, proc.returncode)
+  except subprocess.TimeoutExpired:
+    return (f"Workshop search timed out after {timeout:.1f}s", 1, [])
   except Exception as e:
-    return (f"Workshop search failed: {e}", 1)
+    return (f"Workshop search failed: {e}", 1, [])
+
+  output = proc.stdout.strip() or proc.stderr.strip()
+  results: List[Dict[str, Any]] = []
+  try:
+    entries = json.loads(proc.stdout) if proc.stdout.strip() else []
+  except json.JSONDecodeError:
+    entries = []
+  if isinstance(entries, list):
+    for e in entries:
+      if not isinstance(e, dict):
+        continue
+      results.append(
+        {
+          "source": f"workshop.{e.get('type', 'entry')}",
+          "id": e.get("id"),
+          "timestamp": e.get("timestamp"),
+          "domain": e.get("domain"),
+          "snippet": (e.get("content") or "")[:200],
+        }
+      )
+  return (output, proc.returncode, results)
 
 
 def shutil_which(cmd: str) -> bool:
@@ -198,6 +290,211 @@ def shutil_which(cmd: str) -> bool:
   return which(cmd) is not None
 
 
+# ------------------------------------------------------------
+# Fan-out + fusion
+# ------------------------------------------------------------
+
+
+def reciprocal_rank_fusion(
+  ranked_lists: Dict[str, List[Dict[str, Any]]], top_k: int, k: int = RRF_K
+) -> List[Dict[str, Any]]:
+  """
+  Merge per-source rankings with RRF: score(d) = sum(1 / (k + rank_s(d))).
+
+  Items with the same normalized snippet are treated as one document, so a
+  decision mirrored in both vibe.db and Workshop is boosted rather than
+  listed twice.
+  """
+  fused: Dict[str, Dict[str, Any]] = {}
+  for source, items in ranked_lists.items():
+    for rank, item in enumerate(items, start=1):
+      snippet_key = " ".join((item.get("snippet") or "").lower().split())
+      key = snippet_key or f"{item.get('source', source)}:{item.get('id')}"
+      entry = fused.get(key)
+      if entry is None:
+        entry = dict(item)
+        entry["rrf_score"] = 0.0
+        entry["sources"] = []
+        fused[key] = entry
+      entry["rrf_score"] += 1.0 / (k + rank)
+      item_source = item.get("source", source)
+      if item_source not in entry["sources"]:
+        entry["sources"].append(item_source)
+
+  merged = sorted(fused.values(), key=lambda r: -r["rrf_score"])
+  for r in merged:
+    r["rrf_score"] = round(r["rrf_score"], 5)
+  return merged[:top_k]
+
+
+def run_sources(
+  project_root: Path, query: str, mode: str, top_k: int, timeout: float
+) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Any]], Tuple[str, int]]:
+  """
+  Query every applicable source concurrently.
+
+  Returns (ranked_lists, source_status, (workshop_output, workshop_rc)).
+  Sources that miss the deadline are reported in source_status and simply
+  contribute nothing to the fused ranking.
+  """
+  db_path = get_vibe_db_path(project_root)
+  deadline = time.monotonic() + timeout
+
+  tasks: Dict[str, Callable[[], Any]] = {}
+  if db_path.exists():
+    if mode in ("all", "decisions"):
+      tasks["vibe.decisions"] = lambda: search_vibe_decisions(db_path, query, top_k, deadline)
+      tasks["vibe.task_history"] = lambda: search_vibe_task_history(db_path, query, top_k, deadline)
+    if mode in ("all", "events"):
+      tasks["vibe.events"] = lambda: search_vibe_events(db_path, query, top_k, deadline)
+  tasks["workshop"] = lambda: search_workshop(project_root, query, top_k, timeout)
+
+  ranked: Dict[str, List[Dict[str, Any]]] = {}
+  status: Dict[str, Dict[str, Any]] = {}
+  workshop_output, workshop_rc = ("", 1)
+
+  def timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    out = fn()
+    return out, (time.perf_counter() - t0) * 1000
+
+  pool = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="memsearch")
+  try:
+    futures = {pool.submit(timed, fn): name for name, fn in tasks.items()}
+    done, not_done = wait(futures, timeout=timeout)
+
+    for fut in not_done:
+      name = futures[fut]
+      status[name] = {"ok": False, "timed_out": True, "count": 0}
+      if name == "workshop":
+        workshop_output = f"Workshop search timed out after {timeout:.1f}s"
+
+    for fut in done:
+      name = futures[fut]
+      try:
+        out, elapsed_ms = fut.result()
+      except sqlite3.OperationalError as e:
+        # "interrupted" means our progress handler hit the deadline.
+        timed_out = "interrupted" in str(e)
+        status[name] = {"ok": False, "timed_out": timed_out, "count": 0, "error": str(e)}
+        continue
+      except Exception as e:
+        status[name] = {"ok": False, "timed_out": False, "count": 0, "error": str(e)}
+        continue
+
+      if name == "workshop":
+        workshop_output, workshop_rc, items = out
+      else:
+        items = out
+      ranked[name] = items
+      status[name] = {
+        "ok": True,
+        "timed_out": False,
+        "count": len(items),
+        "elapsed_ms": round(elapsed_ms, 1),
+      }
+  finally:
+    # Don't block on stragglers; vibe queries abort themselves at the deadline
+    # and the workshop subprocess carries its own timeout.
+    pool.shutdown(wait=False, cancel_futures=True)
+
+  return ranked, status, (workshop_output, workshop_rc)
+
+
+# ------------------------------------------------------------
+# Result cache
+# ------------------------------------------------------------
+
+
+def get_sources_version(project_root: Path) -> str:
+  """
+  Cheap version stamp for every DB we read: (size, mtime_ns) of the vibe.db
+  and workshop.db files plus their WAL sidecars. Any write to a source
+  changes the stamp, so cached answers go stale automatically.
+  """
+  parts = []
+  workshop_db = get_workshop_workspace(project_root) / "workshop.db"
+  for db in (get_vibe_db_path(project_root), workshop_db):
+    for path in (db, db.with_name(db.name + "-wal")):
+      try:
+        st = path.stat()
+        parts.append(f"{st.st_size}:{st.st_mtime_ns}")
+      except OSError:
+        parts.append("-")
+  return "|".join(parts)
+
+
+class ResultCache:
+  """Tiny SQLite-backed LRU of fused answers. All failures behave as misses."""
+
+  def __init__(self, project_root: Path):
+    self.path = project_root / ".claude" / "memory-search-cache.db"
+    self.version = get_sources_version(project_root)
+    self.con: Optional[sqlite3.Connection] = None
+    if self.path.parent.exists():
+      try:
+        self.con = sqlite3.connect(str(self.path), timeout=0.5)
+        self.con.execute(
+          """
+          CREATE TABLE IF NOT EXISTS answers (
+            key TEXT PRIMARY KEY,
+            version TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            last_used REAL NOT NULL
+          )
+          """
+        )
+      except sqlite3.Error:
+        self.con = None
+
+  @staticmethod
+  def make_key(query: str, mode: str, top_k: int) -> str:
+    return json.dumps([query, mode, top_k])
+
+  def get(self, key: str) -> Optional[Dict[str, Any]]:
+    if self.con is None:
+      return None
+    try:
+      row = self.con.execute(
+        "SELECT version, payload FROM answers WHERE key = ?", (key,)
+      ).fetchone()
+      if not row or row[0] != self.version:
+        return None
+      self.con.execute(
+        "UPDATE answers SET last_used = ? WHERE key = ?", (time.time(), key)
+      )
+      self.con.commit()
+      return json.loads(row[1])
+    except (sqlite3.Error, ValueError):
+      return None
+
+  def put(self, key: str, payload: Dict[str, Any]) -> None:
+    if self.con is None:
+      return
+    try:
+      self.con.execute(
+        "INSERT OR REPLACE INTO answers (key, version, payload, last_used) VALUES (?, ?, ?, ?)",
+        (key, self.version, json.dumps(payload), time.time()),
+      )
+      self.con.execute("DELETE FROM answers WHERE version != ?", (self.version,))
+      self.con.execute(
+        """
+        DELETE FROM answers WHERE key IN (
+          SELECT key FROM answers ORDER BY last_used DESC LIMIT -1 OFFSET ?
+        )
+        """,
+        (CACHE_MAX_ENTRIES,),
+      )
+      self.con.commit()
+    except sqlite3.Error:
+      pass
+
+  def close(self) -> None:
+    if self.con is not None:
+      self.con.close()
+      self.con = None
+
+
 def main(argv: list[str] | None = None) -> int:
   parser = argparse.ArgumentParser(
     description="Unified memory search across vibe.db and Workshop."
@@ -213,28 +510,74 @@ def main(argv: list[str] | None = None) -> int:
     "--top-k",
     type=int,
     default=10,
-    help="Max results per source (vibe tables)",
+    help="Max results per source and in the fused list",
+  )
+  parser.add_argument(
+    "--timeout",
+    type=float,
+    default=DEFAULT_SOURCE_TIMEOUT,
+    help=f"Per-source time budget in seconds (default: {DEFAULT_SOURCE_TIMEOUT})",
   )
   parser.add_argument(
     "--json",
     action="store_true",
     help="Output JSON instead of human-readable text",
   )
+  parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="Bypass the on-disk result cache",
+  )
 
   args = parser.parse_args(argv)
   root = get_project_root()
 
-  vibe_results = search_vibe_db(root, args.query, args.mode, args.top_k)
-  workshop_output, workshop_rc = search_workshop(root, args.query)
+  t0 = time.perf_counter()
+  cache = None if args.no_cache else ResultCache(root)
+  cache_key = ResultCache.make_key(args.query, args.mode, args.top_k)
+  cached = cache.get(cache_key) if cache else None
+
+  if cached is not None:
+    ranked = cached["ranked"]
+    status = cached["sources"]
+    workshop_output, workshop_rc = cached["workshop_output"], cached["workshop_rc"]
+  else:
+    ranked, status, (workshop_output, workshop_rc) = run_sources(
+      root, args.query, args.mode, args.top_k, args.timeout
+    )
+    # Only complete answers are worth replaying
+    if cache and not any(s.get("timed_out") for s in status.values()):
+      cache.put(
+        cache_key,
+        {
+          "ranked": ranked,
+          "sources": status,
+          "workshop_output": workshop_output,
+          "workshop_rc": workshop_rc,
+        },
+      )
+  if cache:
+    cache.close()
+
+  results = reciprocal_rank_fusion(ranked, args.top_k)
+  elapsed_ms = (time.perf_counter() - t0) * 1000
+
+  vibe_results = [
+    r for name, items in ranked.items() if name.startswith("vibe.") for r in items
+  ]
 
   if args.json:
     payload = {
       "query": args.query,
       "mode": args.mode,
       "project_root": str(root),
+      "results": results,
+      "sources": status,
+      "elapsed_ms": round(elapsed_ms, 1),
+      "cached": cached is not None,
       "vibe": vibe_results,
       "workshop": {
-        "workspace": str(root / ".claude" / "memory"),
+        "workspace": str(get_workshop_workspace(root)),
         "returncode": workshop_rc,
         "output": workshop_output,
       },
@@ -247,21 +590,28 @@ def main(argv: list[str] | None = None) -> int:
   print(f"Project root: {root}")
   print()
 
-  print("=== vibe.db (decisions/task history/events) ===")
-  if not vibe_results:
-    print("(no matches or vibe.db missing)")
+  print("=== Top results (reciprocal-rank fusion) ===")
+  if not results:
+    print("(no matches)")
   else:
-    for r in vibe_results:
-      print(f"- [{r['source']}] {r.get('timestamp','')} {r.get('domain','')}".strip())
+    for r in results:
+      sources = ", ".join(r.get("sources", []))
+      print(f"- [{sources}] {r.get('timestamp') or ''} {r.get('domain') or ''}".rstrip())
       print(f"  {r.get('snippet','')}")
   print()
 
-  print("=== Workshop search ===")
-  print(workshop_output or "(no output)")
+  slow = [name for name, s in status.items() if s.get("timed_out")]
+  if slow:
+    print(f"(timed out after {args.timeout:.1f}s: {', '.join(sorted(slow))})")
+    print()
+
+  if workshop_output and not ranked.get("workshop"):
+    # Legacy CLI / error text that couldn't be fused
+    print("=== Workshop search ===")
+    print(workshop_output)
 
   return 0
 
 
 if __name__ == "__main__":
   raise SystemExit(main())
-
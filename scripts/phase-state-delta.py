@@ -51,7 +51,6 @@ import json
 import os
 import subprocess
 import sys
-import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -99,6 +98,7 @@ class DeltaOp:
 
 def generate_session_id() -> str:
     """Generate a unique session ID."""
+    import uuid
     return uuid.uuid4().hex
 
 
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+startup-bench.py
+================
+
+Cold-start benchmark for the Python entry points that hooks launch many
+times per session.
+
+Each entry point runs under `python -X importtime` in a scratch directory.
+The self-times of every module it imported are summed, and the median over
+--runs is checked against the entry point's budget. The check also fails if
+the process imports a module it must not, such as rich on a --json path or
+numpy in the skill hook.
+
+Usage:
+  python3 startup-bench.py                      # all entry points, 5 runs
+  python3 startup-bench.py --runs 10 --json
+  python3 startup-bench.py --only claude-workshop-why-json
+  python3 startup-bench.py --scale 2            # double every budget (slow CI)
+
+Exit status is 1 if any entry point is over budget or imports a forbidden
+module.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# ============================================================
+# ENTRY POINTS
+# ============================================================
+
+# Works from the repo and from ~/.claude: both have scripts/ and
+# skill-catalog/ as siblings.
+ROOT = Path(__file__).resolve().parent.parent
+WORKSHOP_SRC = ROOT / "mcp" / "workshop-cli"
+
+SKILL_HOOK_EVENT = json.dumps({
+    "tool": "Read",
+    "input": {"file_path": "src/components/LoginForm.tsx"},
+    "output": {"content": "import React, { useState } from 'react'\nconst token = ''"},
+})
+
+# budget_ms: median summed import time, with headroom over a cold run on a
+# slow container (pathlib alone pulls in urllib.parse, so only
+# urllib.request is forbidden). "{tmp}" is the scratch directory.
+ENTRY_POINTS: List[Dict[str, Any]] = [
+    {
+        "name": "skill-discovery",
+        "argv": [str(ROOT / "skill-catalog" / "skill-discovery.py")],
+        "stdin": SKILL_HOOK_EVENT,
+        "budget_ms": 40,
+        "forbidden": ["numpy", "sentence_transformers", "torch", "rich", "urllib.request"],
+    },
+    {
+        "name": "phase-state-delta-show",
+        "argv": [str(ROOT / "scripts" / "phase-state-delta.py"), "show"],
+        "setup": [[str(ROOT / "scripts" / "phase-state-delta.py"), "init",
+                   "--domain", "bench", "--request", "startup benchmark"]],
+        "budget_ms": 60,
+        "forbidden": ["uuid", "numpy", "rich", "urllib.request"],
+    },
+    {
+        "name": "vibe-sync-help",
+        "argv": [str(ROOT / "scripts" / "vibe-sync.py"), "--help"],
+        "budget_ms": 80,
+        "forbidden": ["numpy", "sentence_transformers", "urllib.request", "hnswlib", "watchdog"],
+    },
+    {
+        "name": "claude-workshop-why-json",
+        "argv": ["-m", "claude_workshop.cli", "-w", "{tmp}", "why", "--json", "sqlite"],
+        "setup": [["-m", "claude_workshop.cli", "-w", "{tmp}", "init"]],
+        "pythonpath": WORKSHOP_SRC,
+        "budget_ms": 90,
+        "forbidden": ["rich", "hashlib", "claude_workshop.import_jsonl"],
+    },
+    {
+        "name": "claude-workshop-context",
+        "argv": ["-m", "claude_workshop.cli", "-w", "{tmp}", "context"],
+        "setup": [["-m", "claude_workshop.cli", "-w", "{tmp}", "init"]],
+        "pythonpath": WORKSHOP_SRC,
+        "budget_ms": 90,
+        "forbidden": ["rich", "hashlib", "claude_workshop.import_jsonl"],
+    },
+]
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Map module -> self time (us) from `-X importtime` output."""
+    modules: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header row
+        modules[fields[2].strip()] = int(fields[0])
+    return modules
+
+
+def top_level_cumulative(stderr: str, n: int = 5) -> List[List[Any]]:
+    """Heaviest directly-imported modules as [name, cumulative ms]."""
+    rows = []
+    for line in stderr.splitlines():
+        fields = line[len("import time:"):].split("|")
+        if not line.startswith("import time:") or len(fields) != 3:
+            continue
+        name = fields[2]
+        # One leading space marks an import made by __main__ itself
+        if name.startswith(" ") and not name.startswith("  ") and fields[1].strip().isdigit():
+            rows.append([name.strip(), round(int(fields[1]) / 1000, 2)])
+    rows.sort(key=lambda r: -r[1])
+    return rows[:n]
+
+
+def _expand(argv: List[str], tmp: str) -> List[str]:
+    return [a.replace("{tmp}", tmp) for a in argv]
+
+
+def run_entry_point(entry: Dict[str, Any], runs: int) -> Dict[str, Any]:
+    """Run one entry point `runs` times; returns timings and imported modules."""
+    env = dict(os.environ, CLAUDE_SESSION_ID="startup-bench")
+    if entry.get("pythonpath") and Path(entry["pythonpath"]).is_dir():
+        env["PYTHONPATH"] = os.pathsep.join(
+            p for p in (str(entry["pythonpath"]), env.get("PYTHONPATH")) if p)
+
+    import_ms: List[float] = []
+    wall_ms: List[float] = []
+    imported: set = set()
+    heaviest: List[List[Any]] = []
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as tmp:
+        for argv in entry.get("setup", []):
+            subprocess.run([sys.executable] + _expand(argv, tmp), cwd=tmp, env=env,
+                           capture_output=True, text=True)
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-X", "importtime"] + _expand(entry["argv"], tmp),
+                cwd=tmp, env=env, input=entry.get("stdin", ""),
+                capture_output=True, text=True,
+            )
+            wall_ms.append((time.perf_counter() - t0) * 1000)
+            modules = parse_importtime(proc.stderr)
+            import_ms.append(sum(modules.values()) / 1000)
+            imported |= set(modules)
+            heaviest = top_level_cumulative(proc.stderr)
+
+    forbidden = sorted(
+        m for m in imported
+        if any(m == f or m.startswith(f + ".") for f in entry.get("forbidden", []))
+    )
+    return {
+        "name": entry["name"],
+        "import_ms": round(statistics.median(import_ms), 2),
+        "wall_ms": round(statistics.median(wall_ms), 2),
+        "modules": len(imported),
+        "heaviest": heaviest,
+        "forbidden_imports": forbidden,
+    }
+
+
+def run_benchmark(runs: int = 5, scale: float = 1.0,
+                  only: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Benchmark every entry point and check it against its budget."""
+    results = []
+    for entry in ENTRY_POINTS:
+        if only and entry["name"] not in only:
+            continue
+        script = next((a for a in entry["argv"] if a.endswith(".py")), None)
+        if script and not Path(script).exists():
+            results.append({"name": entry["name"], "skipped": f"{script} not found"})
+            continue
+        result = run_entry_point(entry, runs)
+        result["budget_ms"] = round(entry["budget_ms"] * scale, 2)
+        result["ok"] = result["import_ms"] <= result["budget_ms"] and not result["forbidden_imports"]
+        results.append(result)
+    return {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "entry_points": results,
+        "ok": all(r.get("ok", True) for r in results),
+    }
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import budgets for hook entry points")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per entry point (median is used)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget")
+    parser.add_argument("--only", action="append", help="Entry point name (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Output as JSON")
+    args = parser.parse_args()
+
+    report = run_benchmark(max(1, args.runs), args.scale, args.only)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Startup benchmark (python {report['python']}, median of {report['runs']})")
+        print("=" * 72)
+        for r in report["entry_points"]:
+            if "skipped" in r:
+                print(f"  SKIP  {r['name']:<28} {r['skipped']}")
+                continue
+            status = "OK  " if r["ok"] else "FAIL"
+            print(f"  {status}  {r['name']:<28} imports {r['import_ms']:6.1f} ms "
+                  f"(budget {r['budget_ms']:.0f})  wall {r['wall_ms']:6.1f} ms  "
+                  f"{r['modules']} modules")
+            if r["forbidden_imports"]:
+                print(f"        forbidden: {', '.join(r['forbidden_imports'])}")
+            if not r["ok"]:
+                heaviest = ", ".join(f"{name} {ms:.1f}" for name, ms in r["heaviest"])
+                print(f"        heaviest: {heaviest}")
+
+    sys.exit(0 if report["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,10 @@ vibe-sync.py v2.0
 
 Enhanced code context sync with:
 - Hybrid search (semantic + symbol + full-text with weighted ranking)
-- Language-specific chunkers (TypeScript, Swift, Python) with AST-aware parsing
+- Language-specific chunkers (TypeScript, Swift, Python): tree-sitter / ast
+  spans when available, regex fallback
 - Symbol extraction for function/class/export search
+- Query cache (results + query embeddings) invalidated by each sync
 
 Usage:
     # Sync current project with language-aware chunking
@@ -21,14 +23,44 @@ Usage:
     # Symbol search (function/class names)
     python3 ~/.claude/scripts/vibe-sync.py symbol "handleAuth"
 
-    # Full-text search
+    # Fuzzy symbol search (typos, hAuth, handle_auth)
+    python3 ~/.claude/scripts/vibe-sync.py symbol "handelAuth" --fuzzy
+
+    # Full-text search (auth* for prefixes, "quoted phrase", --mode or/phrase)
     python3 ~/.claude/scripts/vibe-sync.py search "authentication"
 
     # Vector/semantic search (requires embeddings)
     python3 ~/.claude/scripts/vibe-sync.py vsearch "user login flow"
 
-    # Initialize/upgrade schema
+    # Any search command accepts --no-cache to bypass the query cache
+    python3 ~/.claude/scripts/vibe-sync.py hsearch "auth" --no-cache
+
+    # Benchmark hybrid search latency per leg
+    python3 ~/.claude/scripts/vibe-sync.py bench "auth" "database schema" --json
+
+    # Store embeddings as int8 (4x smaller); re-encode an existing DB; compare recall
+    python3 ~/.claude/scripts/vibe-sync.py sync --embeddings --encoding int8
+    python3 ~/.claude/scripts/vibe-sync.py quantize float16
+    python3 ~/.claude/scripts/vibe-sync.py embed-bench
+
+    # Keep vibe.db live: re-chunk files as they change (watchdog or polling)
+    python3 ~/.claude/scripts/vibe-sync.py watch
+    python3 ~/.claude/scripts/vibe-sync.py watch --stop
+
+    # Search all registered projects at once (sync registers each project)
+    python3 ~/.claude/scripts/vibe-sync.py fsearch "rate limiter" --mode hybrid
+    python3 ~/.claude/scripts/vibe-sync.py projects
+
+    # ANN index for semantic search (built by sync --embeddings); exact scan on demand
+    python3 ~/.claude/scripts/vibe-sync.py vsearch "user login flow" --exact
+    python3 ~/.claude/scripts/vibe-sync.py ann-bench
+
+    # Compare parser-backed (tree-sitter / ast) and regex chunking
+    python3 ~/.claude/scripts/vibe-sync.py chunk-bench
+
+    # Initialize/upgrade schema (migrations keyed on PRAGMA user_version)
     python3 ~/.claude/scripts/vibe-sync.py init
+    python3 ~/.claude/scripts/vibe-sync.py init --reindex   # also rebuild FTS
 
 Install location: ~/.claude/scripts/vibe-sync.py
 """
@@ -49,11 +81,19 @@ from typing import Any, Dict, List, Optional
 # CONFIGURATION
 # ============================================================
 
-SCHEMA_VERSION = "2.1.0"
+SCHEMA_VERSION = 3  # PRAGMA user_version; see SCHEMA_MIGRATIONS
 EMBEDDING_MODEL = "nomic-embed-text"
 EMBEDDING_DIM = 768  # nomic-embed-text dimension
+# Stored vector encodings; anything but float32 is tagged in embedding_model
+# as "<model>@<encoding>" (float16: 2 B/dim, int8: 1 B/dim + float32 scale)
+EMBEDDING_ENCODINGS = ("float32", "float16", "int8")
 OLLAMA_URL = "http://localhost:11434"
 
+# Query cache (sits next to vibe.db; results are validated against the
+# DB generation counter that every sync bumps)
+CACHE_MAX_RESULTS = 256      # cached result lists (LRU)
+CACHE_MAX_EMBEDDINGS = 1024  # cached query embeddings (LRU)
+
 # Hybrid search weights (must sum to 1.0)
 SEARCH_WEIGHTS = {
     "semantic": 0.4,   # Embedding similarity
@@ -61,6 +101,20 @@ SEARCH_WEIGHTS = {
     "fulltext": 0.25,  # FTS5 keyword match
 }
 
+# Per-leg candidate budgets for hybrid search: (multiple of limit, floor).
+# Each leg fetches its own pool so a noisy leg can't starve the others.
+SEARCH_LEG_BUDGETS = {
+    "symbol": (2, 20),
+    "fulltext": (3, 30),
+    "semantic": (3, 30),
+}
+
+# bm25() column weights for code_chunks_fts: content, file_path, chunk_type, name
+FTS_COLUMN_WEIGHTS = (1.0, 0.5, 0.2, 2.0)
+
+# Query modes for build_fts_query(); "auto" runs AND, then widens to OR
+FTS_QUERY_MODES = ("auto", "and", "or", "phrase", "prefix")
+
 
 # ============================================================
 # LANGUAGE-SPECIFIC CHUNKERS
@@ -481,8 +535,244 @@ class PythonChunker(BaseChunker):
         return list(set(symbols))
 
 
-# Chunker registry
-CHUNKERS: Dict[str, BaseChunker] = {
+class AstPythonChunker(PythonChunker):
+    """
+    Python chunker on the stdlib ast: one parse, exact spans (decorators
+    included) for top-level classes and functions. Methods and nested defs
+    are recorded as symbols of their enclosing chunk. Falls back to the
+    regex chunker for files that don't parse.
+    """
+
+    def chunk(self, content: str, file_path: str) -> List[CodeChunk]:
+        import ast
+
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return super().chunk(content, file_path)
+
+        defs = (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+        lines = content.split('\n')
+        chunks = []
+        for node in tree.body:
+            if not isinstance(node, defs):
+                continue
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            end = node.end_lineno or node.lineno
+            symbols = {n.name for n in ast.walk(node) if isinstance(n, defs)}
+
+            chunks.append(CodeChunk(
+                content='\n'.join(lines[start - 1:end]),
+                chunk_type="class" if isinstance(node, ast.ClassDef) else "function",
+                name=node.name,
+                start_line=start,
+                end_line=end,
+                language=self.LANGUAGE,
+                symbols=sorted(symbols),
+            ))
+
+        return chunks
+
+
+# tree-sitter grammars: name -> (python module, language factory).
+# Installed with: pip install tree-sitter tree-sitter-typescript
+#                 tree-sitter-javascript tree-sitter-swift
+TREE_SITTER_GRAMMARS = {
+    "typescript": ("tree_sitter_typescript", "language_typescript"),
+    "tsx": ("tree_sitter_typescript", "language_tsx"),
+    "javascript": ("tree_sitter_javascript", "language"),
+    "swift": ("tree_sitter_swift", "language"),
+}
+
+
+def load_tree_sitter_parser(grammar: str):
+    """Return a tree-sitter parser for `grammar`, or None if not installed."""
+    import importlib
+
+    try:
+        from tree_sitter import Language, Parser
+        module_name, factory = TREE_SITTER_GRAMMARS[grammar]
+        language = Language(getattr(importlib.import_module(module_name), factory)())
+        try:
+            return Parser(language)
+        except TypeError:  # tree-sitter < 0.22
+            parser = Parser()
+            parser.set_language(language)
+            return parser
+    except Exception:
+        pass
+
+    # Bundled grammars (tree-sitter-language-pack / tree-sitter-languages)
+    for bundle in ("tree_sitter_language_pack", "tree_sitter_languages"):
+        try:
+            return importlib.import_module(bundle).get_parser(grammar)
+        except Exception:
+            continue
+    return None
+
+
+class TreeSitterChunker(BaseChunker):
+    """
+    Chunker backed by a tree-sitter parse. Each top-level declaration becomes
+    one chunk with its exact span, so braces in strings, template literals
+    and comments can't stretch or truncate it. Declarations nested inside
+    (methods, fields, inner types) become symbols of that chunk.
+
+    When the grammar isn't installed every call goes to `fallback`, the
+    regex chunker for the same language.
+    """
+
+    # Top-level declaration node -> chunk_type (None: derive from keyword)
+    DECLARATIONS = {
+        "function_declaration": "function",
+        "generator_function_declaration": "function",
+        "class_declaration": None,
+        "abstract_class_declaration": "class",
+        "interface_declaration": "interface",
+        "type_alias_declaration": "interface",
+        "enum_declaration": "enum",
+        "protocol_declaration": "protocol",
+        "property_declaration": "property",
+    }
+
+    # Nested nodes whose name is recorded as a chunk symbol
+    SYMBOL_NODES = set(DECLARATIONS) | {
+        "method_definition", "method_signature", "abstract_method_signature",
+        "protocol_function_declaration", "init_declaration",
+    }
+
+    # Bodies aren't searched for symbols: locals and closures are noise
+    FUNCTION_NODES = {
+        "function_declaration", "generator_function_declaration",
+        "method_definition", "init_declaration", "property_declaration",
+    }
+
+    # Function-valued variable declarators: const name = () => ...
+    FUNCTION_VALUES = {"arrow_function", "function_expression", "function", "call_expression"}
+
+    # Swift class_declaration covers all of these; the keyword child decides
+    SWIFT_KINDS = {"class", "struct", "enum", "extension", "actor"}
+
+    def __init__(self, grammar: str, fallback: BaseChunker):
+        self.grammar = grammar
+        self.fallback = fallback
+        self.LANGUAGE = fallback.LANGUAGE
+        self._parser = None
+        self._loaded = False
+
+    @property
+    def parser(self):
+        if not self._loaded:
+            self._parser = load_tree_sitter_parser(self.grammar)
+            self._loaded = True
+        return self._parser
+
+    def chunk(self, content: str, file_path: str) -> List[CodeChunk]:
+        parser = self.parser
+        if parser is None:
+            return self.fallback.chunk(content, file_path)
+
+        tree = parser.parse(content.encode("utf-8"))
+        lines = content.split('\n')
+        chunks = []
+
+        for node in tree.root_node.children:
+            decl = node
+            if node.type == "export_statement":
+                decl = node.child_by_field_name("declaration")
+                if decl is None:
+                    continue  # export default <expr>, re-exports
+
+            found = self._classify(decl)
+            if found is None:
+                continue
+            chunk_type, name = found
+
+            start, end = node.start_point[0], node.end_point[0]
+            symbols = self._symbols(decl)
+            symbols.add(name)
+
+            chunks.append(CodeChunk(
+                content='\n'.join(lines[start:end + 1]),
+                chunk_type=chunk_type,
+                name=name,
+                start_line=start + 1,
+                end_line=end + 1,
+                language=self.LANGUAGE,
+                symbols=sorted(symbols),
+            ))
+
+        return chunks
+
+    @staticmethod
+    def _text(node) -> str:
+        return node.text.decode("utf-8", "replace") if node is not None else ""
+
+    def _name(self, node) -> str:
+        name = node.child_by_field_name("name")
+        if name is None:
+            return ""
+        if name.type == "pattern":  # Swift: let/var bindings
+            return self._text(name).split(":")[0].strip()
+        return self._text(name)
+
+    @staticmethod
+    def _function_kind(name: str, default: str) -> str:
+        """Same naming conventions as the regex chunker: useX hooks, PascalCase components."""
+        if re.match(r'use[A-Z]', name):
+            return "hook"
+        if name[:1].isupper():
+            return "component"
+        return default
+
+    def _classify(self, node) -> Optional[Tuple[str, str]]:
+        """(chunk_type, name) for a top-level declaration, else None."""
+        if node.type in ("lexical_declaration", "variable_declaration"):
+            for child in node.children:
+                if child.type != "variable_declarator":
+                    continue
+                value = child.child_by_field_name("value")
+                if value is not None and value.type in self.FUNCTION_VALUES:
+                    name = self._name(child)
+                    if name:
+                        return self._function_kind(name, "arrow_function"), name
+            return None
+
+        if node.type not in self.DECLARATIONS:
+            return None
+        name = self._name(node)
+        if not name:
+            return None
+
+        chunk_type = self.DECLARATIONS[node.type]
+        if chunk_type is None:
+            keyword = next((c.type for c in node.children if c.type in self.SWIFT_KINDS), "class")
+            chunk_type = keyword
+        elif chunk_type == "function" and self.LANGUAGE != "swift":
+            chunk_type = self._function_kind(name, "function")
+        return chunk_type, name
+
+    def _symbols(self, root) -> set:
+        """Names of the declarations nested under `root`, not inside function bodies."""
+        symbols = set()
+        stack = list(root.children)
+        while stack:
+            node = stack.pop()
+            if node.type in ("variable_declarator", "public_field_definition"):
+                value = node.child_by_field_name("value")
+                if value is not None and value.type in self.FUNCTION_VALUES:
+                    symbols.add(self._name(node))
+                continue
+            if node.type in self.SYMBOL_NODES:
+                symbols.add(self._name(node))
+            if node.type not in self.FUNCTION_NODES:
+                stack.extend(node.children)
+        symbols.discard("")
+        return symbols
+
+
+# Regex chunkers: always available, and the baseline for chunk-bench
+REGEX_CHUNKERS: Dict[str, BaseChunker] = {
     ".ts": TypeScriptChunker(),
     ".tsx": TypeScriptChunker(),
     ".js": TypeScriptChunker(),
@@ -491,6 +781,16 @@ CHUNKERS: Dict[str, BaseChunker] = {
     ".py": PythonChunker(),
 }
 
+# Chunker registry: parser-backed where possible, regex otherwise
+CHUNKERS: Dict[str, BaseChunker] = {
+    ".ts": TreeSitterChunker("typescript", REGEX_CHUNKERS[".ts"]),
+    ".tsx": TreeSitterChunker("tsx", REGEX_CHUNKERS[".tsx"]),
+    ".js": TreeSitterChunker("javascript", REGEX_CHUNKERS[".js"]),
+    ".jsx": TreeSitterChunker("javascript", REGEX_CHUNKERS[".jsx"]),
+    ".swift": TreeSitterChunker("swift", REGEX_CHUNKERS[".swift"]),
+    ".py": AstPythonChunker(),
+}
+
 
 def get_chunker(file_path: str) -> Optional[BaseChunker]:
     """Get the appropriate chunker for a file."""
@@ -498,6 +798,20 @@ def get_chunker(file_path: str) -> Optional[BaseChunker]:
     return CHUNKERS.get(ext)
 
 
+# Splits handleAuthToken / handle_auth_token / HTTPClient / parseV2 into words
+_IDENT_WORD_RE = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+')
+
+
+def split_identifier(name: str) -> List[str]:
+    """Split a camelCase/PascalCase/snake_case identifier into lowercase words."""
+    return [w.lower() for w in _IDENT_WORD_RE.findall(name or "")]
+
+
+def identifier_initials(name: str) -> str:
+    """camelCase/snake_case initials: handleAuthToken -> 'hat' (digits skipped)."""
+    return "".join(w[0] for w in split_identifier(name) if not w.isdigit())
+
+
 # ============================================================
 # UTILITIES
 # ============================================================
@@ -519,8 +833,25 @@ def get_vibe_db_path(project_root: Path) -> Path:
     return project_root / ".claude" / "memory" / "vibe.db"
 
 
-def ensure_schema(db_path: Path) -> None:
-    """Initialize or upgrade vibe.db schema."""
+def connect_readonly(db_path: Path) -> sqlite3.Connection:
+    """Open vibe.db read-only (searches never write, and may run on other projects' shards)."""
+    from urllib.parse import quote
+    return sqlite3.connect(f"file:{quote(str(db_path))}?mode=ro", uri=True)
+
+
+def ensure_schema(db_path: Path, reindex: bool = False) -> List[str]:
+    """
+    Create vibe.db or upgrade it in place to SCHEMA_VERSION.
+
+    PRAGMA user_version records the version. Pending SCHEMA_MIGRATIONS steps,
+    the schema script (CREATE ... IF NOT EXISTS, which backfills new tables
+    and indexes), pending SCHEMA_BACKFILLS steps, FTS rebuilds and the
+    version bump commit as one transaction, so an interrupted upgrade leaves the old DB as it was.
+    An up-to-date DB costs a single PRAGMA read; `reindex` also rebuilds
+    every FTS table.
+
+    Returns the descriptions of the migration steps applied.
+    """
     schema_sql = Path(__file__).parent.parent / ".claude" / "orchestration" / "temp" / "vibe-db-v2-schema.sql"
 
     # If schema file doesn't exist, use inline minimal schema
@@ -531,17 +862,243 @@ def ensure_schema(db_path: Path) -> None:
 
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    con = sqlite3.connect(str(db_path))
+    con = sqlite3.connect(str(db_path), isolation_level=None)
     try:
-        con.executescript(schema_sql_content)
-        con.commit()
-        print(f"Schema initialized: {db_path}")
+        current = con.execute("PRAGMA user_version").fetchone()[0]
+        if current >= SCHEMA_VERSION and not reindex:
+            return []
+        fresh = not _table_columns(con, "code_chunks")
+
+        applied: List[str] = []
+        fts_tables = set(FTS_TABLES) if reindex else set()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            if current < SCHEMA_VERSION:
+                for version, description, step in SCHEMA_MIGRATIONS:
+                    if current < version and not fresh:
+                        fts_tables.update(step(con) or ())
+                        applied.append(description)
+                for statement in iter_sql_statements(schema_sql_content):
+                    con.execute(statement)
+                for version, description, step in SCHEMA_BACKFILLS:
+                    if current < version and not fresh:
+                        fts_tables.update(step(con) or ())
+                        applied.append(description)
+                con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            rebuild_fts(con, sorted(fts_tables))
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+        if fresh:
+            print(f"Schema initialized: {db_path}")
+        elif current < SCHEMA_VERSION:
+            con.execute("PRAGMA optimize")
+            steps = f": {', '.join(applied)}" if applied else ""
+            print(f"Schema migrated v{current} -> v{SCHEMA_VERSION}{steps}")
+        return applied
     finally:
         con.close()
 
 
+def iter_sql_statements(script: str):
+    """Split a schema script into statements (executescript() would commit)."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+
+
+def _table_columns(con: sqlite3.Connection, table: str) -> List[str]:
+    """Column names of `table` ([] if it doesn't exist)."""
+    return [r[1] for r in con.execute(f"PRAGMA table_info({table})")]
+
+
+def _db_project_root(con: sqlite3.Connection) -> Path:
+    """Project root for a <root>/.claude/memory/vibe.db connection."""
+    db_file = Path(con.execute("PRAGMA database_list").fetchone()[2])
+    if db_file.parent.name == "memory" and db_file.parent.parent.name == ".claude":
+        return db_file.parents[2]
+    return db_file.parent
+
+
+# code_chunks columns missing from the memory-index.py 1.0 layout
+_LEGACY_CHUNK_COLUMNS = [
+    ("project_path", "TEXT NOT NULL DEFAULT ''"),
+    ("chunk_index", "INTEGER DEFAULT 0"),
+    ("name", "TEXT"),
+    ("parent_name", "TEXT"),
+    ("start_line", "INTEGER"),
+    ("end_line", "INTEGER"),
+    ("embedding", "BLOB"),
+    ("embedding_model", "TEXT"),
+    ("created_at", "TEXT"),
+    ("updated_at", "TEXT"),
+]
+
+
+def _migrate_memory_index_layout(con: sqlite3.Connection) -> List[str]:
+    """
+    Adopt tables that memory-index.py 1.0 created at this same path:
+    code_chunks without project_path, events(event_type, description) and
+    decisions(created_at). Columns are renamed or added in place, so
+    existing rows are kept.
+    """
+    rebuild = []
+    cols = _table_columns(con, "code_chunks")
+    if cols and "project_path" not in cols:
+        for name, decl in _LEGACY_CHUNK_COLUMNS:
+            if name not in cols:
+                con.execute(f"ALTER TABLE code_chunks ADD COLUMN {name} {decl}")
+        con.execute("UPDATE code_chunks SET project_path = ?", (str(_db_project_root(con)),))
+        rebuild.append("code_chunks_fts")
+
+    cols = _table_columns(con, "events")
+    if "event_type" in cols and "type" not in cols:
+        con.execute("ALTER TABLE events RENAME COLUMN event_type TO type")
+    if cols and "file_path" not in cols:
+        con.execute("ALTER TABLE events ADD COLUMN file_path TEXT")
+    if cols and "data" not in cols:
+        con.execute("ALTER TABLE events ADD COLUMN data TEXT")
+        if "description" in cols:
+            con.execute("UPDATE events SET data = description")
+
+    cols = _table_columns(con, "decisions")
+    if "created_at" in cols and "timestamp" not in cols:
+        con.execute("ALTER TABLE decisions RENAME COLUMN created_at TO timestamp")
+    for name in ("domain", "tags"):
+        if cols and name not in cols:
+            con.execute(f"ALTER TABLE decisions ADD COLUMN {name} TEXT")
+    return rebuild
+
+
+def _migrate_dedupe_components(con: sqlite3.Connection) -> List[str]:
+    """Keep the newest row per (project_path, file_path); sync used to append."""
+    if not _table_columns(con, "components"):
+        return []
+    con.execute("""
+        DELETE FROM components WHERE id NOT IN (
+            SELECT MAX(id) FROM components GROUP BY project_path, file_path
+        )
+    """)
+    return ["components_fts"]
+
+
+def _backfill_symbol_keys(con: sqlite3.Connection) -> List[str]:
+    """Key symbols indexed before symbol_keys/symbols_trigram existed."""
+    rows = con.execute("""
+        SELECT s.id, s.symbol_name FROM symbols s
+        LEFT JOIN symbol_keys k ON k.symbol_id = s.id
+        WHERE k.symbol_id IS NULL
+    """).fetchall()
+    con.executemany("""
+        INSERT INTO symbol_keys (symbol_id, name_lower, initials) VALUES (?, ?, ?)
+    """, ((symbol_id, (name or "").lower(), identifier_initials(name or ""))
+          for symbol_id, name in rows))
+    return ["symbols_trigram"] if rows else []
+
+
+# (user_version, description, step), applied in order to DBs below that
+# version. Steps fix up existing tables and rows and return the FTS tables
+# to rebuild; new tables and indexes come from get_inline_schema(), which
+# runs right after them in the same transaction.
+SCHEMA_MIGRATIONS = [
+    (1, "adopt memory-index.py layout", _migrate_memory_index_layout),
+    (2, "dedupe components", _migrate_dedupe_components),
+]
+
+# Same shape, run after the schema script: steps that fill tables it creates
+SCHEMA_BACKFILLS = [
+    (3, "backfill symbol keys", _backfill_symbol_keys),
+]
+
+# External-content FTS tables: fts table -> (base table, indexed columns)
+FTS_SOURCES = {
+    "code_chunks_fts": ("code_chunks", ("content", "file_path", "chunk_type", "name")),
+    "symbols_fts": ("symbols", ("symbol_name", "symbol_type", "file_path")),
+    "symbols_trigram": ("symbols", ("symbol_name",)),
+    "components_fts": ("components", ("name", "type", "file_path")),
+}
+FTS_TABLES = tuple(FTS_SOURCES)
+
+
+def rebuild_fts(con: sqlite3.Connection, tables=FTS_TABLES) -> None:
+    for table in tables:
+        con.execute(f"INSERT INTO {table}({table}) VALUES('rebuild')")
+
+
+def update_fts_rows(
+    con: sqlite3.Connection, base_table: str, where: str, params, delete: bool = False
+) -> None:
+    """
+    Add (or, with delete=True, remove) the FTS entries of base_table rows
+    matching `where`. External-content entries must be removed with the
+    values they were indexed with, so delete before changing the rows.
+    """
+    for fts, (base, columns) in FTS_SOURCES.items():
+        if base != base_table:
+            continue
+        cols = ", ".join(columns)
+        if delete:
+            con.execute(f"""
+                INSERT INTO {fts}({fts}, rowid, {cols})
+                SELECT 'delete', id, {cols} FROM {base} WHERE {where}
+            """, params)
+        else:
+            con.execute(f"""
+                INSERT INTO {fts}(rowid, {cols})
+                SELECT id, {cols} FROM {base} WHERE {where}
+            """, params)
+
+
+def storage_report(con: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Page usage per table (indexes and FTS shadow tables folded into their
+    owner) plus free pages, for spotting bloat that VACUUM would reclaim.
+
+    Per-table numbers need the dbstat virtual table; without it only the
+    freelist is reported.
+    """
+    page_size = con.execute("PRAGMA page_size").fetchone()[0]
+    page_count = con.execute("PRAGMA page_count").fetchone()[0]
+    free_pages = con.execute("PRAGMA freelist_count").fetchone()[0]
+    report: Dict[str, Any] = {
+        "page_size": page_size,
+        "total_bytes": page_count * page_size,
+        "free_bytes": free_pages * page_size,
+        "tables": [],
+    }
+
+    try:
+        rows = con.execute("""
+            SELECT COALESCE(m.tbl_name, d.name) AS owner,
+                   SUM(d.pgsize) AS bytes, SUM(d.unused) AS unused
+            FROM dbstat d LEFT JOIN sqlite_master m ON m.name = d.name
+            GROUP BY owner
+        """).fetchall()
+    except sqlite3.OperationalError:
+        return report  # SQLite built without SQLITE_ENABLE_DBSTAT_VTAB
+
+    tables: Dict[str, List[int]] = {}
+    for owner, size, unused in rows:
+        # code_chunks_fts_data, _idx, ... belong to code_chunks_fts
+        base = re.sub(r"_(data|idx|docsize|config|content)$", "", owner)
+        entry = tables.setdefault(base, [0, 0])
+        entry[0] += size or 0
+        entry[1] += unused or 0
+    report["tables"] = sorted(
+        ({"name": name, "bytes": size, "unused_bytes": unused}
+         for name, (size, unused) in tables.items()),
+        key=lambda t: -t["bytes"],
+    )
+    return report
+
+
 def get_inline_schema() -> str:
-    """Enhanced schema v2.1 - CODE CONTEXT with symbols and hybrid search."""
+    """Current schema - CODE CONTEXT with symbols and hybrid search, plus memory rows."""
     return """
     -- Project snapshots from ProjectContext MCP
     CREATE TABLE IF NOT EXISTS project_snapshots (
@@ -573,6 +1130,13 @@ def get_inline_schema() -> str:
         updated_at TEXT DEFAULT (datetime('now'))
     );
 
+    -- Sync clears and reloads by project (and, incrementally, by file)
+    CREATE INDEX IF NOT EXISTS idx_code_chunks_file ON code_chunks(project_path, file_path);
+    -- Partial index: "any embeddings?" probes and incremental ANN loads
+    -- (id > last indexed) never touch unembedded rows
+    CREATE INDEX IF NOT EXISTS idx_code_chunks_embedded ON code_chunks(id)
+        WHERE embedding IS NOT NULL;
+
     -- Symbol index for fast symbol search (function/class/export names)
     CREATE TABLE IF NOT EXISTS symbols (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -593,6 +1157,17 @@ def get_inline_schema() -> str:
     CREATE INDEX IF NOT EXISTS idx_symbols_name ON symbols(symbol_name);
     CREATE INDEX IF NOT EXISTS idx_symbols_type ON symbols(symbol_type);
     CREATE INDEX IF NOT EXISTS idx_symbols_file ON symbols(file_path);
+    CREATE INDEX IF NOT EXISTS idx_symbols_project ON symbols(project_path, file_path);
+
+    -- Normalized symbol keys: lowercase name + camelCase/snake_case initials
+    -- (e.g. handleAuthToken -> "hat"), both indexed for range/equality lookup
+    CREATE TABLE IF NOT EXISTS symbol_keys (
+        symbol_id INTEGER PRIMARY KEY,  -- symbols.id
+        name_lower TEXT NOT NULL,
+        initials TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_symbol_keys_name ON symbol_keys(name_lower);
+    CREATE INDEX IF NOT EXISTS idx_symbol_keys_initials ON symbol_keys(initials);
 
     -- Component registry (for component search)
     CREATE TABLE IF NOT EXISTS components (
@@ -609,6 +1184,9 @@ def get_inline_schema() -> str:
         updated_at TEXT DEFAULT (datetime('now'))
     );
 
+    -- One row per component file; INSERT OR REPLACE conflicts on this
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_components_file ON components(project_path, file_path);
+
     -- File index for fast lookups
     CREATE TABLE IF NOT EXISTS file_index (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -630,6 +1208,36 @@ def get_inline_schema() -> str:
         stats_json TEXT
     );
 
+    -- Memory rows (memory-index.py, memory-search-unified.py)
+    CREATE TABLE IF NOT EXISTS decisions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL DEFAULT (datetime('now')),
+        domain TEXT,
+        decision TEXT NOT NULL,
+        reasoning TEXT,
+        tags TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_decisions_timestamp ON decisions(timestamp);
+
+    CREATE TABLE IF NOT EXISTS task_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL DEFAULT (datetime('now')),
+        domain TEXT,
+        task TEXT NOT NULL,
+        learnings TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_task_history_timestamp ON task_history(timestamp);
+
+    CREATE TABLE IF NOT EXISTS events (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL DEFAULT (datetime('now')),
+        type TEXT NOT NULL,
+        file_path TEXT,
+        data TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_events_type ON events(type);
+
     -- Metadata
     CREATE TABLE IF NOT EXISTS metadata (
         key TEXT PRIMARY KEY,
@@ -649,6 +1257,12 @@ def get_inline_schema() -> str:
         content='symbols', content_rowid='id'
     );
 
+    -- Trigram index over symbol names (case-insensitive substring match)
+    CREATE VIRTUAL TABLE IF NOT EXISTS symbols_trigram USING fts5(
+        symbol_name,
+        content='symbols', content_rowid='id', tokenize='trigram'
+    );
+
     -- FTS for components
     CREATE VIRTUAL TABLE IF NOT EXISTS components_fts USING fts5(
         name, type, file_path,
@@ -661,20 +1275,26 @@ def get_inline_schema() -> str:
 # EMBEDDING FUNCTIONS (M4 Max via Ollama)
 # ============================================================
 
+_ollama_available: Optional[bool] = None
+
+
 def check_ollama_available() -> bool:
-    """Check if Ollama is running and has the embedding model."""
-    try:
-        import urllib.request
-        req = urllib.request.Request(f"{OLLAMA_URL}/api/tags")
-        with urllib.request.urlopen(req, timeout=2) as resp:
-            data = json.loads(resp.read())
-            models = [m.get("name", "") for m in data.get("models", [])]
-            return any(EMBEDDING_MODEL in m for m in models)
-    except Exception:
-        return False
+    """Check if Ollama is running and has the embedding model (cached per process)."""
+    global _ollama_available
+    if _ollama_available is None:
+        try:
+            import urllib.request
+            req = urllib.request.Request(f"{OLLAMA_URL}/api/tags")
+            with urllib.request.urlopen(req, timeout=2) as resp:
+                data = json.loads(resp.read())
+                models = [m.get("name", "") for m in data.get("models", [])]
+                _ollama_available = any(EMBEDDING_MODEL in m for m in models)
+        except Exception:
+            _ollama_available = False
+    return _ollama_available
 
 
-def get_embedding(text: str) -> Optional[bytes]:
+def get_embedding(text: str, encoding: str = "float32") -> Optional[bytes]:
     """Generate embedding using Ollama (leverages M4 Max GPU/Neural Engine)."""
     try:
         import urllib.request
@@ -695,16 +1315,44 @@ def get_embedding(text: str) -> Optional[bytes]:
             embedding = data.get("embedding", [])
 
             if embedding:
-                # Pack as float32 array for SQLite BLOB storage
-                return struct.pack(f'{len(embedding)}f', *embedding)
+                return encode_embedding(embedding, encoding)
     except Exception as e:
         print(f"Embedding failed: {e}", file=sys.stderr)
 
     return None
 
 
-def blob_to_vector(blob: bytes) -> List[float]:
+def embedding_model_tag(encoding: str = "float32") -> str:
+    """Value stored in embedding_model: the model, plus @encoding unless float32."""
+    return EMBEDDING_MODEL if encoding == "float32" else f"{EMBEDDING_MODEL}@{encoding}"
+
+
+def embedding_encoding(model_tag: Optional[str]) -> str:
+    """Encoding recorded in an embedding_model value (untagged = float32)."""
+    _, sep, encoding = (model_tag or "").rpartition("@")
+    return encoding if sep and encoding in EMBEDDING_ENCODINGS else "float32"
+
+
+def encode_embedding(values: List[float], encoding: str = "float32") -> bytes:
+    """Pack a vector for SQLite BLOB storage in the given encoding."""
+    n = len(values)
+    if encoding == "float16":
+        return struct.pack(f'<{n}e', *values)
+    if encoding == "int8":
+        # Symmetric per-vector scale: value ~= q * scale, q in [-127, 127]
+        scale = max((abs(v) for v in values), default=0.0) / 127 or 1.0
+        return struct.pack('<f', scale) + struct.pack(
+            f'{n}b', *(max(-127, min(127, round(v / scale))) for v in values))
+    return struct.pack(f'{n}f', *values)
+
+
+def blob_to_vector(blob: bytes, encoding: str = "float32") -> List[float]:
     """Convert BLOB back to float array."""
+    if encoding == "float16":
+        return list(struct.unpack(f'<{len(blob) // 2}e', blob))
+    if encoding == "int8":
+        (scale,) = struct.unpack_from('<f', blob)
+        return [q * scale for q in struct.unpack(f'{len(blob) - 4}b', blob[4:])]
     n = len(blob) // 4  # float32 = 4 bytes
     return list(struct.unpack(f'{n}f', blob))
 
@@ -720,343 +1368,2005 @@ def cosine_similarity(a: List[float], b: List[float]) -> float:
     return dot / (norm_a * norm_b)
 
 
-# ============================================================
-# SYNC FUNCTIONS
-# ============================================================
+def embedding_matrix(blobs: List[bytes], encoding: str = "float32"):
+    """Dequantize equal-length blobs into one (n, dim) float32 numpy matrix."""
+    import numpy as np
 
-def sync_from_project_context(
-    project_root: Path,
-    db_path: Path,
-    generate_embeddings: bool = False
-) -> Dict[str, int]:
-    """
-    Enhanced sync with language-specific chunking and symbol extraction.
+    data = b"".join(blobs)
+    if encoding == "int8":
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(len(blobs), -1)
+        scales = raw[:, :4].copy().view(np.float32)
+        return raw[:, 4:].view(np.int8).astype(np.float32) * scales
+    dtype = np.float16 if encoding == "float16" else np.float32
+    return np.frombuffer(data, dtype=dtype).reshape(len(blobs), -1).astype(np.float32)
 
-    Uses TypeScript, Swift, and Python chunkers for AST-aware parsing.
-    Extracts symbols (function/class names) for symbol search.
-    """
-    stats = {"components": 0, "code_chunks": 0, "symbols": 0, "files": 0}
 
+def cosine_scores(query_vec: List[float], blobs: List[bytes], encoding: str = "float32") -> List[float]:
+    """
+    Cosine similarity of query_vec against each stored blob. Vectorized with
+    numpy when it's installed and the blobs share a length; per-row otherwise.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is None or not blobs or len(set(map(len, blobs))) > 1:
+        return [cosine_similarity(query_vec, blob_to_vector(b, encoding)) for b in blobs]
+
+    matrix = embedding_matrix(blobs, encoding)
+    q = np.asarray(query_vec, dtype=np.float32)
+    if matrix.shape[1] != q.shape[0]:
+        return [0.0] * len(blobs)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(q)
+    dots = matrix @ q
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0).tolist()
+
+
+def requantize_embeddings(db_path: Path, encoding: str) -> Dict[str, int]:
+    """
+    Re-encode every stored embedding in place (no re-embedding). Going to a
+    smaller encoding is lossy; VACUUM afterwards to return the space.
+    """
+    stats = {"converted": 0, "unchanged": 0}
+    tag = embedding_model_tag(encoding)
     con = sqlite3.connect(str(db_path))
-    project_str = str(project_root)
+    try:
+        for table in ("code_chunks", "components"):
+            rows = con.execute(f"""
+                SELECT id, embedding, embedding_model FROM {table}
+                WHERE embedding IS NOT NULL
+            """).fetchall()
+            updates = []
+            for row_id, blob, model_tag in rows:
+                current = embedding_encoding(model_tag)
+                if current == encoding:
+                    stats["unchanged"] += 1
+                    continue
+                vec = blob_to_vector(blob, current)
+                updates.append((encode_embedding(vec, encoding), tag, row_id))
+            con.executemany(
+                f"UPDATE {table} SET embedding = ?, embedding_model = ? WHERE id = ?", updates)
+            stats["converted"] += len(updates)
+        if stats["converted"]:
+            generation = bump_db_generation(con)
+        con.commit()
+        if stats["converted"] and get_ann_index_dir(db_path).exists():
+            refresh_ann_index(con, db_path, generation)
+    finally:
+        con.close()
+    return stats
 
-    # File patterns to scan (language-specific)
-    FILE_PATTERNS = [
-        # TypeScript/JavaScript
-        ("src/**/*.ts", "typescript"),
-        ("src/**/*.tsx", "typescript"),
-        ("src/**/*.js", "javascript"),
-        ("src/**/*.jsx", "javascript"),
-        ("app/**/*.ts", "typescript"),
-        ("app/**/*.tsx", "typescript"),
-        ("components/**/*.tsx", "typescript"),
-        ("lib/**/*.ts", "typescript"),
-        ("hooks/**/*.ts", "typescript"),
-        ("utils/**/*.ts", "typescript"),
-        # Swift
-        ("**/*.swift", "swift"),
-        # Python
-        ("**/*.py", "python"),
-        ("src/**/*.py", "python"),
-    ]
 
-    try:
-        import glob as globmod
+# ============================================================
+# QUERY CACHE
+# ============================================================
 
-        # Clear existing chunks and symbols for this project
-        con.execute("DELETE FROM code_chunks WHERE project_path = ?", (project_str,))
-        con.execute("DELETE FROM symbols WHERE project_path = ?", (project_str,))
-        con.commit()
+def get_cache_db_path(db_path: Path) -> Path:
+    """Get path to the query cache that lives next to vibe.db."""
+    return db_path.with_name("vibe-cache.db")
 
-        processed_files = set()
 
-        for pattern, language in FILE_PATTERNS:
-            for file_path in globmod.glob(str(project_root / pattern), recursive=True):
-                # Skip if already processed or in excluded dirs
-                if file_path in processed_files:
-                    continue
-                if any(ex in file_path for ex in ['node_modules', '.git', '__pycache__', 'dist', 'build']):
-                    continue
+def get_db_generation(db_path: Path) -> int:
+    """Read the generation counter that sync bumps on every run."""
+    try:
+        con = connect_readonly(db_path)
+        try:
+            row = con.execute(
+                "SELECT value FROM metadata WHERE key = 'generation'"
+            ).fetchone()
+        finally:
+            con.close()
+        return int(row[0]) if row and row[0] is not None else 0
+    except (sqlite3.Error, ValueError):
+        return 0
 
-                processed_files.add(file_path)
-                rel_path = os.path.relpath(file_path, project_root)
 
-                # Read file content
-                try:
-                    content = Path(file_path).read_text(encoding='utf-8')
-                except Exception as e:
-                    print(f"  Skip {rel_path}: {e}", file=sys.stderr)
-                    continue
+def bump_db_generation(con: sqlite3.Connection) -> int:
+    """Increment the DB generation counter (invalidates cached results)."""
+    con.execute("""
+        INSERT INTO metadata (key, value, updated_at)
+        VALUES ('generation', '1', datetime('now'))
+        ON CONFLICT(key) DO UPDATE SET
+            value = CAST(COALESCE(value, '0') AS INTEGER) + 1,
+            updated_at = datetime('now')
+    """)
+    row = con.execute("SELECT value FROM metadata WHERE key = 'generation'").fetchone()
+    return int(row[0])
 
-                stats["files"] += 1
-
-                # Get language-specific chunker
-                chunker = get_chunker(file_path)
-
-                if chunker:
-                    # Use language-specific chunking
-                    chunks = chunker.chunk(content, rel_path)
-
-                    for i, chunk in enumerate(chunks):
-                        # Generate embedding if requested
-                        embedding = None
-                        if generate_embeddings and chunk.content:
-                            # Include symbol name in embedding context
-                            embed_text = f"{chunk.name}: {chunk.content[:2000]}"
-                            embedding = get_embedding(embed_text)
-
-                        # Insert code chunk
-                        cursor = con.execute("""
-                            INSERT INTO code_chunks
-                            (project_path, file_path, chunk_index, content, language,
-                             chunk_type, name, parent_name, start_line, end_line,
-                             embedding, embedding_model, updated_at)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
-                        """, (
-                            project_str, rel_path, i, chunk.content, chunk.language,
-                            chunk.chunk_type, chunk.name, chunk.parent_name,
-                            chunk.start_line, chunk.end_line,
-                            embedding, EMBEDDING_MODEL if embedding else None
-                        ))
-                        chunk_id = cursor.lastrowid
-                        stats["code_chunks"] += 1
-
-                        # Insert symbols for this chunk
-                        for symbol_name in chunk.symbols:
-                            con.execute("""
-                                INSERT INTO symbols
-                                (project_path, file_path, symbol_name, symbol_type,
-                                 parent_symbol, language, start_line, end_line, chunk_id)
-                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                project_str, rel_path, symbol_name, chunk.chunk_type,
-                                chunk.parent_name, chunk.language,
-                                chunk.start_line, chunk.end_line, chunk_id
-                            ))
-                            stats["symbols"] += 1
-                else:
-                    # Fallback: simple chunking for unknown languages
-                    chunk_content = content[:4000]
-                    name = Path(file_path).stem
-
-                    embedding = None
-                    if generate_embeddings and chunk_content:
-                        embedding = get_embedding(f"{name}: {chunk_content[:2000]}")
-
-                    con.execute("""
-                        INSERT INTO code_chunks
-                        (project_path, file_path, chunk_index, content, language,
-                         chunk_type, name, start_line, end_line,
-                         embedding, embedding_model, updated_at)
-                        VALUES (?, ?, 0, ?, ?, 'file', ?, 1, ?, ?, ?, datetime('now'))
-                    """, (
-                        project_str, rel_path, chunk_content, language,
-                        name, content.count('\n') + 1,
-                        embedding, EMBEDDING_MODEL if embedding else None
-                    ))
-                    stats["code_chunks"] += 1
-
-        # Also sync legacy component patterns for backward compatibility
-        for pattern, comp_type in [
-            ("src/components/**/*.tsx", "component"),
-            ("src/pages/**/*.tsx", "page"),
-            ("src/app/**/*.tsx", "page"),
-            ("components/**/*.tsx", "component"),
-        ]:
-            for file_path in globmod.glob(str(project_root / pattern), recursive=True):
-                if any(ex in file_path for ex in ['node_modules', '.git']):
-                    continue
 
-                rel_path = os.path.relpath(file_path, project_root)
-                name = Path(file_path).stem
+class QueryCache:
+    """
+    Small on-disk LRU cache for search results and query embeddings.
 
-                try:
-                    content = Path(file_path).read_text()[:4000]
-                except Exception:
-                    content = ""
+    Result entries are keyed by (mode, query, limit, weights) and stamped with
+    the vibe.db generation they were computed against; a sync bumps the
+    generation, so stale entries miss automatically. Query embeddings only
+    depend on (model, text) and survive syncs.
 
-                embedding = None
-                if generate_embeddings and content:
-                    embedding = get_embedding(f"{name}: {content[:2000]}")
+    Every operation is best-effort: a locked or corrupt cache never breaks a
+    search, it just behaves like a miss.
+    """
 
-                con.execute("""
-                    INSERT OR REPLACE INTO components
-                    (project_path, name, type, file_path, embedding, embedding_model, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
-                """, (
-                    project_str, name, comp_type, rel_path,
-                    embedding, EMBEDDING_MODEL if embedding else None
-                ))
-                stats["components"] += 1
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS result_cache (
+            key TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL,
+            results_json TEXT NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            embedding BLOB NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_result_cache_used ON result_cache(last_used);
+        CREATE INDEX IF NOT EXISTS idx_embedding_cache_used ON embedding_cache(last_used);
+    """
 
-        con.commit()
+    def __init__(self, db_path: Path):
+        self.path = get_cache_db_path(db_path)
+        self.db_path = db_path
+        self._con: Optional[sqlite3.Connection] = None
+        self._generation: Optional[int] = None
+
+    @property
+    def con(self) -> sqlite3.Connection:
+        if self._con is None:
+            self._con = sqlite3.connect(str(self.path), timeout=0.5)
+            self._con.execute("PRAGMA journal_mode=WAL")
+            self._con.execute("PRAGMA synchronous=NORMAL")
+            self._con.executescript(self.SCHEMA)
+        return self._con
+
+    @property
+    def generation(self) -> int:
+        if self._generation is None:
+            self._generation = get_db_generation(self.db_path)
+        return self._generation
+
+    def close(self) -> None:
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        import hashlib
+        raw = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get_results(self, key: str) -> Optional[List[Dict]]:
+        import time
+        try:
+            row = self.con.execute(
+                "SELECT generation, results_json FROM result_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if not row or row[0] != self.generation:
+                return None
+            self.con.execute(
+                "UPDATE result_cache SET last_used = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self.con.commit()
+            return json.loads(row[1])
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def put_results(self, key: str, results: List[Dict]) -> None:
+        import time
+        try:
+            self.con.execute("""
+                INSERT OR REPLACE INTO result_cache (key, generation, results_json, last_used)
+                VALUES (?, ?, ?, ?)
+            """, (key, self.generation, json.dumps(results), time.time()))
+            # Drop entries from older generations, then trim to LRU capacity
+            self.con.execute(
+                "DELETE FROM result_cache WHERE generation != ?", (self.generation,)
+            )
+            self._evict("result_cache", CACHE_MAX_RESULTS)
+            self.con.commit()
+        except sqlite3.Error:
+            pass
 
-        # Rebuild FTS indexes
+    def get_embedding(self, text: str, model: str) -> Optional[bytes]:
+        import time
+        key = self.make_key("embedding", model, text)
         try:
-            con.execute("INSERT INTO code_chunks_fts(code_chunks_fts) VALUES('rebuild')")
-            con.execute("INSERT INTO symbols_fts(symbols_fts) VALUES('rebuild')")
-            con.execute("INSERT INTO components_fts(components_fts) VALUES('rebuild')")
-            con.commit()
-        except Exception:
-            pass  # FTS tables might not exist yet
+            row = self.con.execute(
+                "SELECT embedding FROM embedding_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            self.con.execute(
+                "UPDATE embedding_cache SET last_used = ? WHERE key = ?",
+                (time.time(), key)
+            )
+            self.con.commit()
+            return row[0]
+        except sqlite3.Error:
+            return None
+
+    def put_embedding(self, text: str, model: str, embedding: bytes) -> None:
+        import time
+        key = self.make_key("embedding", model, text)
+        try:
+            self.con.execute("""
+                INSERT OR REPLACE INTO embedding_cache (key, model, embedding, last_used)
+                VALUES (?, ?, ?, ?)
+            """, (key, model, embedding, time.time()))
+            self._evict("embedding_cache", CACHE_MAX_EMBEDDINGS)
+            self.con.commit()
+        except sqlite3.Error:
+            pass
 
-        # Log sync event
-        con.execute("""
-            INSERT INTO sync_events (project_path, event_type, stats_json)
-            VALUES (?, 'sync_v2', ?)
-        """, (project_str, json.dumps(stats)))
-        con.commit()
+    def _evict(self, table: str, capacity: int) -> None:
+        self.con.execute(f"""
+            DELETE FROM {table} WHERE key IN (
+                SELECT key FROM {table} ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        """, (capacity,))
 
+
+# Per-process memo in front of the on-disk cache, so a federated search
+# embeds the query once rather than once per shard
+_query_embeddings: Dict[str, Optional[bytes]] = {}
+
+
+def get_query_embedding(db_path: Path, query: str) -> Optional[bytes]:
+    """Embed a search query, going through the on-disk embedding cache."""
+    if query in _query_embeddings:
+        return _query_embeddings[query]
+
+    cache = QueryCache(db_path)
+    try:
+        embedding = cache.get_embedding(query, EMBEDDING_MODEL)
+        if embedding is None:
+            if not check_ollama_available():
+                print("Ollama not available. Run: ollama pull nomic-embed-text", file=sys.stderr)
+                _query_embeddings[query] = None
+                return None
+            embedding = get_embedding(query)
+            if embedding:
+                cache.put_embedding(query, EMBEDDING_MODEL, embedding)
+        _query_embeddings[query] = embedding
+        return embedding
     finally:
-        con.close()
+        cache.close()
 
-    return stats
+
+def cached_search(
+    db_path: Path,
+    mode: str,
+    query: str,
+    limit: int,
+    compute,
+    weights: Optional[Dict[str, float]] = None,
+    use_cache: bool = True,
+) -> List[Dict]:
+    """
+    Return cached results for (mode, query, limit, weights) or compute them.
+
+    compute(status) sets status["degraded"] when its answer is incomplete
+    (no query embedding because Ollama is down, or a hybrid leg failed);
+    such answers are returned but not cached, so the full answer is computed
+    once the cause goes away instead of being served until the next sync.
+    """
+    status: Dict[str, Any] = {}
+    if not use_cache:
+        return compute(status)
+
+    cache = QueryCache(db_path)
+    try:
+        key = cache.make_key(mode, query, limit, weights or {})
+        results = cache.get_results(key)
+        if results is None:
+            results = compute(status)
+            if not status.get("degraded"):
+                cache.put_results(key, results)
+        return results
+    finally:
+        cache.close()
 
 
 # ============================================================
-# SEARCH FUNCTIONS
+# FUZZY SYMBOL MATCHER
 # ============================================================
+#
+# In-memory matcher over the distinct names in `symbols`, persisted next to
+# vibe.db as flat arrays. Loading mmaps the file and casts each section to a
+# memoryview, so it is O(1) regardless of index size; nothing is parsed or
+# decoded until a lookup touches it:
+#
+#   names / norms / initials   packed UTF-8 blob + offsets, indexed by name id
+#   norm_order, init_order     name ids sorted by norm / initials (bisect)
+#   del_hashes, del_ids        SymSpell deletion index: crc32 of every
+#                              <= MATCHER_MAX_EDITS deletion of the first
+#                              MATCHER_PREFIX_LEN chars of each norm, sorted
+#
+# "norm" is the identifier with case and separators removed, so handleAuth,
+# handle_auth and HandleAuth share the norm "handleauth".
+
+MATCHER_MAGIC = b"VSYM1"
+MATCHER_MAX_EDITS = 2
+MATCHER_PREFIX_LEN = 7
+MATCHER_VERIFY_BUDGET = 500  # max candidates verified per match class
+
+
+def get_symbol_matcher_path(db_path: Path) -> Path:
+    """Get path to the prebuilt symbol matcher that lives next to vibe.db."""
+    return db_path.with_name("vibe-symbols.idx")
+
+
+class PackedStrings:
+    """Read-only string list stored as one UTF-8 blob plus an offsets array."""
+
+    def __init__(self, blob: bytes, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def pack(cls, strings: List[str]) -> "PackedStrings":
+        from array import array
+        offsets = array("I", [0])
+        parts = []
+        pos = 0
+        for item in strings:
+            raw = item.encode()
+            parts.append(raw)
+            pos += len(raw)
+            offsets.append(pos)
+        return cls(b"".join(parts), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+def normalize_identifier(name: str) -> str:
+    words = split_identifier(name)
+    return "".join(words) if words else (name or "").lower()
+
+
+def _deletes(term: str, max_edits: int) -> List[str]:
+    """Strings reachable from `term` by deleting up to max_edits chars, closest first."""
+    results = [term]
+    seen = {term}
+    frontier = [term]
+    for _ in range(max_edits):
+        nxt = []
+        for t in frontier:
+            if len(t) <= 1:
+                continue
+            for i in range(len(t)):
+                d = t[:i] + t[i + 1:]
+                if d not in seen:
+                    seen.add(d)
+                    nxt.append(d)
+        results.extend(nxt)
+        frontier = nxt
+    return results
 
-def symbol_search(db_path: Path, query: str, limit: int = 20) -> List[Dict]:
+
+def _bounded_edit_distance(a: str, b: str, max_d: int) -> int:
+    """Optimal-string-alignment distance, or max_d + 1 once it exceeds max_d."""
+    if abs(len(a) - len(b)) > max_d:
+        return max_d + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = cur[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if (prev2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                v = min(v, prev2[j - 2] + 1)
+            cur[j] = v
+            row_min = min(row_min, v)
+        if row_min > max_d:
+            return max_d + 1
+        prev2, prev = prev, cur
+    return prev[len(b)]
+
+
+class SymbolMatcher:
     """
-    Search for symbols (function/class/component names).
-    Supports exact match, prefix match, and fuzzy match.
+    camelCase/snake_case-aware fuzzy matcher for symbol names.
+
+    Match classes (score): exact (1.0), normalized-exact such as
+    handle_auth -> handleAuth (0.9), normalized prefix (0.7-0.8),
+    camelCase word-prefix such as hAuth -> handleAuth (0.6-0.7) and
+    bounded edit distance such as handelAuth -> handleAuth (0.55 / 0.4).
     """
-    results = []
-    con = sqlite3.connect(str(db_path))
-    con.row_factory = sqlite3.Row
 
-    try:
-        # Exact match (highest priority)
-        rows = con.execute("""
-            SELECT s.*, c.content
-            FROM symbols s
-            LEFT JOIN code_chunks c ON s.chunk_id = c.id
-            WHERE s.symbol_name = ?
-            LIMIT ?
-        """, (query, limit)).fetchall()
+    def __init__(self, names, norms, initials, norm_order, init_order,
+                 del_hashes, del_ids, generation: int = 0):
+        self.names = names
+        self.norms = norms
+        self.initials = initials
+        self.norm_order = norm_order
+        self.init_order = init_order
+        self.del_hashes = del_hashes
+        self.del_ids = del_ids
+        self.generation = generation
+
+    # -- build / persist ---------------------------------------------------
+
+    @classmethod
+    def build(cls, names: List[str], generation: int = 0) -> "SymbolMatcher":
+        from array import array
+        import zlib
+
+        names = sorted(set(n for n in names if n))
+        norms = [normalize_identifier(n) for n in names]
+        initials = [identifier_initials(n) for n in names]
+        norm_order = array("I", sorted(range(len(names)), key=norms.__getitem__))
+        init_order = array("I", sorted(range(len(names)), key=initials.__getitem__))
+
+        # (hash << 32 | id) packs each deletion entry into one sortable int
+        keys = []
+        for i, norm in enumerate(norms):
+            for d in _deletes(norm[:MATCHER_PREFIX_LEN], MATCHER_MAX_EDITS):
+                keys.append((zlib.crc32(d.encode()) << 32) | i)
+        keys.sort()
+        del_hashes = array("I", (k >> 32 for k in keys))
+        del_ids = array("I", (k & 0xFFFFFFFF for k in keys))
+
+        return cls(PackedStrings.pack(names), PackedStrings.pack(norms),
+                   PackedStrings.pack(initials), norm_order, init_order,
+                   del_hashes, del_ids, generation)
+
+    @classmethod
+    def build_from_db(cls, con: sqlite3.Connection, generation: int = 0) -> "SymbolMatcher":
+        rows = con.execute("SELECT DISTINCT symbol_name FROM symbols").fetchall()
+        return cls.build([r[0] for r in rows], generation)
+
+    def save(self, path: Path) -> None:
+        sections = [
+            self.names.blob, self.names.offsets,
+            self.norms.blob, self.norms.offsets,
+            self.initials.blob, self.initials.offsets,
+            self.norm_order, self.init_order,
+            self.del_hashes, self.del_ids,
+        ]
+        # Per-process temp name: a watcher and a search may rebuild at once
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(MATCHER_MAGIC)
+            f.write(struct.pack("<Q", self.generation))
+            for section in sections:
+                blob = bytes(section)
+                f.write(struct.pack("<Q", len(blob)))
+                f.write(blob)
+                # Keep every section 4-byte aligned for memoryview casts
+                f.write(b"\0" * (-len(blob) % 4))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SymbolMatcher"]:
+        import mmap
 
-        for r in rows:
-            results.append({
-                "type": "symbol",
+        try:
+            with open(path, "rb") as f:
+                data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except (OSError, ValueError):
+            return None
+        if bytes(data[:len(MATCHER_MAGIC)]) != MATCHER_MAGIC:
+            return None
+
+        # A truncated or corrupt file returns None so for_db() rebuilds it
+        try:
+            pos = len(MATCHER_MAGIC)
+            (generation,) = struct.unpack_from("<Q", data, pos)
+            pos += 8
+            views = []
+            for _ in range(10):
+                (n,) = struct.unpack_from("<Q", data, pos)
+                pos += 8
+                if pos + n > len(data):
+                    return None
+                views.append(data[pos:pos + n])
+                pos += n + (-n % 4)
+
+            names, name_offs, norms, norm_offs, inits, init_offs = views[:6]
+            strings = [PackedStrings(blob, offs.cast("I"))
+                       for blob, offs in ((names, name_offs), (norms, norm_offs), (inits, init_offs))]
+            ids = [v.cast("I") for v in views[6:]]
+        except (struct.error, TypeError, ValueError):
+            return None
+
+        count = len(strings[0])
+        if any(len(p) != count or len(p.offsets) == 0 or p.offsets[-1] > len(p.blob)
+               for p in strings) \
+                or len(ids[0]) != count or len(ids[1]) != count or len(ids[2]) != len(ids[3]):
+            return None
+        return cls(*strings, *ids, generation=generation)
+
+    @classmethod
+    def for_db(cls, db_path: Path) -> "SymbolMatcher":
+        """Load the persisted matcher, rebuilding it if missing or stale."""
+        path = get_symbol_matcher_path(db_path)
+        generation = get_db_generation(db_path)
+        matcher = cls.load(path)
+        if matcher is not None and matcher.generation == generation:
+            return matcher
+
+        con = connect_readonly(db_path)
+        try:
+            matcher = cls.build_from_db(con, generation)
+        finally:
+            con.close()
+        try:
+            matcher.save(path)
+        except OSError:
+            pass
+        return matcher
+
+    # -- lookup ------------------------------------------------------------
+
+    @staticmethod
+    def _lower_bound(order, keys: PackedStrings, target: str) -> int:
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if keys[order[mid]] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _prefix_range(self, order, keys: PackedStrings, prefix: str):
+        start = self._lower_bound(order, keys, prefix)
+        for pos in range(start, min(len(order), start + MATCHER_VERIFY_BUDGET)):
+            i = order[pos]
+            key = keys[i]
+            if not key.startswith(prefix):
+                break
+            yield i, key
+
+    @staticmethod
+    def _word_prefix_match(query_words: List[str], name: str) -> bool:
+        """Each query word prefixes a later name word, first word anchored."""
+        name_words = split_identifier(name)
+        if not name_words or not name_words[0].startswith(query_words[0]):
+            return False
+        j = 1
+        for qw in query_words[1:]:
+            while j < len(name_words) and not name_words[j].startswith(qw):
+                j += 1
+            if j == len(name_words):
+                return False
+            j += 1
+        return True
+
+    def match(self, query: str, limit: int = 20) -> List[Tuple[str, float, str]]:
+        """Return [(symbol_name, score, match_type)] best first."""
+        import bisect
+        import zlib
+
+        query = query.strip()
+        if not query or not self.names:
+            return []
+
+        words = split_identifier(query)
+        norm = "".join(words) if words else query.lower()
+        best: Dict[int, Tuple[float, str]] = {}
+
+        def offer(i: int, score: float, kind: str) -> None:
+            if i not in best or best[i][0] < score:
+                best[i] = (score, kind)
+
+        # Exact / normalized / prefix
+        for i, key in self._prefix_range(self.norm_order, self.norms, norm):
+            if key != norm:
+                offer(i, 0.7 + 0.1 * len(norm) / len(key), "prefix")
+            elif self.names[i] == query:
+                offer(i, 1.0, "exact")
+            else:
+                offer(i, 0.9, "normalized")
+
+        # camelCase / snake_case word prefixes: hAuth, handle_tok
+        if len(words) > 1:
+            q_initials = "".join(w[0] for w in words if not w.isdigit())
+            for i, _ in self._prefix_range(self.init_order, self.initials, q_initials):
+                if i in best:
+                    continue
+                name = self.names[i]
+                if self._word_prefix_match(words, name):
+                    offer(i, 0.6 + 0.1 * len(norm) / len(normalize_identifier(name)), "camel")
+
+        # Bounded edit distance via the deletion index (only as a fallback
+        # when the cheaper classes didn't fill the result list)
+        if len(norm) >= 3 and len(best) < limit:
+            max_d = 1 if len(norm) <= 5 else MATCHER_MAX_EDITS
+            candidates: Dict[int, None] = {}  # insertion-ordered set
+            for d in _deletes(norm[:MATCHER_PREFIX_LEN], max_d):
+                h = zlib.crc32(d.encode())
+                pos = bisect.bisect_left(self.del_hashes, h)
+                while pos < len(self.del_hashes) and self.del_hashes[pos] == h:
+                    candidates[self.del_ids[pos]] = None
+                    pos += 1
+                    if len(candidates) >= MATCHER_VERIFY_BUDGET:
+                        break
+                if len(candidates) >= MATCHER_VERIFY_BUDGET:
+                    break
+            for i in candidates:
+                if i in best:
+                    continue
+                dist = _bounded_edit_distance(norm, self.norms[i], max_d)
+                if 0 < dist <= max_d:
+                    offer(i, 0.55 if dist == 1 else 0.4, "fuzzy")
+
+        ranked = sorted(
+            best.items(),
+            key=lambda kv: (-kv[1][0], len(self.names[kv[0]]), self.names[kv[0]])
+        )
+        return [(self.names[i], score, kind) for i, (score, kind) in ranked[:limit]]
+
+
+def fuzzy_symbol_search(db_path: Path, query: str, limit: int = 20) -> List[Dict]:
+    """
+    Symbol search through the fuzzy matcher, merged with symbol_search().
+
+    The matcher ranks names (typos, camelCase/snake_case forms); the indexed
+    SQL lookup contributes substring hits. Each (name, file, line) keeps its
+    best score.
+    """
+    try:
+        matches = SymbolMatcher.for_db(db_path).match(query, limit=limit)
+    except Exception:
+        # Symbols table missing or matcher unusable: the SQL lookup below
+        # still answers (and reports a missing table)
+        matches = []
+
+    results: Dict[Tuple, Dict] = {}
+    if matches:
+        by_name = {name: (score, kind) for name, score, kind in matches}
+        placeholders = ",".join("?" for _ in by_name)
+        con = connect_readonly(db_path)
+        con.row_factory = sqlite3.Row
+        try:
+            rows = con.execute(f"""
+                SELECT s.symbol_name, s.symbol_type, s.file_path, s.start_line,
+                       s.parent_symbol, s.language,
+                       substr(c.content, 1, 200) AS snippet
+                FROM symbols s
+                LEFT JOIN code_chunks c ON c.id = s.chunk_id
+                WHERE s.symbol_name IN ({placeholders})
+            """, list(by_name)).fetchall()
+        finally:
+            con.close()
+
+        for r in rows:
+            score, kind = by_name[r["symbol_name"]]
+            results[(r["symbol_name"], r["file_path"], r["start_line"])] = {
+                "type": "symbol",
                 "name": r["symbol_name"],
                 "symbol_type": r["symbol_type"],
                 "file_path": r["file_path"],
                 "line": r["start_line"],
                 "parent": r["parent_symbol"],
                 "language": r["language"],
-                "content": (r["content"] or "")[:200],
-                "score": 1.0,
-                "match_type": "exact"
-            })
+                "content": r["snippet"] or "",
+                "score": score,
+                "match_type": kind
+            }
 
-        # Prefix match
-        if len(results) < limit:
-            rows = con.execute("""
-                SELECT s.*, c.content
-                FROM symbols s
-                LEFT JOIN code_chunks c ON s.chunk_id = c.id
-                WHERE s.symbol_name LIKE ? AND s.symbol_name != ?
-                LIMIT ?
-            """, (f"{query}%", query, limit - len(results))).fetchall()
+    for r in symbol_search(db_path, query, limit=limit):
+        key = (r["name"], r["file_path"], r["line"])
+        if key not in results or results[key]["score"] < r["score"]:
+            results[key] = r
 
-            for r in rows:
-                results.append({
-                    "type": "symbol",
-                    "name": r["symbol_name"],
-                    "symbol_type": r["symbol_type"],
-                    "file_path": r["file_path"],
-                    "line": r["start_line"],
-                    "parent": r["parent_symbol"],
-                    "language": r["language"],
-                    "content": (r["content"] or "")[:200],
-                    "score": 0.8,
-                    "match_type": "prefix"
-                })
+    ranked = sorted(results.values(), key=lambda r: (-r["score"], len(r["name"])))
+    return ranked[:limit]
 
-        # Fuzzy/contains match
-        if len(results) < limit:
-            rows = con.execute("""
-                SELECT s.*, c.content
-                FROM symbols s
-                LEFT JOIN code_chunks c ON s.chunk_id = c.id
-                WHERE s.symbol_name LIKE ? AND s.symbol_name NOT LIKE ?
-                LIMIT ?
-            """, (f"%{query}%", f"{query}%", limit - len(results))).fetchall()
 
-            for r in rows:
-                results.append({
-                    "type": "symbol",
-                    "name": r["symbol_name"],
-                    "symbol_type": r["symbol_type"],
-                    "file_path": r["file_path"],
-                    "line": r["start_line"],
-                    "parent": r["parent_symbol"],
-                    "language": r["language"],
-                    "content": (r["content"] or "")[:200],
-                    "score": 0.5,
-                    "match_type": "contains"
-                })
+# ============================================================
+# ANN INDEX
+# ============================================================
+#
+# Optional approximate nearest-neighbour index over code_chunks embeddings,
+# kept in a directory next to vibe.db and stamped with the DB generation it
+# was built for (a stale index is ignored and search falls back to exact):
+#
+#   meta.json        backend, generation, dim, trained_on, model tag
+#   ids.npy          code_chunks ids (int64), in list order for IVF
+#   ivf:  centroids.npy (nlist, dim) float32, offsets.npy (nlist + 1),
+#         vectors.npy (n, dim) float16 unit vectors, grouped by list
+#   hnsw: index.bin (hnswlib, cosine space)
+#
+# Arrays are memory-mapped on load, so a CLI query only touches the probed
+# lists. Requires numpy; HNSW additionally requires hnswlib.
+
+ANN_MIN_VECTORS = 2000        # below this an exact scan is already fast
+ANN_KMEANS_ITERS = 8
+ANN_NPROBE_FRACTION = 0.08    # share of IVF lists probed per query
+ANN_MIN_NPROBE = 8
+ANN_HNSW_M = 16
+ANN_HNSW_EF_CONSTRUCTION = 100
+ANN_HNSW_EF_SEARCH = 64
+
+
+def get_ann_index_dir(db_path: Path) -> Path:
+    """Get path to the ANN index directory that lives next to vibe.db."""
+    return db_path.with_name("vibe-ann")
+
+
+def _hnswlib_available() -> bool:
+    try:
+        import hnswlib  # noqa: F401
+        return True
+    except ImportError:
+        return False
 
-        # Case-insensitive match for camelCase
-        if len(results) < limit:
-            rows = con.execute("""
-                SELECT s.*, c.content
-                FROM symbols s
-                LEFT JOIN code_chunks c ON s.chunk_id = c.id
-                WHERE LOWER(s.symbol_name) LIKE LOWER(?)
-                  AND s.symbol_name NOT LIKE ?
-                  AND s.symbol_name NOT LIKE ?
-                LIMIT ?
-            """, (f"%{query}%", f"{query}%", f"%{query}%", limit - len(results))).fetchall()
 
-            for r in rows:
-                results.append({
-                    "type": "symbol",
-                    "name": r["symbol_name"],
-                    "symbol_type": r["symbol_type"],
-                    "file_path": r["file_path"],
-                    "line": r["start_line"],
-                    "parent": r["parent_symbol"],
-                    "language": r["language"],
-                    "content": (r["content"] or "")[:200],
-                    "score": 0.4,
-                    "match_type": "case_insensitive"
-                })
+def load_chunk_vectors(con: sqlite3.Connection, min_id: int = 0):
+    """
+    (ids, unit vectors) for code_chunks with embeddings and id > min_id, as
+    int64 / float32 numpy arrays. Rows whose dimension differs from the
+    majority (another embedding model) are left out.
+    """
+    import numpy as np
+
+    groups: Dict[Tuple[str, int], Tuple[List[int], List[bytes]]] = {}
+    for row_id, blob, tag in con.execute("""
+        SELECT id, embedding, embedding_model FROM code_chunks
+        WHERE embedding IS NOT NULL AND id > ?
+    """, (min_id,)):
+        ids, blobs = groups.setdefault((embedding_encoding(tag), len(blob)), ([], []))
+        ids.append(row_id)
+        blobs.append(blob)
+
+    parts = [(np.array(ids, dtype=np.int64), embedding_matrix(blobs, enc))
+             for (enc, _), (ids, blobs) in groups.items()]
+    if not parts:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 0), dtype=np.float32)
+    dim = max(parts, key=lambda p: len(p[0]))[1].shape[1]
+    parts = [p for p in parts if p[1].shape[1] == dim]
+    ids = np.concatenate([p[0] for p in parts])
+    vectors = np.concatenate([p[1] for p in parts])
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return ids, vectors / np.where(norms > 0, norms, 1.0)
+
+
+def _kmeans(vectors, nlist: int, iters: int = ANN_KMEANS_ITERS, seed: int = 0):
+    """Spherical k-means (dot-product assignment) on a training sample."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    sample = vectors
+    if len(vectors) > nlist * 256:
+        sample = vectors[rng.choice(len(vectors), nlist * 256, replace=False)]
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iters):
+        assign = _assign_lists(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        centroids = np.where(empty[:, None], centroids, sums / np.where(norms > 0, norms, 1.0))
+    return centroids.astype(np.float32)
+
+
+def _assign_lists(vectors, centroids, batch: int = 8192):
+    """Index of the nearest centroid (max dot product) for each vector."""
+    import numpy as np
+
+    out = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), batch):
+        out[start:start + batch] = np.argmax(vectors[start:start + batch] @ centroids.T, axis=1)
+    return out
+
+
+class AnnIndex:
+    """IVF-flat (numpy) or HNSW (hnswlib) index over code_chunks embeddings."""
+
+    def __init__(self, meta: Dict[str, Any], ids, centroids=None, offsets=None,
+                 vectors=None, hnsw=None):
+        self.meta = meta
+        self.ids = ids
+        self.centroids = centroids
+        self.offsets = offsets
+        self.vectors = vectors
+        self.hnsw = hnsw
+
+    @property
+    def backend(self) -> str:
+        return self.meta["backend"]
+
+    # -- build / update ----------------------------------------------------
+
+    @classmethod
+    def build(cls, ids, vectors, generation: int, backend: str = "auto") -> "AnnIndex":
+        import numpy as np
+
+        if backend == "auto":
+            backend = "hnsw" if _hnswlib_available() else "ivf"
+        meta = {"backend": backend, "generation": generation, "dim": int(vectors.shape[1]),
+                "trained_on": int(len(ids))}
+
+        if backend == "hnsw":
+            import hnswlib
+            index = hnswlib.Index(space="cosine", dim=vectors.shape[1])
+            index.init_index(max_elements=max(len(ids), 1), M=ANN_HNSW_M,
+                             ef_construction=ANN_HNSW_EF_CONSTRUCTION,
+                             allow_replace_deleted=True)
+            index.add_items(vectors, ids)
+            return cls(meta, ids, hnsw=index)
+
+        nlist = max(1, min(4096, int(np.sqrt(len(ids)))))
+        centroids = _kmeans(vectors, nlist)
+        return cls._from_lists(meta, centroids, ids, vectors, _assign_lists(vectors, centroids))
+
+    @classmethod
+    def _from_lists(cls, meta, centroids, ids, vectors, assign) -> "AnnIndex":
+        import numpy as np
+
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=len(centroids))
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(meta, ids[order], centroids=centroids, offsets=offsets,
+                   vectors=vectors[order].astype(np.float16))
+
+    def update(self, con: sqlite3.Connection, generation: int) -> "AnnIndex":
+        """
+        Apply chunk changes since this index was built: drop ids that no longer
+        have embeddings and add rows with higher ids (code_chunks ids are
+        AUTOINCREMENT, so never reused). New IVF vectors go to the existing
+        lists; k-means is redone once the data has grown or shrunk 4x.
+        """
+        import numpy as np
+
+        live = np.fromiter(
+            (r[0] for r in con.execute("SELECT id FROM code_chunks WHERE embedding IS NOT NULL")),
+            dtype=np.int64)
+        max_id = int(self.ids.max()) if len(self.ids) else 0
+        new_ids, new_vectors = load_chunk_vectors(con, max_id)
+        if len(new_ids) and new_vectors.shape[1] != self.meta["dim"]:
+            ids, vectors = load_chunk_vectors(con)
+            return AnnIndex.build(ids, vectors, generation, self.backend)
+
+        keep = np.isin(self.ids, live)
+        total = int(keep.sum()) + len(new_ids)
+        trained_on = self.meta["trained_on"]
+        if self.backend == "ivf" and not (trained_on / 4 <= total <= trained_on * 4):
+            ids, vectors = load_chunk_vectors(con)
+            return AnnIndex.build(ids, vectors, generation, self.backend)
+
+        meta = dict(self.meta, generation=generation)
+        if self.backend == "hnsw":
+            index = self.hnsw
+            for label in self.ids[~keep]:
+                index.mark_deleted(int(label))
+            if len(new_ids):
+                # Deleted slots are reused, so capacity only has to cover live items
+                needed = int(keep.sum()) + len(new_ids)
+                if needed > index.get_max_elements():
+                    index.resize_index(max(needed, index.get_max_elements() * 2))
+                index.add_items(new_vectors, new_ids, replace_deleted=True)
+            return AnnIndex(meta, np.concatenate([self.ids[keep], new_ids]), hnsw=index)
+
+        lists = np.repeat(np.arange(len(self.centroids)), np.diff(self.offsets))
+        ids = np.concatenate([self.ids[keep], new_ids])
+        vectors = np.concatenate([np.asarray(self.vectors[keep], dtype=np.float32), new_vectors])
+        assign = np.concatenate([lists[keep], _assign_lists(new_vectors, self.centroids)])
+        return AnnIndex._from_lists(meta, np.asarray(self.centroids), ids, vectors, assign)
+
+    # -- persist -----------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        import shutil
+        import numpy as np
+
+        tmp = path.with_name(path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        np.save(tmp / "ids.npy", self.ids)
+        if self.backend == "hnsw":
+            self.hnsw.save_index(str(tmp / "index.bin"))
+        else:
+            np.save(tmp / "centroids.npy", self.centroids)
+            np.save(tmp / "offsets.npy", self.offsets)
+            np.save(tmp / "vectors.npy", self.vectors)
+        (tmp / "meta.json").write_text(json.dumps(self.meta))
+
+        old = path.with_name(path.name + ".old")
+        shutil.rmtree(old, ignore_errors=True)
+        if path.exists():
+            os.replace(path, old)
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["AnnIndex"]:
+        try:
+            import numpy as np
+            meta = json.loads((path / "meta.json").read_text())
+            ids = np.load(path / "ids.npy", mmap_mode="r")
+            if meta["backend"] == "hnsw":
+                import hnswlib
+                index = hnswlib.Index(space="cosine", dim=meta["dim"])
+                index.load_index(str(path / "index.bin"), allow_replace_deleted=True)
+                return cls(meta, ids, hnsw=index)
+            return cls(meta, ids,
+                       centroids=np.load(path / "centroids.npy"),
+                       offsets=np.load(path / "offsets.npy"),
+                       vectors=np.load(path / "vectors.npy", mmap_mode="r"))
+        except (ImportError, OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def for_db(cls, db_path: Path) -> Optional["AnnIndex"]:
+        """The persisted index if it matches the DB's current generation."""
+        path = get_ann_index_dir(db_path)
+        if not path.exists():
+            return None
+        index = cls.load(path)
+        if index is None or index.meta.get("generation") != get_db_generation(db_path):
+            return None
+        return index
+
+    # -- search ------------------------------------------------------------
+
+    def search(self, query_vec: List[float], k: int = 10,
+               nprobe: Optional[int] = None) -> List[Tuple[int, float]]:
+        """[(chunk_id, cosine similarity)] for the approximate top k."""
+        import numpy as np
+
+        q = np.asarray(query_vec, dtype=np.float32)
+        if q.shape[0] != self.meta["dim"] or not len(self.ids):
+            return []
+        q = q / (np.linalg.norm(q) or 1.0)
+
+        if self.backend == "hnsw":
+            k = min(k, len(self.ids))
+            self.hnsw.set_ef(max(ANN_HNSW_EF_SEARCH, k))
+            labels, distances = self.hnsw.knn_query(q, k=k)
+            return [(int(l), 1.0 - float(d)) for l, d in zip(labels[0], distances[0])]
+
+        nlist = len(self.centroids)
+        if nprobe is None:
+            nprobe = max(ANN_MIN_NPROBE, int(nlist * ANN_NPROBE_FRACTION))
+        probe = np.argsort(-(self.centroids @ q))[:nprobe]
+        rows = np.concatenate([np.arange(self.offsets[l], self.offsets[l + 1]) for l in probe])
+        if not len(rows):
+            return []
+        scores = np.asarray(self.vectors[rows], dtype=np.float32) @ q
+        top = np.argsort(-scores)[:k]
+        return [(int(self.ids[rows[i]]), float(scores[i])) for i in top]
+
+
+def refresh_ann_index(con: sqlite3.Connection, db_path: Path, generation: int,
+                      backend: str = "auto", rebuild: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Bring the persisted ANN index up to date with code_chunks, building it on
+    first use and removing it when there are too few vectors to need one.
+    Returns the index meta, or None when no index is kept (or numpy is missing).
+    """
+    import shutil
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return None
+
+    path = get_ann_index_dir(db_path)
+    count = con.execute("SELECT COUNT(*) FROM code_chunks WHERE embedding IS NOT NULL").fetchone()[0]
+    if count < ANN_MIN_VECTORS:
+        shutil.rmtree(path, ignore_errors=True)
+        return None
+
+    index = None if rebuild else AnnIndex.load(path)
+    if index is not None and backend not in ("auto", index.backend):
+        index = None
+    if index is None:
+        ids, vectors = load_chunk_vectors(con)
+        index = AnnIndex.build(ids, vectors, generation, backend)
+    else:
+        index = index.update(con, generation)
+    index.save(path)
+    return index.meta
+
+
+# ============================================================
+# FILE DISCOVERY
+# ============================================================
+#
+# One pass over the project: `git ls-files` when the project is a git work
+# tree (tracked + untracked-but-not-ignored), otherwise a single os.scandir
+# walk that prunes excluded and .gitignore'd directories before descending.
+
+# Source extensions synced, by language
+SYNC_EXTENSIONS = {
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".swift": "swift",
+    ".py": "python",
+}
+
+# Directories never descended into (matched by name at any depth)
+SYNC_EXCLUDED_DIRS = {
+    "node_modules", ".git", "__pycache__", "dist", "build",
+    ".next", ".venv", "venv", "Pods", "DerivedData", ".build",
+}
+
+# Files larger than this are skipped (generated bundles, fixtures, dumps)
+SYNC_MAX_FILE_BYTES = 512 * 1024
+
+# .tsx files under these directories are also recorded as components
+COMPONENT_DIRS = [
+    ("src/components/", "component"),
+    ("src/pages/", "page"),
+    ("src/app/", "page"),
+    ("components/", "component"),
+]
+
+
+class GitIgnore:
+    """
+    Minimal .gitignore matcher for the scandir fallback: globs, negation,
+    dir-only (trailing /) and anchored (leading or inner /) patterns, with
+    nested .gitignore files applying below their own directory.
+    """
+
+    def __init__(self, rules: Optional[List[Tuple[str, str, bool, bool, bool]]] = None):
+        # (base_dir, pattern, negate, dir_only, anchored)
+        self.rules = rules or []
+
+    def extended(self, rel_dir: str, abs_dir: str) -> "GitIgnore":
+        """Rules in effect below rel_dir, adding its .gitignore if present."""
+        try:
+            with open(os.path.join(abs_dir, ".gitignore"), encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return self
+
+        rules = list(self.rules)
+        for line in lines:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if dir_only else line
+            anchored = "/" in line
+            if line:
+                rules.append((rel_dir, line.lstrip("/"), negate, dir_only, anchored))
+        return GitIgnore(rules)
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        import fnmatch
+
+        result = False
+        for base, pattern, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                path = rel_path[len(base) + 1:]
+            else:
+                path = rel_path
+            target = path if anchored else path.rsplit("/", 1)[-1]
+            if fnmatch.fnmatchcase(target, pattern):
+                result = not negate
+        return result
+
+
+def _git_ls_files(project_root: Path) -> Optional[List[str]]:
+    """Tracked and untracked-not-ignored paths, or None outside a git work tree."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=str(project_root), capture_output=True, timeout=30,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return [p for p in result.stdout.decode("utf-8", "replace").split("\0") if p]
+
+
+def iter_source_files(
+    project_root: Path,
+    max_file_bytes: int = SYNC_MAX_FILE_BYTES,
+    use_git: bool = True,
+    skipped: Optional[Dict[str, int]] = None,
+    extensions: Optional[Dict[str, str]] = None,
+):
+    """
+    Yield (abs_path, rel_path, language, size) for every syncable source file.
+
+    Files are dispatched by extension (`extensions`, default SYNC_EXTENSIONS);
+    SYNC_EXCLUDED_DIRS, ignored paths and files over max_file_bytes are
+    skipped. Skip counts are added to `skipped` ("too_large") when given.
+    """
+    root = str(project_root)
+    if extensions is None:
+        extensions = SYNC_EXTENSIONS
+
+    def oversized(size: int) -> bool:
+        if max_file_bytes and size > max_file_bytes:
+            if skipped is not None:
+                skipped["too_large"] = skipped.get("too_large", 0) + 1
+            return True
+        return False
+
+    paths = _git_ls_files(project_root) if use_git else None
+    if paths is not None:
+        for rel_path in paths:
+            language = extensions.get(os.path.splitext(rel_path)[1].lower())
+            if language is None:
+                continue
+            if not SYNC_EXCLUDED_DIRS.isdisjoint(rel_path.split("/")[:-1]):
+                continue
+            abs_path = os.path.join(root, rel_path)
+            try:
+                st = os.stat(abs_path)
+            except OSError:
+                continue  # deleted in the work tree
+            if not os.path.isfile(abs_path) or oversized(st.st_size):
+                continue
+            yield abs_path, rel_path, language, st.st_size
+        return
+
+    stack = [(root, "", GitIgnore().extended("", root))]
+    while stack:
+        abs_dir, rel_dir, ignore = stack.pop()
+        try:
+            entries = list(os.scandir(abs_dir))
+        except OSError:
+            continue
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in SYNC_EXCLUDED_DIRS or ignore.ignored(rel_path, True):
+                        continue
+                    stack.append((entry.path, rel_path, ignore.extended(rel_path, entry.path)))
+                    continue
+                language = extensions.get(os.path.splitext(entry.name)[1].lower())
+                if language is None or not entry.is_file():
+                    continue
+                if ignore.ignored(rel_path, False):
+                    continue
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            if oversized(size):
+                continue
+            yield entry.path, rel_path, language, size
+
+
+def component_type_for(rel_path: str) -> Optional[str]:
+    """Component type for .tsx files under COMPONENT_DIRS, else None."""
+    if not rel_path.endswith(".tsx"):
+        return None
+    for prefix, comp_type in COMPONENT_DIRS:
+        if rel_path.startswith(prefix):
+            return comp_type
+    return None
+
+
+# ============================================================
+# SYNC FUNCTIONS
+# ============================================================
+
+def _index_source_file(
+    con: sqlite3.Connection,
+    project_str: str,
+    file_path: str,
+    rel_path: str,
+    language: str,
+    content: str,
+    stats: Dict[str, int],
+    generate_embeddings: bool = False,
+    encoding: str = "float32",
+) -> None:
+    """Chunk one file into code_chunks / symbols / components (counted in stats)."""
+    model_tag = embedding_model_tag(encoding)
+    stats["files"] += 1
+
+    # Get language-specific chunker
+    chunker = get_chunker(file_path)
+
+    if chunker:
+        # Use language-specific chunking
+        chunks = chunker.chunk(content, rel_path)
+
+        for i, chunk in enumerate(chunks):
+            # Generate embedding if requested
+            embedding = None
+            if generate_embeddings and chunk.content:
+                # Include symbol name in embedding context
+                embed_text = f"{chunk.name}: {chunk.content[:2000]}"
+                embedding = get_embedding(embed_text, encoding)
+
+            # Insert code chunk
+            cursor = con.execute("""
+                INSERT INTO code_chunks
+                (project_path, file_path, chunk_index, content, language,
+                 chunk_type, name, parent_name, start_line, end_line,
+                 embedding, embedding_model, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'))
+            """, (
+                project_str, rel_path, i, chunk.content, chunk.language,
+                chunk.chunk_type, chunk.name, chunk.parent_name,
+                chunk.start_line, chunk.end_line,
+                embedding, model_tag if embedding else None
+            ))
+            chunk_id = cursor.lastrowid
+            stats["code_chunks"] += 1
+
+            # Insert symbols for this chunk
+            for symbol_name in chunk.symbols:
+                cursor = con.execute("""
+                    INSERT INTO symbols
+                    (project_path, file_path, symbol_name, symbol_type,
+                     parent_symbol, language, start_line, end_line, chunk_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    project_str, rel_path, symbol_name, chunk.chunk_type,
+                    chunk.parent_name, chunk.language,
+                    chunk.start_line, chunk.end_line, chunk_id
+                ))
+                con.execute("""
+                    INSERT INTO symbol_keys (symbol_id, name_lower, initials)
+                    VALUES (?, ?, ?)
+                """, (
+                    cursor.lastrowid, symbol_name.lower(),
+                    identifier_initials(symbol_name)
+                ))
+                stats["symbols"] += 1
+    else:
+        # Fallback: simple chunking for unknown languages
+        chunk_content = content[:4000]
+        name = Path(file_path).stem
+
+        embedding = None
+        if generate_embeddings and chunk_content:
+            embedding = get_embedding(f"{name}: {chunk_content[:2000]}", encoding)
+
+        con.execute("""
+            INSERT INTO code_chunks
+            (project_path, file_path, chunk_index, content, language,
+             chunk_type, name, start_line, end_line,
+             embedding, embedding_model, updated_at)
+            VALUES (?, ?, 0, ?, ?, 'file', ?, 1, ?, ?, ?, datetime('now'))
+        """, (
+            project_str, rel_path, chunk_content, language,
+            name, content.count('\n') + 1,
+            embedding, model_tag if embedding else None
+        ))
+        stats["code_chunks"] += 1
+
+    # Also record components (legacy component directories)
+    comp_type = component_type_for(rel_path)
+    if comp_type:
+        name = Path(rel_path).stem
+        comp_content = content[:4000]
+
+        embedding = None
+        if generate_embeddings and comp_content:
+            embedding = get_embedding(f"{name}: {comp_content[:2000]}", encoding)
+
+        con.execute("""
+            INSERT OR REPLACE INTO components
+            (project_path, name, type, file_path, embedding, embedding_model, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+        """, (
+            project_str, name, comp_type, rel_path,
+            embedding, model_tag if embedding else None
+        ))
+        stats["components"] += 1
+
+
+def sync_from_project_context(
+    project_root: Path,
+    db_path: Path,
+    generate_embeddings: bool = False,
+    max_file_bytes: int = SYNC_MAX_FILE_BYTES,
+    encoding: str = "float32",
+) -> Dict[str, int]:
+    """
+    Enhanced sync with language-specific chunking and symbol extraction.
+
+    Files come from one iter_source_files() pass (git ls-files or a pruned
+    scandir walk) and are chunked by the chunker for their extension.
+    Extracts symbols (function/class names) for symbol search. Embeddings
+    are stored in `encoding` (see EMBEDDING_ENCODINGS).
+    """
+    stats = {"components": 0, "code_chunks": 0, "symbols": 0, "files": 0, "skipped_large": 0}
+
+    con = sqlite3.connect(str(db_path))
+    project_str = str(project_root)
+
+    try:
+        # Clear existing chunks, symbols and components for this project
+        con.execute("""
+            DELETE FROM symbol_keys WHERE symbol_id IN
+                (SELECT id FROM symbols WHERE project_path = ?)
+        """, (project_str,))
+        con.execute("DELETE FROM code_chunks WHERE project_path = ?", (project_str,))
+        con.execute("DELETE FROM symbols WHERE project_path = ?", (project_str,))
+        con.execute("DELETE FROM components WHERE project_path = ?", (project_str,))
+        con.commit()
+
+        skipped: Dict[str, int] = {}
+        for file_path, rel_path, language, _size in iter_source_files(
+            project_root, max_file_bytes, skipped=skipped
+        ):
+            # Read file content
+            try:
+                content = Path(file_path).read_text(encoding='utf-8')
+            except Exception as e:
+                print(f"  Skip {rel_path}: {e}", file=sys.stderr)
+                continue
+
+            _index_source_file(
+                con, project_str, file_path, rel_path, language, content,
+                stats, generate_embeddings, encoding,
+            )
+
+        stats["skipped_large"] = skipped.get("too_large", 0)
+
+        con.commit()
+
+        # Rebuild FTS indexes
+        try:
+            rebuild_fts(con)
+            con.commit()
+        except Exception:
+            pass  # FTS tables might not exist yet
+
+        # Log sync event and invalidate cached search results
+        con.execute("""
+            INSERT INTO sync_events (project_path, event_type, stats_json)
+            VALUES (?, 'sync_v2', ?)
+        """, (project_str, json.dumps(stats)))
+        generation = bump_db_generation(con)
+        con.commit()
+
+        # Prebuild the fuzzy symbol matcher for this generation
+        try:
+            SymbolMatcher.build_from_db(con, generation).save(get_symbol_matcher_path(db_path))
+        except OSError as e:
+            print(f"  Symbol matcher not saved: {e}", file=sys.stderr)
+
+        # Keep the ANN index in step with the new chunk embeddings
+        if generate_embeddings or get_ann_index_dir(db_path).exists():
+            try:
+                ann = refresh_ann_index(con, db_path, generation)
+                if ann:
+                    stats["ann_index"] = ann["backend"]
+            except Exception as e:
+                print(f"  ANN index not updated: {e}", file=sys.stderr)
+
+    finally:
+        con.close()
+
+    return stats
+
+
+def _ignored_paths(project_root: Path, rel_paths: List[str]) -> set:
+    """The subset of rel_paths that .gitignore excludes."""
+    try:
+        result = subprocess.run(
+            ["git", "check-ignore", "-z", "--stdin"],
+            cwd=str(project_root), input="\0".join(rel_paths).encode(),
+            capture_output=True, timeout=30,
+        )
+        if result.returncode in (0, 1):  # 1: nothing ignored
+            return {p for p in result.stdout.decode("utf-8", "replace").split("\0") if p}
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+
+    # Not a git work tree: apply the .gitignore chain along each path
+    ignored = set()
+    chains: Dict[str, GitIgnore] = {"": GitIgnore().extended("", str(project_root))}
+    for rel_path in rel_paths:
+        parts = rel_path.split("/")
+        rel_dir = ""
+        for part in parts[:-1]:
+            child = f"{rel_dir}/{part}" if rel_dir else part
+            if child not in chains:
+                if chains[rel_dir].ignored(child, True):
+                    chains[child] = chains[rel_dir]
+                    ignored.add(rel_path)
+                    break
+                chains[child] = chains[rel_dir].extended(child, str(project_root / child))
+            rel_dir = child
+        else:
+            if chains[rel_dir].ignored(rel_path, False):
+                ignored.add(rel_path)
+    return ignored
+
+
+def sync_files(
+    project_root: Path,
+    db_path: Path,
+    rel_paths: List[str],
+    generate_embeddings: bool = False,
+    max_file_bytes: int = SYNC_MAX_FILE_BYTES,
+    encoding: str = "float32",
+) -> Dict[str, int]:
+    """
+    Incremental sync: re-chunk only `rel_paths` (changed, added or deleted),
+    in one transaction.
+
+    Each path's old chunks, symbols and component rows are dropped (with
+    their FTS entries); paths that still exist and would be synced are
+    chunked again and indexed. Bumps the generation, so cached results and
+    the symbol matcher refresh on the next search.
+    """
+    stats = {"components": 0, "code_chunks": 0, "symbols": 0, "files": 0,
+             "removed": 0, "skipped_large": 0}
+    rel_paths = sorted(set(rel_paths))
+    if not rel_paths:
+        return stats
+
+    project_str = str(project_root)
+    paths_json = json.dumps(rel_paths)
+    where = "project_path = ? AND file_path IN (SELECT value FROM json_each(?))"
+    params = (project_str, paths_json)
+    ignored = _ignored_paths(project_root, rel_paths)
+
+    con = sqlite3.connect(str(db_path))
+    try:
+        for table in ("code_chunks", "symbols", "components"):
+            update_fts_rows(con, table, where, params, delete=True)
+        con.execute(f"""
+            DELETE FROM symbol_keys WHERE symbol_id IN
+                (SELECT id FROM symbols WHERE {where})
+        """, params)
+        con.execute(f"DELETE FROM symbols WHERE {where}", params)
+        con.execute(f"DELETE FROM components WHERE {where}", params)
+        stats["removed"] = con.execute(f"DELETE FROM code_chunks WHERE {where}", params).rowcount
+
+        for rel_path in rel_paths:
+            language = SYNC_EXTENSIONS.get(os.path.splitext(rel_path)[1].lower())
+            if (language is None or rel_path in ignored
+                    or not SYNC_EXCLUDED_DIRS.isdisjoint(rel_path.split("/")[:-1])):
+                continue
+            file_path = str(project_root / rel_path)
+            try:
+                if max_file_bytes and os.stat(file_path).st_size > max_file_bytes:
+                    stats["skipped_large"] += 1
+                    continue
+                content = Path(file_path).read_text(encoding='utf-8')
+            except FileNotFoundError:
+                continue  # deleted: its rows are already gone
+            except Exception as e:
+                print(f"  Skip {rel_path}: {e}", file=sys.stderr)
+                continue
+            _index_source_file(
+                con, project_str, file_path, rel_path, language, content,
+                stats, generate_embeddings, encoding,
+            )
+
+        for table in ("code_chunks", "symbols", "components"):
+            update_fts_rows(con, table, where, params)
+
+        con.execute("""
+            INSERT INTO sync_events (project_path, event_type, stats_json)
+            VALUES (?, 'sync_files', ?)
+        """, (project_str, json.dumps(stats)))
+        generation = bump_db_generation(con)
+        con.commit()
+
+        if generate_embeddings or get_ann_index_dir(db_path).exists():
+            try:
+                refresh_ann_index(con, db_path, generation)
+            except Exception as e:
+                print(f"  ANN index not updated: {e}", file=sys.stderr)
+    finally:
+        con.close()
+
+    return stats
+
+
+# ============================================================
+# WATCH MODE
+# ============================================================
+#
+# `watch` keeps vibe.db live during a session: file events (watchdog's
+# inotify/FSEvents observer, or a polling fallback) are collected in a
+# ChangeQueue, debounced, and flushed through sync_files() in batched
+# transactions. A pid file next to vibe.db lets session hooks start one
+# watcher per project; a sessions file lists the sessions using it, and the
+# last one to detach stops it. A watcher that sees no changes for
+# WATCH_IDLE_TIMEOUT exits by itself (e.g. after a session crashed).
+
+WATCH_DEBOUNCE = 0.5        # seconds of quiet before a batch is flushed
+WATCH_MAX_DELAY = 5.0       # flush anyway while events keep arriving
+WATCH_POLL_INTERVAL = 2.0   # polling fallback scan interval
+WATCH_MAX_BATCH = 1000      # files per transaction (e.g. a big git checkout)
+WATCH_IDLE_TIMEOUT = 3600.0 # seconds without changes before a watcher exits
+
+
+def get_watch_pid_path(db_path: Path) -> Path:
+    return db_path.with_name("vibe-watch.pid")
+
+
+def read_watch_pid(db_path: Path) -> Optional[int]:
+    """Pid of the running watcher for this vibe.db, or None."""
+    try:
+        pid = int(get_watch_pid_path(db_path).read_text().strip())
+        os.kill(pid, 0)
+    except (OSError, ValueError):
+        return None
+    return pid
+
+
+def acquire_watch_pid(db_path: Path) -> bool:
+    """Write our pid file; False if another live watcher holds it."""
+    path = get_watch_pid_path(db_path)
+    for _ in range(2):
+        try:
+            fd = os.open(str(path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            if read_watch_pid(db_path) is not None:
+                return False
+            path.unlink(missing_ok=True)  # stale: its process is gone
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def release_watch_pid(db_path: Path) -> None:
+    path = get_watch_pid_path(db_path)
+    try:
+        if int(path.read_text().strip()) == os.getpid():
+            path.unlink()
+    except (OSError, ValueError):
+        pass
+
+
+def get_watch_sessions_path(db_path: Path) -> Path:
+    return db_path.with_name("vibe-watch.sessions")
+
+
+def _edit_watch_sessions(db_path: Path, edit) -> List[str]:
+    """Replace the session keys with edit(keys), under an exclusive lock."""
+    import fcntl
+    with open(get_watch_sessions_path(db_path), "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        keys = edit([line.strip() for line in f if line.strip()])
+        f.seek(0)
+        f.truncate()
+        f.write("".join(f"{key}\n" for key in keys))
+    return keys
+
+
+def attach_watch_session(db_path: Path, session: Optional[str]) -> int:
+    """Record a session using the watcher; returns the number attached."""
+    key = session or f"anonymous:{os.getpid()}"
+    return len(_edit_watch_sessions(
+        db_path, lambda keys: keys if key in keys else keys + [key]))
+
+
+def detach_watch_session(db_path: Path, session: Optional[str]) -> Optional[int]:
+    """
+    Remove a session (without a key, one anonymous session); returns the
+    number still attached, or None if it wasn't attached.
+    """
+    removed = []
+
+    def edit(keys):
+        for key in keys:
+            if key == session or (not session and key.startswith("anonymous:")):
+                removed.append(key)
+                return [k for k in keys if k != key]
+        return keys
+
+    remaining = _edit_watch_sessions(db_path, edit)
+    return len(remaining) if removed else None
+
+
+class ChangeQueue:
+    """Thread-safe set of changed paths with debounce timing."""
+
+    def __init__(self):
+        import threading
+        self._lock = threading.Lock()
+        self._paths: set = set()
+        self._first = 0.0
+        self._last = 0.0
+
+    def add(self, rel_paths) -> None:
+        import time
+        now = time.monotonic()
+        with self._lock:
+            if not self._paths:
+                self._first = now
+            self._paths.update(rel_paths)
+            self._last = now
+
+    def take(self, debounce: float, max_delay: float) -> List[str]:
+        """All pending paths once quiet for `debounce` (or pending `max_delay`)."""
+        import time
+        now = time.monotonic()
+        with self._lock:
+            if not self._paths:
+                return []
+            if now - self._last < debounce and now - self._first < max_delay:
+                return []
+            paths, self._paths = sorted(self._paths), set()
+        return paths
+
+
+def _watch_candidate(rel_path: str) -> bool:
+    """Cheap pre-filter for raw file events (ignore rules apply at flush)."""
+    if rel_path.startswith(".."):
+        return False
+    if os.path.splitext(rel_path)[1].lower() not in SYNC_EXTENSIONS:
+        return False
+    return SYNC_EXCLUDED_DIRS.isdisjoint(rel_path.split("/")[:-1])
+
+
+def _start_observer(project_root: Path, queue: ChangeQueue):
+    """watchdog observer feeding `queue`, or None if watchdog isn't installed."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    root = str(project_root)
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type not in (
+                "created", "modified", "deleted", "moved"
+            ):
+                return
+            paths = [event.src_path, getattr(event, "dest_path", "")]
+            rel = [os.path.relpath(p, root).replace(os.sep, "/") for p in paths if p]
+            rel = [p for p in rel if _watch_candidate(p)]
+            if rel:
+                queue.add(rel)
+
+    observer = Observer()
+    observer.schedule(Handler(), root, recursive=True)
+    observer.start()
+    return observer
+
+
+def _poll_snapshot(project_root: Path, max_file_bytes: int) -> Dict[str, Tuple[int, int]]:
+    """rel_path -> (mtime_ns, size) for every syncable file."""
+    snapshot = {}
+    for file_path, rel_path, _language, size in iter_source_files(
+        project_root, max_file_bytes, use_git=False
+    ):
+        try:
+            snapshot[rel_path] = (os.stat(file_path).st_mtime_ns, size)
+        except OSError:
+            continue
+    return snapshot
+
+
+def watch_project(
+    project_root: Path,
+    db_path: Path,
+    debounce: float = WATCH_DEBOUNCE,
+    generate_embeddings: bool = False,
+    encoding: str = "float32",
+    use_polling: bool = False,
+    max_file_bytes: int = SYNC_MAX_FILE_BYTES,
+    idle_timeout: float = WATCH_IDLE_TIMEOUT,
+) -> None:
+    """
+    Sync changed files in debounced batches until interrupted, or until no
+    file has changed for idle_timeout seconds (0: never time out).
+    """
+    import time
+
+    queue = ChangeQueue()
+    observer = None if use_polling else _start_observer(project_root, queue)
+    snapshot = None if observer else _poll_snapshot(project_root, max_file_bytes)
+    mode = "watchdog" if observer else f"polling every {WATCH_POLL_INTERVAL:.0f}s"
+    print(f"Watching {project_root} ({mode}); Ctrl-C to stop", flush=True)
+
+    next_poll = time.monotonic() + WATCH_POLL_INTERVAL
+    last_change = time.monotonic()
+    try:
+        while True:
+            if idle_timeout and time.monotonic() - last_change > idle_timeout:
+                print(f"No changes for {idle_timeout:.0f}s; exiting", flush=True)
+                return
+            if snapshot is not None and time.monotonic() >= next_poll:
+                current = _poll_snapshot(project_root, max_file_bytes)
+                changed = [p for p, sig in current.items() if snapshot.get(p) != sig]
+                changed += [p for p in snapshot if p not in current]
+                snapshot = current
+                if changed:
+                    queue.add(changed)
+                next_poll = time.monotonic() + WATCH_POLL_INTERVAL
+
+            paths = queue.take(debounce, WATCH_MAX_DELAY)
+            if paths:
+                last_change = time.monotonic()
+            for i in range(0, len(paths), WATCH_MAX_BATCH):
+                batch = paths[i:i + WATCH_MAX_BATCH]
+                t0 = time.perf_counter()
+                try:
+                    stats = sync_files(project_root, db_path, batch,
+                                       generate_embeddings, max_file_bytes, encoding)
+                except sqlite3.Error as e:
+                    print(f"  Sync failed ({e}); retrying", file=sys.stderr)
+                    queue.add(paths[i:])
+                    break
+                elapsed = (time.perf_counter() - t0) * 1000
+                print(f"[{time.strftime('%H:%M:%S')}] {len(batch)} changed: "
+                      f"{stats['files']} re-chunked, {stats['code_chunks']} chunks, "
+                      f"{stats['symbols']} symbols ({elapsed:.0f} ms)", flush=True)
+            time.sleep(0.1)
+    finally:
+        if observer:
+            observer.stop()
+            observer.join(timeout=2)
+
+
+# ============================================================
+# SEARCH FUNCTIONS
+# ============================================================
+
+# Symbol match classes, best first: (match_type, score)
+SYMBOL_MATCH_CLASSES = [
+    ("exact", 1.0),
+    ("case_insensitive", 0.9),
+    ("prefix", 0.8),
+    ("initials", 0.7),
+    ("contains", 0.5),
+]
+
+# Single ranked lookup. Every candidate leg is an index probe with its own
+# LIMIT: exact and prefix probe symbol_keys.name_lower (equality / range),
+# camelCase initials an equality probe on symbol_keys.initials, and
+# substring matches come from the trigram FTS table (queries >= 3 chars).
+# Only a content snippet is pulled from code_chunks, never the whole chunk.
+SYMBOL_SEARCH_SQL = """
+    WITH candidates(id, cls) AS (
+        SELECT * FROM (
+            SELECT k.symbol_id, 1 FROM symbol_keys k
+            WHERE k.name_lower = :lower
+            LIMIT :budget
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT k.symbol_id, 2 FROM symbol_keys k
+            WHERE k.name_lower > :lower AND k.name_lower < :upper
+            LIMIT :budget
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT k.symbol_id, 3 FROM symbol_keys k
+            WHERE k.initials = :lower
+            LIMIT :budget
+        )
+        UNION ALL
+        SELECT * FROM (
+            SELECT t.rowid, 4 FROM symbols_trigram t
+            WHERE :use_trigram AND symbols_trigram MATCH :fts_query
+            LIMIT :budget
+        )
+    )
+    SELECT s.id, s.symbol_name, s.symbol_type, s.file_path, s.start_line,
+           s.parent_symbol, s.language,
+           CASE WHEN s.symbol_name = :query THEN 0 ELSE MIN(c.cls) END AS cls,
+           substr(ch.content, 1, 200) AS snippet
+    FROM candidates c
+    JOIN symbols s ON s.id = c.id
+    LEFT JOIN code_chunks ch ON ch.id = s.chunk_id
+    GROUP BY s.id
+    ORDER BY cls, length(s.symbol_name), s.symbol_name
+    LIMIT :limit
+"""
+
+# Same result shape straight from symbols, for DBs whose symbols predate
+# symbol_keys/symbols_trigram (not yet migrated by `init`). A LIKE scan with
+# no initials class, so only used when the keyed query can't answer.
+SYMBOL_SEARCH_UNKEYED_SQL = """
+    SELECT s.id, s.symbol_name, s.symbol_type, s.file_path, s.start_line,
+           s.parent_symbol, s.language,
+           CASE WHEN s.symbol_name = :query THEN 0
+                WHEN lower(s.symbol_name) = :lower THEN 1
+                WHEN s.symbol_name LIKE :prefix ESCAPE '\\' THEN 2
+                ELSE 4 END AS cls,
+           substr(ch.content, 1, 200) AS snippet
+    FROM symbols s
+    LEFT JOIN code_chunks ch ON ch.id = s.chunk_id
+    WHERE s.symbol_name LIKE :contains ESCAPE '\\'
+    ORDER BY cls, length(s.symbol_name), s.symbol_name
+    LIMIT :limit
+"""
+
+
+def _symbols_unkeyed(con: sqlite3.Connection) -> bool:
+    """True if symbols has rows but symbol_keys is missing or empty."""
+    try:
+        return con.execute("""
+            SELECT EXISTS (SELECT 1 FROM symbols)
+               AND NOT EXISTS (SELECT 1 FROM symbol_keys)
+        """).fetchone()[0] == 1
+    except sqlite3.OperationalError as e:
+        return "symbol_keys" in str(e)
+
+
+def symbol_search(db_path: Path, query: str, limit: int = 20) -> List[Dict]:
+    """
+    Search for symbols (function/class/component names).
 
+    One ranked query classifies each hit as exact, case-insensitive exact,
+    prefix, camelCase/snake_case initials (``hat`` -> handleAuthToken) or
+    contains, and orders by that class, then by name length. A DB whose
+    symbols were never keyed (predates symbol_keys; `init` migrates it) is
+    searched with SYMBOL_SEARCH_UNKEYED_SQL instead.
+    """
+    query = query.strip()
+    if not query:
+        return []
+
+    lower = query.lower()
+    params = {
+        "query": query,
+        "lower": lower,
+        # Exclusive upper bound of the prefix range
+        "upper": lower[:-1] + chr(ord(lower[-1]) + 1),
+        # Trigram index needs 3+ chars; shorter queries use prefix/initials only
+        "use_trigram": 1 if len(query) >= 3 else 0,
+        "fts_query": '"' + query.replace('"', '""') + '"',
+        "budget": max(limit * 4, 50),
+        "limit": limit * 2,  # headroom for (name, file, line) dedupe below
+    }
+
+    con = connect_readonly(db_path)
+    con.row_factory = sqlite3.Row
+    try:
+        try:
+            rows = con.execute(SYMBOL_SEARCH_SQL, params).fetchall()
+        except sqlite3.OperationalError as e:
+            rows = None
+            error = e
+        if not rows and _symbols_unkeyed(con):
+            pattern = re.sub(r"([\\%_])", r"\\\1", query)
+            rows = con.execute(SYMBOL_SEARCH_UNKEYED_SQL, {
+                "query": query, "lower": lower, "limit": params["limit"],
+                "prefix": pattern + "%", "contains": "%" + pattern + "%",
+            }).fetchall()
+        elif rows is None:
+            print(f"Symbol index unavailable ({error}). Run: vibe-sync.py sync", file=sys.stderr)
+            return []
     finally:
         con.close()
 
-    # Sort by score and deduplicate
     seen = set()
-    unique_results = []
-    for r in sorted(results, key=lambda x: -x["score"]):
-        key = (r["name"], r["file_path"], r["line"])
-        if key not in seen:
-            seen.add(key)
-            unique_results.append(r)
+    results = []
+    for r in rows:
+        key = (r["symbol_name"], r["file_path"], r["start_line"])
+        if key in seen:
+            continue
+        seen.add(key)
+        match_type, score = SYMBOL_MATCH_CLASSES[r["cls"]]
+        results.append({
+            "type": "symbol",
+            "name": r["symbol_name"],
+            "symbol_type": r["symbol_type"],
+            "file_path": r["file_path"],
+            "line": r["start_line"],
+            "parent": r["parent_symbol"],
+            "language": r["language"],
+            "content": r["snippet"] or "",
+            "score": score,
+            "match_type": match_type
+        })
+        if len(results) >= limit:
+            break
+
+    return results
+
+
+_FTS_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+
 
-    return unique_results[:limit]
+def build_fts_query(query: str, mode: str = "and") -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every term is quoted, so punctuation and FTS keywords in the input can't
+    raise syntax errors. "quoted text" stays a phrase and a trailing * keeps
+    a prefix search (auth* -> "auth"*). Modes:
 
+    - and:    all terms must match (FTS5 implicit AND)
+    - or:     any term may match; bm25 still favours rows matching more
+    - phrase: the whole query as one phrase
+    - prefix: like and, with every term treated as a prefix
+
+    Returns "" if the query has no searchable terms.
+    """
+    if mode == "phrase":
+        words = re.findall(r"\w+", query)
+        return '"' + " ".join(words) + '"' if words else ""
+
+    terms = []
+    for m in _FTS_TERM_RE.finditer(query):
+        phrase, bare = m.groups()
+        if bare in ("AND", "OR"):
+            continue  # the mode decides how terms combine
+        words = re.findall(r"\w+", phrase if phrase is not None else bare)
+        if not words:
+            continue
+        term = '"' + " ".join(words) + '"'
+        if phrase is None and (mode == "prefix" or bare.endswith("*")):
+            term += "*"
+        terms.append(term)
+
+    return (" OR " if mode == "or" else " ").join(terms)
+
+
+def text_search(db_path: Path, query: str, limit: int = 10, mode: str = "auto") -> List[Dict]:
+    """
+    FTS5 text search across code chunks and components.
 
-def text_search(db_path: Path, query: str, limit: int = 10) -> List[Dict]:
-    """FTS5 text search across code chunks and components."""
+    In "auto" mode an all-terms (AND) match runs first and, for multi-term
+    queries that leave room, an any-term (OR) pass tops it up. A LIKE
+    substring scan, stopping once it has enough hits, only runs for
+    single-term queries FTS can't satisfy, e.g. "Auth" inside handleAuth.
+    """
     results = []
-    con = sqlite3.connect(str(db_path))
+    seen_ids = set()
+    con = connect_readonly(db_path)
     con.row_factory = sqlite3.Row
 
+    if mode == "auto":
+        and_query = build_fts_query(query, "and")
+        or_query = build_fts_query(query, "or")
+        passes = [(and_query, 1.0)]
+        if or_query != and_query:
+            # OR hits matched fewer terms; keep them below the AND hits
+            passes.append((or_query, 0.8))
+    else:
+        passes = [(build_fts_query(query, mode), 1.0)]
+
     try:
-        # Search code chunks with FTS
-        try:
-            rows = con.execute("""
-                SELECT c.*, highlight(code_chunks_fts, 0, '>>>', '<<<') as highlight
-                FROM code_chunks c
-                JOIN code_chunks_fts ON c.id = code_chunks_fts.rowid
-                WHERE code_chunks_fts MATCH ?
-                LIMIT ?
-            """, (query, limit)).fetchall()
+        # Search code chunks with FTS, ranked by bm25 (lower = better).
+        # Scores are normalized against the best hit so they land in (0, 1].
+        best = None
+        for fts_query, weight in passes:
+            if not fts_query or len(results) >= limit:
+                continue
+            try:
+                rows = con.execute(f"""
+                    SELECT c.id, c.name, c.file_path, c.chunk_type, c.start_line,
+                           highlight(code_chunks_fts, 0, '>>>', '<<<') as highlight,
+                           bm25(code_chunks_fts, {', '.join(map(str, FTS_COLUMN_WEIGHTS))}) AS rank
+                    FROM code_chunks_fts
+                    JOIN code_chunks c ON c.id = code_chunks_fts.rowid
+                    WHERE code_chunks_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                """, (fts_query, limit + len(seen_ids))).fetchall()
+            except sqlite3.OperationalError:
+                continue
 
+            if rows and best is None:
+                best = rows[0]["rank"]
             for r in rows:
+                if r["id"] in seen_ids:
+                    continue
+                seen_ids.add(r["id"])
                 results.append({
                     "type": "code_chunk",
                     "name": r["name"],
@@ -1064,36 +3374,42 @@ def text_search(db_path: Path, query: str, limit: int = 10) -> List[Dict]:
                     "chunk_type": r["chunk_type"],
                     "line": r["start_line"],
                     "highlight": r["highlight"][:200] if r["highlight"] else "",
-                    "score": 1.0
+                    "bm25": round(r["rank"], 4),
+                    "score": weight * min(1.0, r["rank"] / best) if best < 0 else weight
                 })
-        except Exception:
-            pass
-
-        # Fallback: LIKE search on code chunks
-        if len(results) < limit:
+                if len(results) >= limit:
+                    break
+
+        # Fallback: substring match for single terms (always ranks below FTS
+        # hits). The scan covers every chunk and stops at the result LIMIT.
+        if len(results) < limit and len(query.split()) == 1:
+            fallback_score = min((x["score"] for x in results), default=1.0) * 0.6
+            pattern = f"%{query.rstrip('*')}%"
             try:
-                pattern = f"%{query}%"
                 rows = con.execute("""
-                    SELECT * FROM code_chunks
-                    WHERE content LIKE ? OR name LIKE ?
+                    SELECT id, name, file_path, chunk_type, start_line,
+                           substr(content, 1, 100) AS snippet
+                    FROM code_chunks
+                    WHERE name LIKE ? OR content LIKE ?
                     LIMIT ?
-                """, (pattern, pattern, limit - len(results))).fetchall()
+                """, (pattern, pattern, limit - len(results) + len(seen_ids))).fetchall()
 
                 for r in rows:
-                    if not any(
-                        x["file_path"] == r["file_path"] and x["line"] == r["start_line"]
-                        for x in results
-                    ):
-                        results.append({
-                            "type": "code_chunk",
-                            "name": r["name"],
-                            "file_path": r["file_path"],
-                            "chunk_type": r["chunk_type"],
-                            "line": r["start_line"],
-                            "highlight": (r["content"] or "")[:100],
-                            "score": 0.6
-                        })
-            except Exception:
+                    if r["id"] in seen_ids:
+                        continue
+                    seen_ids.add(r["id"])
+                    results.append({
+                        "type": "code_chunk",
+                        "name": r["name"],
+                        "file_path": r["file_path"],
+                        "chunk_type": r["chunk_type"],
+                        "line": r["start_line"],
+                        "highlight": r["snippet"] or "",
+                        "score": fallback_score
+                    })
+                    if len(results) >= limit:
+                        break
+            except sqlite3.Error:
                 pass
 
         # Search components
@@ -1126,7 +3442,9 @@ def hybrid_search(
     db_path: Path,
     query: str,
     limit: int = 10,
-    weights: Optional[Dict[str, float]] = None
+    weights: Optional[Dict[str, float]] = None,
+    use_cache: bool = True,
+    exact: bool = False,
 ) -> List[Dict]:
     """
     Hybrid search combining semantic, symbol, and full-text search.
@@ -1134,81 +3452,103 @@ def hybrid_search(
     Results are ranked using weighted scoring:
     - semantic: Embedding similarity (0.4)
     - symbol: Function/class name match (0.35)
-    - fulltext: FTS5 keyword match (0.25)
+    - fulltext: FTS5 keyword match (0.25), normalized bm25
 
     Returns combined, deduplicated results sorted by final score.
+    Results are served from the query cache until the next sync.
+    exact=True makes the semantic leg skip the ANN index.
     """
     if weights is None:
         weights = SEARCH_WEIGHTS
 
-    all_results: Dict[str, Dict] = {}  # key: (file_path, line) -> result
+    return cached_search(
+        db_path, "hybrid:exact" if exact else "hybrid", query, limit,
+        lambda status: _hybrid_search(db_path, query, limit, weights, exact=exact,
+                                      status=status),
+        weights=weights, use_cache=use_cache,
+    )
 
-    # 1. Symbol search (fast, high precision for function/class names)
-    symbol_results = symbol_search(db_path, query, limit=limit * 2)
-    for r in symbol_results:
-        key = f"{r['file_path']}:{r.get('line', 0)}"
-        if key not in all_results:
-            all_results[key] = {
-                "type": r["type"],
-                "name": r.get("name", ""),
-                "file_path": r["file_path"],
-                "line": r.get("line"),
-                "chunk_type": r.get("symbol_type"),
-                "content": r.get("content", "")[:200],
-                "scores": {"semantic": 0, "symbol": 0, "fulltext": 0},
-                "match_types": []
-            }
-        all_results[key]["scores"]["symbol"] = r["score"]
-        all_results[key]["match_types"].append(f"symbol:{r.get('match_type', 'match')}")
-
-    # 2. Full-text search (good for keyword matches)
-    text_results = text_search(db_path, query, limit=limit * 2)
-    for r in text_results:
-        key = f"{r['file_path']}:{r.get('line', 0)}"
-        if key not in all_results:
-            all_results[key] = {
-                "type": r["type"],
-                "name": r.get("name", ""),
-                "file_path": r["file_path"],
-                "line": r.get("line"),
-                "chunk_type": r.get("chunk_type"),
-                "content": r.get("highlight", "")[:200],
-                "scores": {"semantic": 0, "symbol": 0, "fulltext": 0},
-                "match_types": []
-            }
-        all_results[key]["scores"]["fulltext"] = r["score"]
-        all_results[key]["match_types"].append("fulltext")
 
-    # 3. Semantic/vector search (if embeddings available)
-    try:
-        semantic_results = vector_search(db_path, query, limit=limit * 2)
-        for r in semantic_results:
-            key = f"{r['file_path']}:{r.get('line', 0)}"
-            if key not in all_results:
-                all_results[key] = {
+def _hybrid_search(
+    db_path: Path,
+    query: str,
+    limit: int,
+    weights: Dict[str, float],
+    timings: Optional[Dict[str, float]] = None,
+    exact: bool = False,
+    status: Optional[Dict[str, Any]] = None,
+) -> List[Dict]:
+    """
+    Run the three legs concurrently, each with its own candidate budget, and
+    fuse their scores. Per-leg and total latency (ms) go into `timings`;
+    status["degraded"] is set if a leg failed or answered without its input
+    (see cached_search).
+    """
+    if status is None:
+        status = {}
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    t_start = time.perf_counter()
+    budgets = {
+        leg: max(limit * mult, floor)
+        for leg, (mult, floor) in SEARCH_LEG_BUDGETS.items()
+    }
+    legs = {
+        "symbol": lambda: fuzzy_symbol_search(db_path, query, limit=budgets["symbol"]),
+        "fulltext": lambda: text_search(db_path, query, limit=budgets["fulltext"]),
+        "semantic": lambda: vector_search(db_path, query, limit=budgets["semantic"], exact=exact,
+                                          status=status),
+    }
+    # A zero-weighted leg can't change the ranking; don't pay for it
+    legs = {leg: fn for leg, fn in legs.items() if weights.get(leg, 0) > 0}
+
+    def run_leg(fn):
+        t0 = time.perf_counter()
+        try:
+            out = fn()
+        except Exception:
+            out = []  # e.g. semantic search not available
+            status["degraded"] = True
+        return out, (time.perf_counter() - t0) * 1000
+
+    leg_results: Dict[str, List[Dict]] = {}
+    leg_ms: Dict[str, float] = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(legs))) as pool:
+        futures = {leg: pool.submit(run_leg, fn) for leg, fn in legs.items()}
+        for leg, fut in futures.items():
+            leg_results[leg], leg_ms[leg] = fut.result()
+
+    t_fuse = time.perf_counter()
+    all_results: Dict[Tuple[str, Optional[int]], Dict] = {}
+    for leg in ("symbol", "fulltext", "semantic"):
+        for r in leg_results.get(leg, []):
+            key = (r["file_path"], r.get("line"))
+            result = all_results.get(key)
+            if result is None:
+                result = all_results[key] = {
                     "type": r["type"],
                     "name": r.get("name", ""),
                     "file_path": r["file_path"],
                     "line": r.get("line"),
-                    "chunk_type": r.get("chunk_type"),
-                    "content": r.get("content", "")[:200],
-                    "scores": {"semantic": 0, "symbol": 0, "fulltext": 0},
+                    "chunk_type": r.get("symbol_type") or r.get("chunk_type"),
+                    "content": (r.get("content") or r.get("highlight") or "")[:200],
+                    "scores": {"semantic": 0.0, "symbol": 0.0, "fulltext": 0.0},
                     "match_types": []
                 }
-            all_results[key]["scores"]["semantic"] = r["score"]
-            all_results[key]["match_types"].append("semantic")
-    except Exception:
-        pass  # Semantic search not available
-
-    # 4. Calculate weighted final scores
+            # Keep the best hit per leg (a chunk can match several symbols)
+            score = max(0.0, min(1.0, float(r["score"])))
+            if score > result["scores"][leg]:
+                result["scores"][leg] = score
+            match_type = f"symbol:{r.get('match_type', 'match')}" if leg == "symbol" else leg
+            if match_type not in result["match_types"]:
+                result["match_types"].append(match_type)
+
+    # Calculate weighted final scores
     final_results = []
-    for key, result in all_results.items():
+    for result in all_results.values():
         scores = result["scores"]
-        final_score = (
-            scores["semantic"] * weights.get("semantic", 0.4) +
-            scores["symbol"] * weights.get("symbol", 0.35) +
-            scores["fulltext"] * weights.get("fulltext", 0.25)
-        )
+        final_score = sum(scores[leg] * weights.get(leg, 0) for leg in scores)
 
         # Boost if matched by multiple search types
         match_count = sum(1 for s in scores.values() if s > 0)
@@ -1227,70 +3567,535 @@ def hybrid_search(
             "match_types": result["match_types"]
         })
 
-    # Sort by final score
     final_results.sort(key=lambda x: -x["score"])
 
-    return final_results[:limit]
+    if timings is not None:
+        for leg in ("symbol", "fulltext", "semantic"):
+            timings[f"{leg}_ms"] = round(leg_ms.get(leg, 0.0), 2)
+            timings[f"{leg}_hits"] = len(leg_results.get(leg, []))
+        timings["fusion_ms"] = round((time.perf_counter() - t_fuse) * 1000, 2)
+        timings["total_ms"] = round((time.perf_counter() - t_start) * 1000, 2)
 
+    return final_results[:limit]
 
-def vector_search(db_path: Path, query: str, limit: int = 10) -> List[Dict]:
-    """Vector similarity search using embeddings."""
-    if not check_ollama_available():
-        print("Ollama not available. Run: ollama pull nomic-embed-text", file=sys.stderr)
-        return []
 
-    query_embedding = get_embedding(query)
-    if not query_embedding:
-        return []
+def vector_search(db_path: Path, query: str, limit: int = 10, exact: bool = False,
+                  status: Optional[Dict[str, Any]] = None) -> List[Dict]:
+    """
+    Vector similarity search using embeddings.
 
-    query_vec = blob_to_vector(query_embedding)
-    results = []
+    Code chunks are looked up in the ANN index when one is current for this
+    DB generation; exact=True (or no usable index) scans every embedding.
+    Components are always scanned exactly. If the query can't be embedded
+    (Ollama down), returns [] and sets status["degraded"].
+    """
+    import heapq
 
-    con = sqlite3.connect(str(db_path))
+    con = connect_readonly(db_path)
     con.row_factory = sqlite3.Row
 
     try:
+        # Nothing embedded yet: skip the query embedding round trip entirely
+        has_embeddings = con.execute("""
+            SELECT EXISTS(SELECT 1 FROM code_chunks WHERE embedding IS NOT NULL)
+                OR EXISTS(SELECT 1 FROM components WHERE embedding IS NOT NULL)
+        """).fetchone()[0]
+        if not has_embeddings:
+            return []
+
+        query_embedding = get_query_embedding(db_path, query)
+        if not query_embedding:
+            if status is not None:
+                status["degraded"] = True
+            return []
+        query_vec = blob_to_vector(query_embedding)
+
+        # Candidates grouped by stored encoding so each group is dequantized
+        # and scored in one pass: {encoding: ([result], [blob])}
+        groups: Dict[str, Tuple[List[Dict], List[bytes]]] = {}
+
         # Search components with embeddings
         rows = con.execute("""
-            SELECT * FROM components WHERE embedding IS NOT NULL
-        """).fetchall()
+            SELECT name, type, file_path, embedding, embedding_model
+            FROM components WHERE embedding IS NOT NULL
+        """)
 
         for r in rows:
             if r["embedding"]:
-                vec = blob_to_vector(r["embedding"])
-                score = cosine_similarity(query_vec, vec)
-                results.append({
+                metas, blobs = groups.setdefault(embedding_encoding(r["embedding_model"]), ([], []))
+                metas.append({
                     "type": "component",
                     "name": r["name"],
                     "comp_type": r["type"],
                     "file_path": r["file_path"],
-                    "score": score
                 })
-
-        # Search code chunks with embeddings
-        rows = con.execute("""
-            SELECT * FROM code_chunks WHERE embedding IS NOT NULL
-        """).fetchall()
+                blobs.append(r["embedding"])
+
+        results = []
+        ann = None if exact else AnnIndex.for_db(db_path)
+        if ann is not None:
+            hits = dict(ann.search(query_vec, limit))
+            placeholders = ",".join("?" for _ in hits)
+            rows = con.execute(f"""
+                SELECT id, name, file_path, chunk_type, start_line,
+                       substr(content, 1, 100) AS snippet
+                FROM code_chunks WHERE id IN ({placeholders})
+            """, list(hits)) if hits else []
+            for r in rows:
+                results.append({
+                    "type": "code_chunk",
+                    "name": r["name"],
+                    "file_path": r["file_path"],
+                    "chunk_type": r["chunk_type"],
+                    "line": r["start_line"],
+                    "content": r["snippet"] or "",
+                    "score": hits[r["id"]],
+                })
+            rows = []
+        else:
+            # Search code chunks with embeddings
+            rows = con.execute("""
+                SELECT name, file_path, chunk_type, start_line,
+                       substr(content, 1, 100) AS snippet, embedding, embedding_model
+                FROM code_chunks WHERE embedding IS NOT NULL
+            """)
 
         for r in rows:
             if r["embedding"]:
-                vec = blob_to_vector(r["embedding"])
-                score = cosine_similarity(query_vec, vec)
-                results.append({
+                metas, blobs = groups.setdefault(embedding_encoding(r["embedding_model"]), ([], []))
+                metas.append({
                     "type": "code_chunk",
+                    "name": r["name"],
                     "file_path": r["file_path"],
                     "chunk_type": r["chunk_type"],
-                    "content": (r["content"] or "")[:100],
-                    "score": score
+                    "line": r["start_line"],
+                    "content": r["snippet"] or "",
                 })
+                blobs.append(r["embedding"])
+
+        for encoding, (metas, blobs) in groups.items():
+            for meta, score in zip(metas, cosine_scores(query_vec, blobs, encoding)):
+                meta["score"] = score
+                results.append(meta)
+
+    finally:
+        con.close()
+
+    return heapq.nlargest(limit, results, key=lambda x: x["score"])
+
+
+def benchmark_hybrid(
+    db_path: Path,
+    queries: List[str],
+    limit: int = 10,
+    runs: int = 5,
+) -> Dict[str, Any]:
+    """
+    Time hybrid search per leg (uncached) plus one cached lookup per query.
+
+    Returns {"queries": [{query, runs, <leg>_ms: {mean, p50, max}, ...}]}.
+    """
+    import statistics
+    import time
+
+    report: Dict[str, Any] = {"db": str(db_path), "limit": limit, "runs": runs, "queries": []}
+    for query in queries:
+        samples: Dict[str, List[float]] = {}
+        hits: Dict[str, int] = {}
+        for _ in range(runs):
+            timings: Dict[str, float] = {}
+            _hybrid_search(db_path, query, limit, SEARCH_WEIGHTS, timings=timings)
+            for k, v in timings.items():
+                if k.endswith("_hits"):
+                    hits[k] = int(v)
+                else:
+                    samples.setdefault(k, []).append(v)
+
+        # Warm the query cache, then time a hit
+        hybrid_search(db_path, query, limit)
+        t0 = time.perf_counter()
+        hybrid_search(db_path, query, limit)
+        cached_ms = (time.perf_counter() - t0) * 1000
+
+        entry: Dict[str, Any] = {"query": query}
+        for k, values in samples.items():
+            entry[k] = {
+                "mean": round(statistics.mean(values), 2),
+                "p50": round(statistics.median(values), 2),
+                "max": round(max(values), 2),
+            }
+        entry.update(hits)
+        entry["cached_ms"] = round(cached_ms, 2)
+        report["queries"].append(entry)
+    return report
+
+
+def benchmark_quantization(
+    db_path: Path,
+    k: int = 10,
+    num_queries: int = 50,
+) -> Dict[str, Any]:
+    """
+    recall@k of float16 / int8 storage against float32 on this DB's vectors.
+
+    Stored chunk embeddings are decoded, re-encoded in each encoding, and
+    searched with a sample of the same vectors as queries (self excluded).
+    Reports recall against the float32 top-k, bytes per vector and scan time.
+    """
+    import heapq
+    import random
+    import statistics
+    import time
+
+    con = sqlite3.connect(str(db_path))
+    try:
+        rows = con.execute("""
+            SELECT embedding, embedding_model FROM code_chunks
+            WHERE embedding IS NOT NULL
+        """).fetchall()
+    finally:
+        con.close()
+
+    vectors = [blob_to_vector(blob, embedding_encoding(tag)) for blob, tag in rows]
+    source = sorted({embedding_encoding(tag) for _, tag in rows})
+    report: Dict[str, Any] = {
+        "db": str(db_path), "vectors": len(vectors), "k": k,
+        "stored_encodings": source, "encodings": {},
+    }
+    if len(vectors) <= k:
+        return report
+
+    query_ids = random.Random(0).sample(range(len(vectors)), min(num_queries, len(vectors)))
+    report["queries"] = len(query_ids)
+
+    def top_k(scores: List[float], exclude: int) -> set:
+        ranked = heapq.nlargest(k + 1, range(len(scores)), key=scores.__getitem__)
+        return set(i for i in ranked if i != exclude)
+
+    reference = {}
+    for encoding in EMBEDDING_ENCODINGS:
+        blobs = [encode_embedding(v, encoding) for v in vectors]
+        recalls, timings = [], []
+        for qi in query_ids:
+            t0 = time.perf_counter()
+            scores = cosine_scores(vectors[qi], blobs, encoding)
+            timings.append((time.perf_counter() - t0) * 1000)
+            hits = top_k(scores, qi)
+            if encoding == "float32":
+                reference[qi] = hits
+            truth = reference[qi]
+            recalls.append(len(hits & truth) / len(truth) if truth else 1.0)
+
+        report["encodings"][encoding] = {
+            f"recall@{k}": round(statistics.mean(recalls), 4),
+            "bytes_per_vector": len(blobs[0]),
+            "total_mb": round(sum(map(len, blobs)) / 1e6, 2),
+            "scan_ms_p50": round(statistics.median(timings), 2),
+        }
+    return report
+
+
+def benchmark_ann(
+    db_path: Path,
+    k: int = 10,
+    num_queries: int = 50,
+    backends: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Recall@k and latency of each ANN backend against an exact scan.
+
+    Indexes are built in memory from this DB's chunk embeddings (the persisted
+    index is not touched); a sample of the stored vectors serves as queries.
+    """
+    import statistics
+    import time
+    import numpy as np
+
+    con = sqlite3.connect(str(db_path))
+    try:
+        t0 = time.perf_counter()
+        ids, vectors = load_chunk_vectors(con)
+        load_ms = (time.perf_counter() - t0) * 1000
+    finally:
+        con.close()
+
+    report: Dict[str, Any] = {"db": str(db_path), "vectors": len(ids), "k": k,
+                              "exact_load_ms": round(load_ms, 2), "backends": {}}
+    if len(ids) <= k:
+        return report
+
+    rng = np.random.default_rng(0)
+    queries = vectors[rng.choice(len(ids), min(num_queries, len(ids)), replace=False)]
+    report["queries"] = len(queries)
+
+    truth, exact_ms = [], []
+    for q in queries:
+        t0 = time.perf_counter()
+        top = np.argpartition(-(vectors @ q), k)[:k]
+        exact_ms.append((time.perf_counter() - t0) * 1000)
+        truth.append(set(ids[top].tolist()))
+    report["exact_scan_ms_p50"] = round(statistics.median(exact_ms), 3)
+
+    if backends is None:
+        backends = ["ivf"] + (["hnsw"] if _hnswlib_available() else [])
+    for backend in backends:
+        t0 = time.perf_counter()
+        index = AnnIndex.build(ids, vectors, 0, backend)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        recalls, search_ms = [], []
+        for q, expected in zip(queries, truth):
+            t0 = time.perf_counter()
+            hits = index.search(q, k)
+            search_ms.append((time.perf_counter() - t0) * 1000)
+            recalls.append(len({h for h, _ in hits} & expected) / len(expected))
+
+        report["backends"][backend] = {
+            f"recall@{k}": round(statistics.mean(recalls), 4),
+            "search_ms_p50": round(statistics.median(search_ms), 3),
+            "build_ms": round(build_ms, 1),
+        }
+    return report
+
+
+def benchmark_chunkers(project_root: Path, runs: int = 3) -> Dict[str, Any]:
+    """
+    Chunk every supported file under project_root with the regex chunkers and
+    with the registered (parser-backed) chunkers.
+
+    Returns per-extension file counts, and per backend: best-of-`runs` time,
+    chunk count, mean/max chunk lines and symbols extracted.
+    """
+    import time
+
+    files: Dict[str, List[Tuple[str, str]]] = {}
+    for path, rel_path, _language, _size in iter_source_files(project_root):
+        ext = os.path.splitext(rel_path)[1].lower()
+        if ext not in CHUNKERS:
+            continue
+        try:
+            content = Path(path).read_text(encoding="utf-8")
+        except Exception:
+            continue
+        files.setdefault(ext, []).append((rel_path, content))
+
+    report: Dict[str, Any] = {"project": str(project_root), "runs": runs, "extensions": {}}
+    for ext, entries in sorted(files.items()):
+        entry: Dict[str, Any] = {"files": len(entries)}
+        parser_chunker = CHUNKERS[ext]
+        backends = {"regex": REGEX_CHUNKERS[ext], "parser": parser_chunker}
+        if isinstance(parser_chunker, TreeSitterChunker) and parser_chunker.parser is None:
+            entry["parser_unavailable"] = parser_chunker.grammar
+
+        for backend, chunker in backends.items():
+            best_ms = None
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                chunks = [c for rel, content in entries for c in chunker.chunk(content, rel)]
+                ms = (time.perf_counter() - t0) * 1000
+                best_ms = ms if best_ms is None else min(best_ms, ms)
+            sizes = [c.end_line - c.start_line + 1 for c in chunks]
+            entry[backend] = {
+                "ms": round(best_ms, 2),
+                "chunks": len(chunks),
+                "mean_lines": round(sum(sizes) / len(sizes), 1) if sizes else 0,
+                "max_lines": max(sizes, default=0),
+                "symbols": sum(len(c.symbols) for c in chunks),
+            }
+        report["extensions"][ext] = entry
+    return report
+
+
+# ============================================================
+# FEDERATED SEARCH
+# ============================================================
+#
+# Every project keeps its own vibe.db (a shard). A global catalog records
+# where the shards are and the generation each was last synced at; sync
+# registers its project automatically. Federated results go through the
+# same QueryCache as single-project ones, keyed on each shard's live
+# generation, so a watch-mode or memory-index write invalidates them too.
+
+FEDERATED_TIMEOUT = 5.0   # seconds before slow shards are left out
+FEDERATED_WORKERS = 8
+
+CATALOG_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS shards (
+        project_path TEXT PRIMARY KEY,
+        db_path TEXT NOT NULL,
+        generation INTEGER NOT NULL DEFAULT 0,
+        chunks INTEGER DEFAULT 0,
+        symbols INTEGER DEFAULT 0,
+        updated_at TEXT DEFAULT (datetime('now'))
+    );
+
+    CREATE TABLE IF NOT EXISTS metadata (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        updated_at TEXT DEFAULT (datetime('now'))
+    );
+"""
+
+
+def get_catalog_path() -> Path:
+    """Global shard catalog ($VIBE_CATALOG or ~/.claude/vibe-catalog.db)."""
+    env = os.environ.get("VIBE_CATALOG")
+    return Path(env) if env else Path.home() / ".claude" / "vibe-catalog.db"
+
+
+def connect_catalog() -> sqlite3.Connection:
+    path = get_catalog_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(str(path), timeout=2.0)
+    con.executescript(CATALOG_SCHEMA)
+    return con
+
+
+def register_shard(project_root: Path, db_path: Path) -> None:
+    """Record (or refresh) a project's shard and its generation in the catalog."""
+    shard = connect_readonly(db_path)
+    try:
+        chunks = shard.execute("SELECT COUNT(*) FROM code_chunks").fetchone()[0]
+        symbols = shard.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+    finally:
+        shard.close()
+
+    con = connect_catalog()
+    try:
+        con.execute("""
+            INSERT INTO shards (project_path, db_path, generation, chunks, symbols, updated_at)
+            VALUES (?, ?, ?, ?, ?, datetime('now'))
+            ON CONFLICT(project_path) DO UPDATE SET
+                db_path = excluded.db_path, generation = excluded.generation,
+                chunks = excluded.chunks, symbols = excluded.symbols,
+                updated_at = excluded.updated_at
+        """, (str(project_root), str(db_path), get_db_generation(db_path), chunks, symbols))
+        bump_db_generation(con)
+        con.commit()
+    finally:
+        con.close()
+
+
+def unregister_shard(project_path: str) -> bool:
+    con = connect_catalog()
+    try:
+        removed = con.execute(
+            "DELETE FROM shards WHERE project_path = ?", (project_path,)
+        ).rowcount
+        if removed:
+            bump_db_generation(con)
+        con.commit()
+        return bool(removed)
+    finally:
+        con.close()
 
-        # Sort by score descending
-        results.sort(key=lambda x: x["score"], reverse=True)
 
+def list_shards() -> List[Dict[str, Any]]:
+    """Registered shards, with `exists` set for those whose vibe.db is present."""
+    if not get_catalog_path().exists():
+        return []
+    con = connect_catalog()
+    con.row_factory = sqlite3.Row
+    try:
+        rows = con.execute("SELECT * FROM shards ORDER BY project_path").fetchall()
     finally:
         con.close()
+    return [dict(r, exists=Path(r["db_path"]).exists()) for r in rows]
+
+
+def federated_search(
+    query: str,
+    mode: str = "hybrid",
+    limit: int = 10,
+    timeout: float = FEDERATED_TIMEOUT,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Run one search mode (hybrid, text, symbol or vector) against every
+    registered shard concurrently, each opened read-only, and merge the
+    per-shard top-k by score. Each result gains a "project" key.
+
+    Returns {"results", "shards", "timed_out", "failed", "elapsed_ms",
+    "cached"}. A shard whose search raised (e.g. an old schema) is listed in
+    "failed". Answers with a timed-out or failed shard, or one that answered
+    without its query embedding, are not cached.
+    """
+    import time
+    from concurrent.futures import ThreadPoolExecutor, wait
+
+    t0 = time.perf_counter()
+    catalog = get_catalog_path()
+    shards = [s for s in list_shards() if s["exists"]]
+    answer: Dict[str, Any] = {"results": [], "shards": len(shards), "timed_out": [], "failed": [],
+                              "cached": False}
+
+    cache = QueryCache(catalog) if use_cache and shards else None
+    key = None
+    if cache is not None:
+        # Writers other than sync (watch, requantize, memory-index) bump only
+        # the shard's generation, not the catalog's
+        versions = [(s["project_path"], get_db_generation(Path(s["db_path"]))) for s in shards]
+        key = QueryCache.make_key("federated", mode, query, limit, versions)
+    try:
+        if cache is not None:
+            cached = cache.get_results(key)
+            if cached is not None:
+                answer.update(results=cached, cached=True)
+                answer["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+                return answer
+
+        searches = {
+            "hybrid": lambda db, status: _hybrid_search(db, query, limit, SEARCH_WEIGHTS,
+                                                        status=status),
+            "text": lambda db, status: text_search(db, query, limit),
+            "symbol": lambda db, status: fuzzy_symbol_search(db, query, limit),
+            "vector": lambda db, status: vector_search(db, query, limit, status=status),
+        }
+        search = searches[mode]
+        if mode in ("hybrid", "vector") and check_ollama_available():
+            # Embed once, next to the catalog; shards then hit the memo
+            get_query_embedding(catalog, query)
+
+        def run_shard(shard):
+            """(hits, status); status["failed"] holds the error of a broken shard."""
+            status: Dict[str, Any] = {}
+            try:
+                hits = search(Path(shard["db_path"]), status)
+            except Exception as e:
+                hits = []  # e.g. shard from an older schema
+                status["failed"] = str(e)
+            for hit in hits:
+                hit["project"] = shard["project_path"]
+            return hits, status
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(FEDERATED_WORKERS, len(shards))))
+        try:
+            futures = {pool.submit(run_shard, s): s for s in shards}
+            done, pending = wait(futures, timeout=timeout)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        merged: List[Dict] = []
+        degraded = False
+        for fut in done:
+            hits, status = fut.result()
+            merged.extend(hits)
+            if "failed" in status:
+                answer["failed"].append(futures[fut]["project_path"])
+            degraded = degraded or status.get("degraded", False)
+        answer["timed_out"] = sorted(futures[f]["project_path"] for f in pending)
+        answer["failed"].sort()
+        merged.sort(key=lambda r: (-r["score"], r["project"]))
+        answer["results"] = merged[:limit]
+
+        if cache is not None and not (pending or answer["failed"] or degraded):
+            cache.put_results(key, answer["results"])
+    finally:
+        if cache is not None:
+            cache.close()
 
-    return results[:limit]
+    answer["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 2)
+    return answer
 
 
 # ============================================================
@@ -1305,35 +4110,121 @@ def main():
 
     # init
     init_parser = subparsers.add_parser("init", help="Initialize/upgrade vibe.db schema")
+    init_parser.add_argument("--reindex", action="store_true", help="Also rebuild all FTS tables")
 
     # sync
     sync_parser = subparsers.add_parser("sync", help="Sync project with language-aware chunking")
     sync_parser.add_argument("--embeddings", action="store_true", help="Generate embeddings (requires Ollama)")
     sync_parser.add_argument("--project", type=str, help="Project path (default: auto-detect)")
+    sync_parser.add_argument("--encoding", choices=EMBEDDING_ENCODINGS, default="float32",
+                             help="Embedding storage encoding (float16/int8 are 2x/4x smaller)")
+    sync_parser.add_argument("--max-file-kb", type=int, default=SYNC_MAX_FILE_BYTES // 1024,
+                             help="Skip source files larger than this (0 = no limit)")
 
     # hsearch - hybrid search (NEW)
     hsearch_parser = subparsers.add_parser("hsearch", help="Hybrid search (semantic + symbol + text)")
     hsearch_parser.add_argument("query", help="Search query")
     hsearch_parser.add_argument("--limit", type=int, default=10)
     hsearch_parser.add_argument("--json", action="store_true")
+    hsearch_parser.add_argument("--no-cache", action="store_true", help="Bypass the query cache")
+    hsearch_parser.add_argument("--exact", action="store_true",
+                                help="Brute-force the semantic leg instead of using the ANN index")
 
     # symbol - symbol search (NEW)
     symbol_parser = subparsers.add_parser("symbol", help="Search function/class/component names")
     symbol_parser.add_argument("query", help="Symbol name to search")
     symbol_parser.add_argument("--limit", type=int, default=20)
+    symbol_parser.add_argument("--fuzzy", action="store_true", help="Typo/camelCase tolerant matching")
     symbol_parser.add_argument("--json", action="store_true")
+    symbol_parser.add_argument("--no-cache", action="store_true", help="Bypass the query cache")
 
     # search - text search
     search_parser = subparsers.add_parser("search", help="Full-text search vibe.db")
     search_parser.add_argument("query", help="Search query")
     search_parser.add_argument("--limit", type=int, default=10)
     search_parser.add_argument("--json", action="store_true")
+    search_parser.add_argument("--mode", choices=FTS_QUERY_MODES, default="auto",
+                               help="FTS query mode (default: auto = AND, then OR)")
+    search_parser.add_argument("--no-cache", action="store_true", help="Bypass the query cache")
 
     # vsearch - vector search
     vsearch_parser = subparsers.add_parser("vsearch", help="Semantic/vector search vibe.db")
     vsearch_parser.add_argument("query", help="Search query")
     vsearch_parser.add_argument("--limit", type=int, default=10)
     vsearch_parser.add_argument("--json", action="store_true")
+    vsearch_parser.add_argument("--no-cache", action="store_true", help="Bypass the query cache")
+    vsearch_parser.add_argument("--exact", action="store_true",
+                                help="Brute-force scan instead of using the ANN index")
+
+    # bench - hybrid search latency per leg
+    bench_parser = subparsers.add_parser("bench", help="Benchmark hybrid search latency per leg")
+    bench_parser.add_argument("queries", nargs="+", help="Queries to time")
+    bench_parser.add_argument("--limit", type=int, default=10)
+    bench_parser.add_argument("--runs", type=int, default=5)
+    bench_parser.add_argument("--json", action="store_true")
+
+    # quantize - re-encode stored embeddings
+    quantize_parser = subparsers.add_parser(
+        "quantize", help="Re-encode stored embeddings (float32/float16/int8)")
+    quantize_parser.add_argument("encoding", choices=EMBEDDING_ENCODINGS)
+
+    # embed-bench - recall of quantized encodings vs float32
+    embed_bench_parser = subparsers.add_parser(
+        "embed-bench", help="Benchmark recall@k of float16/int8 embeddings vs float32")
+    embed_bench_parser.add_argument("--k", type=int, default=10)
+    embed_bench_parser.add_argument("--queries", type=int, default=50)
+    embed_bench_parser.add_argument("--json", action="store_true")
+
+    # watch - keep vibe.db live while files change
+    watch_parser = subparsers.add_parser("watch", help="Re-sync changed files as they change")
+    watch_parser.add_argument("--debounce", type=float, default=WATCH_DEBOUNCE,
+                              help="Seconds of quiet before a batch is synced")
+    watch_parser.add_argument("--poll", action="store_true", help="Poll instead of using watchdog")
+    watch_parser.add_argument("--embeddings", action="store_true", help="Embed re-chunked code (requires Ollama)")
+    watch_parser.add_argument("--encoding", choices=EMBEDDING_ENCODINGS, default="float32")
+    watch_parser.add_argument("--max-file-kb", type=int, default=SYNC_MAX_FILE_BYTES // 1024)
+    watch_parser.add_argument("--status", action="store_true", help="Report whether a watcher is running")
+    watch_parser.add_argument("--stop", action="store_true", help="Stop the running watcher")
+    watch_parser.add_argument("--session", help="Attach this session (e.g. a session id) to the watcher")
+    watch_parser.add_argument("--detach", action="store_true",
+                              help="Detach --session (or one anonymous session); the last one stops the watcher")
+    watch_parser.add_argument("--idle-timeout", type=float, default=WATCH_IDLE_TIMEOUT,
+                              help="Exit after this many seconds without changes (0: never)")
+
+    # fsearch - federated search across all registered projects
+    fsearch_parser = subparsers.add_parser("fsearch", help="Search every registered project's vibe.db")
+    fsearch_parser.add_argument("query", help="Search query")
+    fsearch_parser.add_argument("--mode", choices=["hybrid", "text", "symbol", "vector"], default="hybrid")
+    fsearch_parser.add_argument("--limit", type=int, default=10)
+    fsearch_parser.add_argument("--timeout", type=float, default=FEDERATED_TIMEOUT,
+                                help="Seconds to wait for slow shards")
+    fsearch_parser.add_argument("--json", action="store_true")
+    fsearch_parser.add_argument("--no-cache", action="store_true", help="Bypass the query cache")
+
+    # projects - manage the shard catalog
+    projects_parser = subparsers.add_parser("projects", help="List or edit projects registered for fsearch")
+    projects_parser.add_argument("--add", metavar="PATH", help="Register a synced project")
+    projects_parser.add_argument("--remove", metavar="PATH", help="Unregister a project")
+    projects_parser.add_argument("--prune", action="store_true", help="Drop projects whose vibe.db is gone")
+    projects_parser.add_argument("--json", action="store_true")
+
+    # ann - build/refresh the ANN index
+    ann_parser = subparsers.add_parser("ann", help="Build or refresh the ANN index for semantic search")
+    ann_parser.add_argument("--backend", choices=["auto", "ivf", "hnsw"], default="auto")
+    ann_parser.add_argument("--rebuild", action="store_true", help="Rebuild from scratch")
+
+    # ann-bench - ANN recall/latency vs exact scan
+    ann_bench_parser = subparsers.add_parser(
+        "ann-bench", help="Benchmark ANN recall@k and latency against exact search")
+    ann_bench_parser.add_argument("--k", type=int, default=10)
+    ann_bench_parser.add_argument("--queries", type=int, default=50)
+    ann_bench_parser.add_argument("--json", action="store_true")
+
+    # chunk-bench - compare chunker backends
+    chunk_bench_parser = subparsers.add_parser(
+        "chunk-bench", help="Benchmark parser-backed vs regex chunking on this project")
+    chunk_bench_parser.add_argument("--runs", type=int, default=3)
+    chunk_bench_parser.add_argument("--json", action="store_true")
 
     # status
     status_parser = subparsers.add_parser("status", help="Show vibe.db status")
@@ -1344,8 +4235,8 @@ def main():
     db_path = get_vibe_db_path(project_root)
 
     if args.command == "init":
-        ensure_schema(db_path)
-        print(f"Initialized: {db_path}")
+        ensure_schema(db_path, reindex=args.reindex)
+        print(f"Initialized: {db_path} (schema v{SCHEMA_VERSION})")
 
     elif args.command == "sync":
         ensure_schema(db_path)
@@ -1355,16 +4246,25 @@ def main():
             print("Continuing without embeddings...")
             args.embeddings = False
 
-        stats = sync_from_project_context(project_root, db_path, args.embeddings)
+        stats = sync_from_project_context(
+            project_root, db_path, args.embeddings, args.max_file_kb * 1024, args.encoding
+        )
         print(f"Synced: {stats}")
 
+        # Make this project searchable from fsearch
+        try:
+            register_shard(project_root, db_path)
+        except (sqlite3.Error, OSError) as e:
+            print(f"  Not registered in {get_catalog_path()}: {e}", file=sys.stderr)
+
     elif args.command == "hsearch":
         # Hybrid search (NEW)
         if not db_path.exists():
             print(f"vibe.db not found: {db_path}", file=sys.stderr)
             return 1
 
-        results = hybrid_search(db_path, args.query, args.limit)
+        results = hybrid_search(db_path, args.query, args.limit,
+                                use_cache=not args.no_cache, exact=args.exact)
 
         if args.json:
             print(json.dumps(results, indent=2))
@@ -1387,7 +4287,12 @@ def main():
             print(f"vibe.db not found: {db_path}", file=sys.stderr)
             return 1
 
-        results = symbol_search(db_path, args.query, args.limit)
+        search_fn = fuzzy_symbol_search if args.fuzzy else symbol_search
+        results = cached_search(
+            db_path, "fuzzy_symbol" if args.fuzzy else "symbol", args.query, args.limit,
+            lambda status: search_fn(db_path, args.query, args.limit),
+            use_cache=not args.no_cache,
+        )
 
         if args.json:
             print(json.dumps(results, indent=2))
@@ -1409,7 +4314,11 @@ def main():
             print(f"vibe.db not found: {db_path}", file=sys.stderr)
             return 1
 
-        results = text_search(db_path, args.query, args.limit)
+        results = cached_search(
+            db_path, f"text:{args.mode}", args.query, args.limit,
+            lambda status: text_search(db_path, args.query, args.limit, args.mode),
+            use_cache=not args.no_cache,
+        )
 
         if args.json:
             print(json.dumps(results, indent=2))
@@ -1425,7 +4334,12 @@ def main():
             print(f"vibe.db not found: {db_path}", file=sys.stderr)
             return 1
 
-        results = vector_search(db_path, args.query, args.limit)
+        results = cached_search(
+            db_path, "vector:exact" if args.exact else "vector", args.query, args.limit,
+            lambda status: vector_search(db_path, args.query, args.limit, exact=args.exact,
+                                         status=status),
+            use_cache=not args.no_cache,
+        )
 
         if args.json:
             print(json.dumps(results, indent=2))
@@ -1434,6 +4348,213 @@ def main():
                 print(f"[{r['type']}] {r.get('name', r.get('file_path', ''))} (similarity: {r['score']:.3f})")
                 print()
 
+    elif args.command == "bench":
+        if not db_path.exists():
+            print(f"vibe.db not found: {db_path}", file=sys.stderr)
+            return 1
+
+        report = benchmark_hybrid(db_path, args.queries, args.limit, args.runs)
+
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"Hybrid search benchmark ({args.runs} runs, limit {args.limit})")
+            print("=" * 60)
+            for q in report["queries"]:
+                print(f"{q['query']!r}")
+                for leg in ("symbol", "fulltext", "semantic", "fusion", "total"):
+                    t = q.get(f"{leg}_ms")
+                    if t:
+                        hits = q.get(f"{leg}_hits")
+                        hits_str = f"  ({hits} hits)" if hits is not None else ""
+                        print(f"  {leg:<9} p50 {t['p50']:8.2f} ms  max {t['max']:8.2f} ms{hits_str}")
+                print(f"  cached    {q['cached_ms']:8.2f} ms")
+                print()
+
+    elif args.command == "quantize":
+        if not db_path.exists():
+            print(f"vibe.db not found: {db_path}", file=sys.stderr)
+            return 1
+
+        stats = requantize_embeddings(db_path, args.encoding)
+        print(f"Re-encoded as {args.encoding}: {stats}")
+        if stats["converted"]:
+            print("Run VACUUM on vibe.db to reclaim the freed space.")
+
+    elif args.command == "embed-bench":
+        if not db_path.exists():
+            print(f"vibe.db not found: {db_path}", file=sys.stderr)
+            return 1
+
+        report = benchmark_quantization(db_path, args.k, args.queries)
+
+        if args.json:
+            print(json.dumps(report, indent=2))
+        elif not report["encodings"]:
+            print(f"Not enough embeddings to benchmark ({report['vectors']}). Run: sync --embeddings")
+        else:
+            print(f"Embedding quantization benchmark: {report['vectors']} vectors, "
+                  f"{report['queries']} queries (stored as {', '.join(report['stored_encodings'])})")
+            print("=" * 60)
+            for encoding, e in report["encodings"].items():
+                print(f"  {encoding:<8} recall@{args.k} {e[f'recall@{args.k}']:.3f}  "
+                      f"{e['bytes_per_vector']:5} B/vector  {e['total_mb']:8.2f} MB  "
+                      f"scan p50 {e['scan_ms_p50']:.2f} ms")
+
+    elif args.command == "watch":
+        import signal
+
+        pid = read_watch_pid(db_path)
+        if args.status or args.stop:
+            if pid is None:
+                print("No watcher running")
+                return 1 if args.status else 0
+            if args.stop:
+                os.kill(pid, signal.SIGTERM)
+                print(f"Stopped watcher (pid {pid})")
+            else:
+                print(f"Watcher running (pid {pid})")
+            return 0
+
+        if args.detach:
+            remaining = detach_watch_session(db_path, args.session)
+            if remaining is None:
+                print("Session not attached; watcher left running" if pid else "No watcher running")
+            elif remaining == 0 and pid is not None:
+                os.kill(pid, signal.SIGTERM)
+                print(f"Last session detached; stopped watcher (pid {pid})")
+            else:
+                print(f"Session detached; {remaining} still attached")
+            return 0
+
+        attach_watch_session(db_path, args.session)
+        if not acquire_watch_pid(db_path):
+            print(f"Watcher already running (pid {read_watch_pid(db_path)})")
+            return 0
+        try:
+            ensure_schema(db_path)
+            if args.embeddings and not check_ollama_available():
+                print("Warning: Ollama not available; watching without embeddings")
+                args.embeddings = False
+            # SIGTERM (watch --stop, session hooks) unwinds like Ctrl-C
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+            watch_project(project_root, db_path, args.debounce, args.embeddings,
+                          args.encoding, args.poll, args.max_file_kb * 1024,
+                          args.idle_timeout)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            release_watch_pid(db_path)
+            # Sessions attach to a running watcher; a new one starts afresh
+            _edit_watch_sessions(db_path, lambda keys: [])
+
+    elif args.command == "fsearch":
+        answer = federated_search(args.query, args.mode, args.limit, args.timeout,
+                                  use_cache=not args.no_cache)
+
+        if args.json:
+            print(json.dumps(answer, indent=2))
+        elif not answer["shards"]:
+            print("No projects registered. Run vibe-sync.py sync in each project (or projects --add PATH).")
+        else:
+            print(f"Federated {args.mode} search for: {args.query} "
+                  f"({answer['shards']} projects, {answer['elapsed_ms']:.0f} ms)")
+            print("=" * 60)
+            for r in answer["results"]:
+                kind = r.get("chunk_type") or r.get("symbol_type") or r["type"]
+                line = f":{r['line']}" if r.get("line") else ""
+                print(f"[{kind}] {r.get('name', '')}  (score: {r['score']:.2f})")
+                print(f"  {r['project']}/{r['file_path']}{line}")
+            if answer["timed_out"]:
+                print(f"\nTimed out: {', '.join(answer['timed_out'])}")
+            if answer["failed"]:
+                print(f"\nFailed (run vibe-sync.py init there): {', '.join(answer['failed'])}")
+
+    elif args.command == "projects":
+        if args.add:
+            root = Path(args.add).expanduser().resolve()
+            shard = get_vibe_db_path(root)
+            if not shard.exists():
+                print(f"vibe.db not found: {shard} (run sync there first)", file=sys.stderr)
+                return 1
+            register_shard(root, shard)
+            print(f"Registered {root}")
+        elif args.remove:
+            path = str(Path(args.remove).expanduser().resolve())
+            if not unregister_shard(path):
+                print(f"Not registered: {path}", file=sys.stderr)
+                return 1
+            print(f"Unregistered {path}")
+        elif args.prune:
+            gone = [s["project_path"] for s in list_shards() if not s["exists"]]
+            for path in gone:
+                unregister_shard(path)
+            print(f"Pruned {len(gone)} project(s)")
+        else:
+            shards = list_shards()
+            if args.json:
+                print(json.dumps(shards, indent=2))
+            else:
+                print(f"Registered projects ({len(shards)}) in {get_catalog_path()}")
+                for sh in shards:
+                    mark = "" if sh["exists"] else "  [missing]"
+                    print(f"  {sh['project_path']}  gen {sh['generation']}  "
+                          f"{sh['chunks']} chunks  {sh['symbols']} symbols{mark}")
+
+    elif args.command == "ann":
+        if not db_path.exists():
+            print(f"vibe.db not found: {db_path}", file=sys.stderr)
+            return 1
+
+        con = sqlite3.connect(str(db_path))
+        try:
+            meta = refresh_ann_index(con, db_path, get_db_generation(db_path),
+                                     args.backend, rebuild=args.rebuild)
+        finally:
+            con.close()
+        if meta:
+            print(f"ANN index ({meta['backend']}): {get_ann_index_dir(db_path)}")
+        else:
+            print(f"No ANN index: needs numpy and at least {ANN_MIN_VECTORS} chunk embeddings")
+
+    elif args.command == "ann-bench":
+        if not db_path.exists():
+            print(f"vibe.db not found: {db_path}", file=sys.stderr)
+            return 1
+
+        report = benchmark_ann(db_path, args.k, args.queries)
+
+        if args.json:
+            print(json.dumps(report, indent=2))
+        elif not report["backends"]:
+            print(f"Not enough embeddings to benchmark ({report['vectors']}). Run: sync --embeddings")
+        else:
+            print(f"ANN benchmark: {report['vectors']} vectors, {report['queries']} queries, k={args.k}")
+            print("=" * 60)
+            print(f"  exact    scan p50 {report['exact_scan_ms_p50']:8.3f} ms  "
+                  f"(+ {report['exact_load_ms']:.0f} ms to read vectors from vibe.db)")
+            for backend, b in report["backends"].items():
+                print(f"  {backend:<8} search p50 {b['search_ms_p50']:6.3f} ms  "
+                      f"recall@{args.k} {b[f'recall@{args.k}']:.3f}  build {b['build_ms']:.0f} ms")
+
+    elif args.command == "chunk-bench":
+        report = benchmark_chunkers(project_root, args.runs)
+
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print(f"Chunker benchmark: {report['project']} (best of {args.runs})")
+            print("=" * 60)
+            for ext, e in report["extensions"].items():
+                note = f"  [{e['parser_unavailable']} grammar not installed]" if "parser_unavailable" in e else ""
+                print(f"{ext}  {e['files']} files{note}")
+                for backend in ("regex", "parser"):
+                    b = e[backend]
+                    print(f"  {backend:<7} {b['ms']:9.2f} ms  {b['chunks']:6} chunks  "
+                          f"mean {b['mean_lines']:6.1f} / max {b['max_lines']:5} lines  "
+                          f"{b['symbols']} symbols")
+                print()
+
     elif args.command == "status":
         if not db_path.exists():
             print(f"vibe.db not found: {db_path}")
@@ -1492,7 +4613,31 @@ def main():
             except Exception:
                 pass
 
-            print(f"vibe.db v2.1 status: {db_path}")
+            # Leftovers the v2 unique key prevents; non-zero means not migrated
+            try:
+                row = con.execute("""
+                    SELECT COUNT(*) - COUNT(DISTINCT project_path || char(0) || file_path)
+                    FROM components
+                """).fetchone()
+                counts["duplicate_components"] = row[0]
+            except Exception:
+                counts["duplicate_components"] = 0
+
+            # Symbols symbol_search can't see; non-zero means not migrated
+            try:
+                row = con.execute("""
+                    SELECT COUNT(*) FROM symbols s
+                    WHERE NOT EXISTS (SELECT 1 FROM symbol_keys k WHERE k.symbol_id = s.id)
+                """).fetchone()
+                counts["unkeyed_symbols"] = row[0]
+            except Exception:
+                counts["unkeyed_symbols"] = counts["symbols"]
+
+            storage = storage_report(con)
+            schema_version = con.execute("PRAGMA user_version").fetchone()[0]
+
+            upgrade = " - run init to upgrade" if schema_version < SCHEMA_VERSION else ""
+            print(f"vibe.db status: {db_path} (schema v{schema_version}{upgrade})")
             print(f"  Size: {db_path.stat().st_size / 1024:.1f} KB")
             print()
             print("Code Context:")
@@ -1513,9 +4658,25 @@ def main():
                     print(f"  {lang}: {cnt} chunks")
                 print()
 
+            print("Storage:")
+            for t in storage["tables"][:8]:
+                pct = 100 * t["unused_bytes"] / t["bytes"] if t["bytes"] else 0
+                print(f"  {t['name']}: {t['bytes'] / 1024:.1f} KB ({pct:.0f}% unused)")
+            free_pct = 100 * storage["free_bytes"] / storage["total_bytes"] if storage["total_bytes"] else 0
+            print(f"  free pages: {storage['free_bytes'] / 1024:.1f} KB ({free_pct:.0f}% of file)")
+            if counts["duplicate_components"]:
+                print(f"  duplicate components: {counts['duplicate_components']} (run init to migrate)")
+            if free_pct >= 25:
+                print(f"  Reclaim with: sqlite3 {db_path} VACUUM")
+            print()
+
             print("Search Capabilities:")
             print(f"  Hybrid search: enabled (weights: {SEARCH_WEIGHTS})")
-            print(f"  Symbol search: enabled ({counts['symbols']} symbols)")
+            if counts["unkeyed_symbols"]:
+                print(f"  Symbol search: {counts['unkeyed_symbols']} of {counts['symbols']} "
+                      "symbols not keyed (run init to migrate)")
+            else:
+                print(f"  Symbol search: enabled ({counts['symbols']} symbols)")
             print(f"  Full-text search: enabled (FTS5)")
             if check_ollama_available():
                 print(f"  Semantic search: enabled ({EMBEDDING_MODEL})")
@@ -4,6 +4,11 @@ Skill Discovery Hook - PostToolUse hook for Read operations.
 
 Suggests relevant skills based on file content being read.
 
+Answers from the BM25 lexical index that skill-index.py writes next to
+index.db, so no model (or torch) is needed. Embeddings are only used to
+re-rank, or as a fallback, when a model is already warm. Ranked results are
+cached per context string until the index generation changes.
+
 CRITICAL: This hook MUST exit 0 always and never block Read operations.
 Uses signal.SIGALRM for hard timeout enforcement.
 
@@ -64,6 +69,9 @@ def get_config() -> dict:
         "renotify_delta": 0.20,
         "max_skills_per_notification": 3,
         "hook_timeout_ms": 100,
+        "lexical_threshold": 0.2,
+        "semantic_rerank": "warm",
+        "session_ttl_hours": 24,
         "log_level": "info"
     }
 
@@ -81,32 +89,75 @@ def log_debug(msg: str, config: dict):
 # Session State (De-duplication)
 # =============================================================================
 
-def get_session_state_path() -> Path:
-    """Get session state file path."""
-    session_id = os.environ.get("CLAUDE_SESSION_ID", "default")
-    return Path(__file__).parent / f".skill-session-{session_id}.json"
+# One SQLite table for all sessions: each claim is a single short
+# transaction, so concurrent hooks can't lose or double up notifications,
+# and rows past the TTL are dropped as they're touched.
+
+SESSION_STATE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS notified (
+        session_id TEXT NOT NULL,
+        skill_path TEXT NOT NULL,
+        relevance REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (session_id, skill_path)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_notified_updated ON notified(updated_at);
+"""
 
 
-def load_session_state() -> Dict[str, float]:
-    """Load session state (skill -> last_relevance)."""
-    state_path = get_session_state_path()
-    if state_path.exists():
-        try:
-            with open(state_path) as f:
-                return json.load(f)
-        except:
-            pass
-    return {}
+def get_session_state_path() -> Path:
+    """Get session state database path."""
+    return Path(__file__).parent / ".skill-session.db"
+
 
+def claim_notifications(results: List[Dict[str, Any]], config: dict) -> List[Dict[str, Any]]:
+    """
+    Pick the results to notify about and record them, atomically.
 
-def save_session_state(state: Dict[str, float]):
-    """Save session state."""
-    state_path = get_session_state_path()
+    State is (session, skill) -> last notified relevance. Reading, deciding
+    and writing happen in one BEGIN IMMEDIATE transaction, so parallel Reads
+    serialize instead of overwriting each other.
+    """
+    import sqlite3
+    import time
+    
+    session_id = os.environ.get("CLAUDE_SESSION_ID", "default")
+    max_skills = config.get("max_skills_per_notification", 3)
+    now = time.time()
+    
+    conn = sqlite3.connect(str(get_session_state_path()),
+                           timeout=config.get("hook_timeout_ms", 100) / 1000,
+                           isolation_level=None)
     try:
-        with open(state_path, "w") as f:
-            json.dump(state, f)
-    except:
-        pass  # Don't fail if we can't save state
+        conn.executescript(SESSION_STATE_SCHEMA)
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM notified WHERE updated_at < ?",
+                     (now - config.get("session_ttl_hours", 24) * 3600,))
+        state = dict(conn.execute(
+            "SELECT skill_path, relevance FROM notified WHERE session_id = ?", (session_id,)
+        ))
+        
+        to_notify = []
+        for result in results:
+            if should_notify(result["path"], result["relevance"], state, config):
+                to_notify.append(result)
+                if len(to_notify) >= max_skills:
+                    break
+        
+        conn.executemany("""
+            INSERT INTO notified (session_id, skill_path, relevance, updated_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(session_id, skill_path) DO UPDATE SET
+                relevance = excluded.relevance, updated_at = excluded.updated_at
+        """, [(session_id, r["path"], r["relevance"], now) for r in to_notify])
+        conn.execute("COMMIT")
+        return to_notify
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
 
 
 def should_notify(skill_path: str, relevance: float, state: Dict[str, float], config: dict) -> bool:
@@ -133,12 +184,18 @@ def should_notify(skill_path: str, relevance: float, state: Dict[str, float], co
 _model = None
 _index_loaded = False
 _skills_cache = []
+_lexical_index = None
 
+LEXICAL_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it its of on or that the "
+    "this to use used using when with your you".split()
+)
 
-def lazy_load_model():
-    """Lazy load the embedding model."""
+
+def lazy_load_model(load: bool = True):
+    """Lazy load the embedding model. With load=False, only return it if warm."""
     global _model
-    if _model is None:
+    if _model is None and load:
         try:
             from sentence_transformers import SentenceTransformer
             config = get_config()
@@ -166,9 +223,17 @@ def lazy_load_index() -> List[Dict[str, Any]]:
         import sqlite3
         conn = sqlite3.connect(str(db_path))
         conn.row_factory = sqlite3.Row
-        rows = conn.execute(
-            "SELECT id, path, title, category, description, embedding FROM skills"
-        ).fetchall()
+        try:
+            rows = conn.execute(
+                "SELECT id, path, title, category, description, embedding, embedding_model "
+                "FROM skills WHERE embedding IS NOT NULL"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # Index built before embedding_model existed: all float32
+            rows = conn.execute(
+                "SELECT id, path, title, category, description, embedding, NULL AS embedding_model "
+                "FROM skills WHERE embedding IS NOT NULL"
+            ).fetchall()
         conn.close()
         
         _skills_cache = [dict(row) for row in rows]
@@ -177,37 +242,174 @@ def lazy_load_index() -> List[Dict[str, Any]]:
         return []
 
 
-def search_skills(query: str, config: dict) -> List[Dict[str, Any]]:
-    """Search skills by semantic similarity."""
+def lazy_load_lexical_index() -> Optional[Dict[str, Any]]:
+    """Load lexical-index.json (built by skill-index.py index)."""
+    global _lexical_index
+    if _lexical_index is None:
+        try:
+            with open(Path(__file__).parent / "lexical-index.json") as f:
+                _lexical_index = json.load(f)
+        except (OSError, ValueError):
+            return None
+    return _lexical_index
+
+
+def tokenize(text: str) -> List[str]:
+    """Same tokenizer as skill-index.py; the two must agree."""
+    import re
+    tokens = []
+    for tok in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        if len(tok) < 2 or tok in LEXICAL_STOPWORDS:
+            continue
+        if len(tok) > 5 and tok.endswith("ing"):
+            tok = tok[:-3]
+        elif len(tok) > 4 and tok.endswith("ies"):
+            tok = tok[:-3] + "y"
+        elif len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+
+def lexical_search(query: str, config: dict) -> List[Dict[str, Any]]:
+    """
+    BM25 search over title, tags, category and description.
+
+    Relevance is the score divided by the best score the query's known
+    terms could reach, so it falls in 0..1 like cosine similarity.
+    """
+    import math
+    
+    index = lazy_load_lexical_index()
+    if not index or not index.get("docs"):
+        return []
+    
+    n_docs = len(index["docs"])
+    k1, b = index["k1"], index["b"]
+    avgdl = index["avgdl"] or 1.0
+    lengths = index["lengths"]
+    scores: Dict[int, float] = {}
+    ceiling = 0.0
+    for term in set(tokenize(query)):
+        plist = index["postings"].get(term)
+        if not plist:
+            continue
+        df = len(plist) // 2
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        ceiling += idf * (k1 + 1)
+        for i in range(0, len(plist), 2):
+            doc, tf = plist[i], plist[i + 1]
+            norm = k1 * (1 - b + b * lengths[doc] / avgdl)
+            scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    
+    threshold = config.get("lexical_threshold", 0.2)
+    results = []
+    for doc, score in scores.items():
+        relevance = score / ceiling
+        if relevance >= threshold:
+            path, title, category = index["docs"][doc]
+            results.append({
+                "path": path,
+                "title": title,
+                "category": category,
+                "relevance": relevance
+            })
+    
+    results.sort(key=lambda x: x["relevance"], reverse=True)
+    return results
+
+
+def _embedding_encoding(model_tag: Optional[str]) -> str:
+    """Encoding from skills.embedding_model ("model@int8"); untagged = float32."""
+    _, sep, encoding = (model_tag or "").rpartition("@")
+    return encoding if sep and encoding in ("float16", "int8") else "float32"
+
+
+def _dequantize(blobs: List[bytes], encoding: str):
+    """Decode equal-length embedding blobs into an (n, dim) float32 matrix."""
     import numpy as np
+    data = b"".join(blobs)
+    if encoding == "int8":
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(len(blobs), -1)
+        scales = raw[:, :4].copy().view(np.float32)
+        return raw[:, 4:].view(np.int8).astype(np.float32) * scales
+    dtype = np.float16 if encoding == "float16" else np.float32
+    return np.frombuffer(data, dtype=dtype).reshape(len(blobs), -1).astype(np.float32)
+
+
+def search_skills(query: str, config: dict) -> List[Dict[str, Any]]:
+    """
+    Search skills: lexical first, embeddings only when a model is warm.
+
+    semantic_rerank controls the model: "warm" (default) uses it only if it
+    is already loaded in this process, "always" loads it (needs a hook budget
+    of seconds), "never" is lexical only. With a model, each lexical hit
+    scores the better of its lexical and semantic relevance; if there are no
+    hits, it falls back to a full semantic search.
+    """
+    results = lexical_search(query, config)
     
-    model = lazy_load_model()
+    mode = config.get("semantic_rerank", "warm")
+    if mode == "never":
+        return results
+    model = lazy_load_model(load=(mode == "always"))
     if model is None:
-        return []
+        return results
+    
+    if not results:
+        return semantic_search(query, model, config)
+    
+    similarities = {
+        r["path"]: r["relevance"]
+        for r in semantic_search(query, model, config,
+                                 paths={r["path"] for r in results}, threshold=-1.0)
+    }
+    for result in results:
+        result["relevance"] = max(result["relevance"], similarities.get(result["path"], 0.0))
+    results.sort(key=lambda x: x["relevance"], reverse=True)
+    return results
+
+
+def semantic_search(query: str, model, config: dict, paths: Optional[set] = None,
+                    threshold: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Search skills by semantic similarity, optionally only among paths."""
+    import numpy as np
     
     skills = lazy_load_index()
+    if paths is not None:
+        skills = [s for s in skills if s["path"] in paths]
     if not skills:
         return []
     
     # Encode query
-    query_embedding = model.encode(query, normalize_embeddings=True)
+    query_embedding = model.encode(query, normalize_embeddings=True).astype(np.float32)
     
-    # Compute similarities
+    # Compute similarities: one matrix product per stored encoding
     results = []
-    threshold = config.get("relevance_threshold", 0.25)
+    if threshold is None:
+        threshold = config.get("relevance_threshold", 0.25)
     
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
     for skill in skills:
-        skill_embedding = np.frombuffer(skill["embedding"], dtype=np.float32)
-        similarity = float(np.dot(query_embedding, skill_embedding))
+        key = (_embedding_encoding(skill["embedding_model"]), len(skill["embedding"]))
+        groups.setdefault(key, []).append(skill)
+    
+    for (encoding, _), group in groups.items():
+        matrix = _dequantize([s["embedding"] for s in group], encoding)
+        if matrix.shape[1] != query_embedding.shape[0]:
+            continue
+        norms = np.linalg.norm(matrix, axis=1)
+        similarities = (matrix @ query_embedding) / np.where(norms > 0, norms, 1.0)
         
-        if similarity >= threshold:
-            results.append({
-                "path": skill["path"],
-                "title": skill["title"],
-                "category": skill["category"],
-                "description": skill["description"],
-                "relevance": similarity
-            })
+        for skill, similarity in zip(group, similarities.tolist()):
+            if similarity >= threshold:
+                results.append({
+                    "path": skill["path"],
+                    "title": skill["title"],
+                    "category": skill["category"],
+                    "description": skill["description"],
+                    "relevance": similarity
+                })
     
     # Sort by relevance
     results.sort(key=lambda x: x["relevance"], reverse=True)
@@ -215,6 +417,78 @@ def search_skills(query: str, config: dict) -> List[Dict[str, Any]]:
     return results
 
 
+# =============================================================================
+# Query Cache
+# =============================================================================
+
+# extract_context() only produces a few hundred distinct strings, so ranked
+# results are kept per context string in one small JSON file.
+QUERY_CACHE_MAX_ENTRIES = 2000
+
+
+def get_query_cache_path() -> Path:
+    """Get query cache file path."""
+    return Path(__file__).parent / ".query-cache.json"
+
+
+def read_index_generation() -> Optional[int]:
+    """Generation written by skill-index.py index, or None for older indexes."""
+    try:
+        return int((Path(__file__).parent / "index.generation").read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_fingerprint(generation: int, config: dict) -> list:
+    """Everything cached results depend on besides the context string."""
+    return [generation, config.get("lexical_threshold", 0.2),
+            config.get("relevance_threshold", 0.25), config.get("semantic_rerank", "warm")]
+
+
+def load_query_cache(fingerprint: list) -> Dict[str, Any]:
+    """Load cached results, or an empty cache if stale or unreadable."""
+    try:
+        with open(get_query_cache_path()) as f:
+            cache = json.load(f)
+        if cache.get("fingerprint") == fingerprint and isinstance(cache.get("entries"), dict):
+            return cache
+    except:
+        pass
+    return {"fingerprint": fingerprint, "entries": {}}
+
+
+def save_query_cache(cache: Dict[str, Any]):
+    """Save the cache atomically (concurrent hooks may race; last write wins)."""
+    entries = cache["entries"]
+    while len(entries) > QUERY_CACHE_MAX_ENTRIES:
+        del entries[next(iter(entries))]  # oldest first
+    cache_path = get_query_cache_path()
+    tmp = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(cache, f, separators=(",", ":"))
+        os.replace(tmp, cache_path)
+    except:
+        pass  # Don't fail if we can't save the cache
+
+
+def cached_search_skills(query: str, config: dict) -> List[Dict[str, Any]]:
+    """search_skills() memoized per query and index generation."""
+    generation = read_index_generation()
+    if generation is None:
+        return search_skills(query, config)
+    
+    cache = load_query_cache(_cache_fingerprint(generation, config))
+    results = cache["entries"].get(query)
+    if results is not None:
+        return results
+    
+    results = search_skills(query, config)
+    cache["entries"][query] = results
+    save_query_cache(cache)
+    return results
+
+
 # =============================================================================
 # Content Analysis
 # =============================================================================
@@ -349,27 +623,12 @@ def main() -> int:
         log_debug(f"Search context: {context}", config)
         
         # Search for relevant skills
-        results = search_skills(context, config)
+        results = cached_search_skills(context, config)
         if not results:
             return 0
         
-        # Load session state for de-duplication
-        state = load_session_state()
-        
-        # Filter by de-duplication rules
-        max_skills = config.get("max_skills_per_notification", 3)
-        to_notify = []
-        
-        for result in results:
-            if should_notify(result["path"], result["relevance"], state, config):
-                to_notify.append(result)
-                state[result["path"]] = result["relevance"]
-                if len(to_notify) >= max_skills:
-                    break
-        
-        # Save updated state
-        if to_notify:
-            save_session_state(state)
+        # Filter by de-duplication rules, recording what we notify
+        to_notify = claim_notifications(results, config)
         
         # Generate notification
         if to_notify:
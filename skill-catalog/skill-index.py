@@ -3,11 +3,14 @@
 Skill Index - Semantic search for Claude Code skills.
 
 Uses sentence-transformers for embeddings, SQLite for storage.
-Lazy model loading to minimize startup time.
+Lazy model loading to minimize startup time. Indexing also writes a BM25
+lexical index (lexical-index.json) that skill-discovery.py can search
+without loading the model.
 
 Usage:
     skill-index.py index              # Index all skills
     skill-index.py search <query>     # Semantic search
+    skill-index.py search --lexical <query>  # BM25 search, no model
     skill-index.py list               # List all indexed skills
     skill-index.py show <id>          # Show skill details
     skill-index.py health             # Health check
@@ -16,6 +19,7 @@ Usage:
 import argparse
 import hashlib
 import json
+import math
 import os
 import re
 import sqlite3
@@ -28,6 +32,24 @@ from typing import Optional, List, Dict, Any, Tuple
 _model = None
 _config = None
 
+# Stored embedding encodings. float16 halves and int8 (+ float32 scale)
+# quarters the blob; the choice is recorded in skills.embedding_model.
+EMBEDDING_ENCODINGS = ("float32", "float16", "int8")
+
+# Descriptions per model.encode() batch when (re)indexing
+ENCODE_BATCH_SIZE = 64
+
+# Lexical (BM25) index. Field weights multiply term frequency, so a title
+# word counts three times as much as a description word.
+LEXICAL_INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+LEXICAL_FIELD_WEIGHTS = (("title", 3), ("tags", 2), ("category", 2), ("description", 1))
+LEXICAL_STOPWORDS = frozenset(
+    "a an and are as at be by for from how in into is it its of on or that the "
+    "this to use used using when with your you".split()
+)
+
 # =============================================================================
 # Configuration
 # =============================================================================
@@ -43,6 +65,7 @@ def get_config() -> dict:
         else:
             _config = {
                 "model_name": "all-MiniLM-L6-v2",
+                "embedding_encoding": "float32",
                 "skill_sources": ["~/.claude/skills"],
                 "precedence": "project-first",
                 "log_level": "info"
@@ -55,6 +78,16 @@ def get_db_path() -> Path:
     return Path(__file__).parent / "index.db"
 
 
+def get_lexical_index_path() -> Path:
+    """Get the lexical index path (next to index.db)."""
+    return Path(__file__).parent / "lexical-index.json"
+
+
+def get_generation_path() -> Path:
+    """Get the index generation file; skill-discovery.py keys its query cache on it."""
+    return Path(__file__).parent / "index.generation"
+
+
 def get_skills_dirs() -> List[Path]:
     """Get skill source directories, expanded."""
     config = get_config()
@@ -89,31 +122,223 @@ def get_model():
     return _model
 
 
-def encode_text(text: str) -> bytes:
-    """Encode text to embedding bytes."""
+def model_available() -> bool:
+    """Whether sentence-transformers is importable (without importing it)."""
+    import importlib.util
+    return importlib.util.find_spec("sentence_transformers") is not None
+
+
+def get_embedding_encoding() -> str:
+    """Configured storage encoding for skill embeddings."""
+    encoding = get_config().get("embedding_encoding", "float32")
+    return encoding if encoding in EMBEDDING_ENCODINGS else "float32"
+
+
+def embedding_model_tag(encoding: str) -> str:
+    """Value stored in skills.embedding_model: model name, plus @encoding unless float32."""
+    model_name = get_config().get("model_name", "all-MiniLM-L6-v2")
+    return model_name if encoding == "float32" else f"{model_name}@{encoding}"
+
+
+def embedding_encoding(model_tag: Optional[str]) -> str:
+    """Encoding recorded in an embedding_model value (untagged = float32)."""
+    _, sep, encoding = (model_tag or "").rpartition("@")
+    return encoding if sep and encoding in EMBEDDING_ENCODINGS else "float32"
+
+
+def quantize_embedding(embedding, encoding: str) -> bytes:
+    """Pack a float vector for storage in the given encoding."""
+    import numpy as np
+    vec = np.asarray(embedding, dtype=np.float32)
+    if encoding == "float16":
+        return vec.astype(np.float16).tobytes()
+    if encoding == "int8":
+        # Symmetric per-vector scale: value ~= q * scale
+        scale = float(np.abs(vec).max()) / 127 or 1.0
+        q = np.clip(np.rint(vec / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).tobytes() + q.tobytes()
+    return vec.tobytes()
+
+
+def dequantize_embeddings(blobs: List[bytes], encoding: str):
+    """Decode equal-length blobs into one (n, dim) float32 matrix."""
+    import numpy as np
+    data = b"".join(blobs)
+    if encoding == "int8":
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(len(blobs), -1)
+        scales = raw[:, :4].copy().view(np.float32)
+        return raw[:, 4:].view(np.int8).astype(np.float32) * scales
+    dtype = np.float16 if encoding == "float16" else np.float32
+    return np.frombuffer(data, dtype=dtype).reshape(len(blobs), -1).astype(np.float32)
+
+
+def encode_query(text: str):
+    """Encode a query to a normalized float32 vector."""
     import numpy as np
     model = get_model()
-    embedding = model.encode(text, normalize_embeddings=True)
-    return embedding.astype(np.float32).tobytes()
+    return model.encode(text, normalize_embeddings=True).astype(np.float32)
 
 
-def cosine_similarity(emb1: bytes, emb2: bytes) -> float:
-    """Compute cosine similarity between two embedding byte arrays."""
+def encode_texts(texts: List[str], encoding: str = "float32",
+                 batch_size: int = ENCODE_BATCH_SIZE) -> List[bytes]:
+    """Encode texts to embedding bytes with one batched model call."""
+    if not texts:
+        return []
+    model = get_model()
+    vectors = model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return [quantize_embedding(vec, encoding) for vec in vectors]
+
+
+def score_embeddings(query_vec, rows: List[sqlite3.Row]) -> List[float]:
+    """
+    Cosine similarity of query_vec against each row's embedding, one matrix
+    product per stored encoding. Quantized vectors aren't unit length, so
+    they're renormalized after dequantizing.
+    """
     import numpy as np
-    arr1 = np.frombuffer(emb1, dtype=np.float32)
-    arr2 = np.frombuffer(emb2, dtype=np.float32)
-    # Already normalized, so dot product = cosine similarity
-    return float(np.dot(arr1, arr2))
+    scores = [0.0] * len(rows)
+    groups: Dict[Tuple[str, int], List[int]] = {}
+    for i, row in enumerate(rows):
+        key = (embedding_encoding(row["embedding_model"]), len(row["embedding"]))
+        groups.setdefault(key, []).append(i)
+
+    for (encoding, _), idx in groups.items():
+        matrix = dequantize_embeddings([rows[i]["embedding"] for i in idx], encoding)
+        if matrix.shape[1] != len(query_vec):
+            continue  # embedded with a different model; reindex
+        norms = np.linalg.norm(matrix, axis=1)
+        sims = (matrix @ query_vec) / np.where(norms > 0, norms, 1.0)
+        for i, sim in zip(idx, sims.tolist()):
+            scores[i] = sim
+    return scores
+
+
+# =============================================================================
+# Lexical Index
+# =============================================================================
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens minus stopwords, with plural/-ing endings folded
+    (hooks -> hook, testing -> test). skill-discovery.py mirrors this.
+    """
+    tokens = []
+    for tok in re.findall(r"[a-z0-9]+", (text or "").lower()):
+        if len(tok) < 2 or tok in LEXICAL_STOPWORDS:
+            continue
+        if len(tok) > 5 and tok.endswith("ing"):
+            tok = tok[:-3]
+        elif len(tok) > 4 and tok.endswith("ies"):
+            tok = tok[:-3] + "y"
+        elif len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        tokens.append(tok)
+    return tokens
+
+
+def build_lexical_index(conn: sqlite3.Connection, generation: int) -> Dict[str, Any]:
+    """
+    Build the BM25 index over title, tags, category and description.
+
+    Postings are flat [doc, tf, doc, tf, ...] lists keyed by term; docs are
+    [path, title, category] so a hit can be reported without touching SQLite.
+    """
+    docs = []
+    lengths = []
+    postings: Dict[str, List[int]] = {}
+    rows = conn.execute(
+        "SELECT path, title, category, tags, description FROM skills ORDER BY path"
+    ).fetchall()
+    for doc_id, row in enumerate(rows):
+        try:
+            tags = json.loads(row["tags"] or "[]")
+        except ValueError:
+            tags = []
+        fields = {
+            "title": row["title"],
+            "tags": " ".join(str(t) for t in tags) if isinstance(tags, list) else "",
+            "category": row["category"],
+            "description": row["description"],
+        }
+        tf: Dict[str, int] = {}
+        for field, weight in LEXICAL_FIELD_WEIGHTS:
+            for tok in tokenize(fields[field]):
+                tf[tok] = tf.get(tok, 0) + weight
+        for tok, count in tf.items():
+            postings.setdefault(tok, []).extend((doc_id, count))
+        docs.append([row["path"], row["title"], row["category"]])
+        lengths.append(sum(tf.values()))
+
+    return {
+        "version": LEXICAL_INDEX_VERSION,
+        "generation": generation,
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "avgdl": (sum(lengths) / len(lengths)) if lengths else 0.0,
+        "docs": docs,
+        "lengths": lengths,
+        "postings": postings,
+    }
+
+
+def write_lexical_index(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Rebuild lexical-index.json, bumping its generation; written atomically.
+    The generation also goes to index.generation, which invalidates cached
+    discovery results.
+    """
+    path = get_lexical_index_path()
+    generation = 0
+    try:
+        generation = int(get_generation_path().read_text().strip())
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(path) as f:
+            generation = max(generation, int(json.load(f).get("generation", 0)))
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    index = build_lexical_index(conn, generation + 1)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp, path)
+    get_generation_path().write_text(str(index["generation"]))
+    return index
+
+
+def lexical_scores(index: Dict[str, Any], query: str) -> Dict[int, float]:
+    """
+    BM25 score per matching doc, normalized to 0..1 by the best score the
+    query's known terms could reach (each term's idf * (k1 + 1)).
+    """
+    n_docs = len(index["docs"])
+    k1, b = index["k1"], index["b"]
+    avgdl = index["avgdl"] or 1.0
+    lengths = index["lengths"]
+    scores: Dict[int, float] = {}
+    ceiling = 0.0
+    for term in set(tokenize(query)):
+        plist = index["postings"].get(term)
+        if not plist:
+            continue
+        df = len(plist) // 2
+        idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        ceiling += idf * (k1 + 1)
+        for i in range(0, len(plist), 2):
+            doc, tf = plist[i], plist[i + 1]
+            norm = k1 * (1 - b + b * lengths[doc] / avgdl)
+            scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    return {doc: score / ceiling for doc, score in scores.items()} if ceiling else {}
 
 
 # =============================================================================
 # Database
 # =============================================================================
 
-def init_db(conn: sqlite3.Connection):
-    """Initialize database schema."""
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS skills (
+SKILLS_SCHEMA = """
+        CREATE TABLE IF NOT EXISTS {table} (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             path TEXT UNIQUE NOT NULL,
             title TEXT NOT NULL,
@@ -122,11 +347,41 @@ def init_db(conn: sqlite3.Connection):
             version TEXT,
             description TEXT NOT NULL,
             content_hash TEXT NOT NULL,
-            embedding BLOB NOT NULL,
+            embedding BLOB,  -- NULL until embedded (no model at index time)
             source TEXT NOT NULL,  -- 'global' or 'project'
-            indexed_at TEXT NOT NULL
+            indexed_at TEXT NOT NULL,
+            embedding_model TEXT,  -- model[@float16|@int8]
+            mtime_ns INTEGER,
+            size INTEGER
         )
-    """)
+"""
+
+SKILLS_COLUMNS = (
+    "id, path, title, category, tags, version, description, content_hash, "
+    "embedding, source, indexed_at, embedding_model, mtime_ns, size"
+)
+
+
+def init_db(conn: sqlite3.Connection):
+    """Initialize database schema."""
+    conn.execute(SKILLS_SCHEMA.format(table="skills"))
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(skills)")}
+    if "embedding_model" not in columns:
+        # Indexes from before quantization support: untagged = float32
+        conn.execute("ALTER TABLE skills ADD COLUMN embedding_model TEXT")
+    for column in ("mtime_ns", "size"):
+        if column not in columns:
+            # File stat at index time; NULL forces one re-hash
+            conn.execute(f"ALTER TABLE skills ADD COLUMN {column} INTEGER")
+    if any(row[1] == "embedding" and row[3] for row in conn.execute("PRAGMA table_info(skills)")):
+        # Indexes from before optional embeddings had embedding NOT NULL;
+        # SQLite can't drop a constraint, so rebuild the table
+        conn.execute("DROP TABLE IF EXISTS skills_rebuild")
+        conn.execute(SKILLS_SCHEMA.format(table="skills_rebuild"))
+        conn.execute(f"INSERT INTO skills_rebuild ({SKILLS_COLUMNS}) "
+                     f"SELECT {SKILLS_COLUMNS} FROM skills")
+        conn.execute("DROP TABLE skills")
+        conn.execute("ALTER TABLE skills_rebuild RENAME TO skills")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_skills_category ON skills(category)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_skills_source ON skills(source)")
     conn.commit()
@@ -255,7 +510,18 @@ def find_skill_files(dirs: List[Path]) -> List[Tuple[Path, str]]:
 # =============================================================================
 
 def cmd_index(args) -> int:
-    """Index all skills."""
+    """
+    Index all skills incrementally.
+
+    Files whose (mtime, size) match the stored row are skipped without being
+    read; changed files are re-hashed, and only real content changes are
+    re-embedded, in one batched model.encode() call. Rows for deleted skill
+    files are removed.
+
+    Embedding is optional: without sentence-transformers (or if encoding
+    fails) changed skills are stored with a NULL embedding and the lexical
+    index is still written; the next index run with a model embeds them.
+    """
     print("Indexing skills...")
     
     dirs = get_skills_dirs()
@@ -267,73 +533,137 @@ def cmd_index(args) -> int:
     print(f"Found {len(skill_files)} skill files in {len(dirs)} directories")
     
     conn = get_connection()
-    indexed = 0
-    updated = 0
+    encoding = get_embedding_encoding()
+    model_tag = embedding_model_tag(encoding)
+    default_tag = embedding_model_tag("float32")
+    embed = model_available()
     errors = 0
     
+    existing = {
+        row["path"]: row for row in conn.execute(
+            "SELECT path, content_hash, embedding_model, mtime_ns, size, "
+            "embedding IS NULL AS unembedded FROM skills"
+        )
+    }
+    
+    pending = []   # (path, source, parsed, content_hash, stat) to embed
+    touched = []   # (mtime_ns, size, path): content unchanged, stat moved
+    found = set()
     for path, source in skill_files:
+        key = str(path)
+        found.add(key)
+        try:
+            st = path.stat()
+        except OSError as e:
+            print(f"WARNING: Could not stat {path}: {e}", file=sys.stderr)
+            errors += 1
+            continue
+        
+        row = existing.get(key)
+        if embed:
+            same_model = (row is not None and not row["unembedded"]
+                          and (row["embedding_model"] or default_tag) == model_tag)
+        else:
+            same_model = row is not None  # keep stored vectors, whatever model
+        if same_model and row["mtime_ns"] == st.st_mtime_ns and row["size"] == st.st_size:
+            continue  # unchanged since last index
+        
         parsed = parse_skill_file(path)
         if not parsed:
             errors += 1
             continue
         
-        # Compute content hash
         content_hash = hashlib.sha256(parsed["full_content"].encode()).hexdigest()[:16]
-        
-        # Check if already indexed with same hash
-        existing = conn.execute(
-            "SELECT content_hash FROM skills WHERE path = ?",
-            (str(path),)
-        ).fetchone()
-        
-        if existing and existing["content_hash"] == content_hash:
-            # Already indexed and unchanged
+        if same_model and row["content_hash"] == content_hash:
+            touched.append((st.st_mtime_ns, st.st_size, key))
             continue
-        
-        # Generate embedding from description
+        pending.append((key, source, parsed, content_hash, st))
+    
+    # Embed every changed description in batched model calls
+    embeddings = [None] * len(pending)
+    if pending and not embed:
+        print(f"WARNING: sentence-transformers not installed; {len(pending)} skills "
+              "stored without embeddings (lexical search only)", file=sys.stderr)
+    elif pending:
         try:
-            embedding = encode_text(parsed["description"])
+            embeddings = encode_texts([p[2]["description"] for p in pending], encoding,
+                                      args.batch_size)
         except Exception as e:
-            print(f"ERROR encoding {path}: {e}", file=sys.stderr)
-            errors += 1
-            continue
-        
-        # Upsert into database
+            print(f"WARNING: encoding failed ({e}); {len(pending)} skills "
+                  "stored without embeddings", file=sys.stderr)
+    
+
+    now = datetime.now(timezone.utc).isoformat()
+    rows = []
+    for (key, source, parsed, content_hash, st), embedding in zip(pending, embeddings):
         tags_json = json.dumps(parsed["tags"]) if isinstance(parsed["tags"], list) else "[]"
-        
-        if existing:
-            conn.execute("""
-                UPDATE skills SET
-                    title = ?, category = ?, tags = ?, version = ?,
-                    description = ?, content_hash = ?, embedding = ?,
-                    source = ?, indexed_at = ?
-                WHERE path = ?
-            """, (
-                parsed["title"], parsed["category"], tags_json, parsed["version"],
-                parsed["description"], content_hash, embedding,
-                source, datetime.now(timezone.utc).isoformat(),
-                str(path)
-            ))
-            updated += 1
-        else:
-            conn.execute("""
-                INSERT INTO skills (path, title, category, tags, version,
-                    description, content_hash, embedding, source, indexed_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                str(path), parsed["title"], parsed["category"], tags_json,
-                parsed["version"], parsed["description"], content_hash,
-                embedding, source, datetime.now(timezone.utc).isoformat()
-            ))
-            indexed += 1
+        rows.append((
+            key, parsed["title"], parsed["category"], tags_json, parsed["version"],
+            parsed["description"], content_hash, embedding,
+            model_tag if embedding is not None else None,
+            source, now, st.st_mtime_ns, st.st_size
+        ))
+    conn.executemany("""
+        INSERT INTO skills (path, title, category, tags, version,
+            description, content_hash, embedding, embedding_model,
+            source, indexed_at, mtime_ns, size)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(path) DO UPDATE SET
+            title = excluded.title, category = excluded.category,
+            tags = excluded.tags, version = excluded.version,
+            description = excluded.description,
+            content_hash = excluded.content_hash, embedding = excluded.embedding,
+            embedding_model = excluded.embedding_model, source = excluded.source,
+            indexed_at = excluded.indexed_at,
+            mtime_ns = excluded.mtime_ns, size = excluded.size
+    """, rows)
+    conn.executemany("UPDATE skills SET mtime_ns = ?, size = ? WHERE path = ?", touched)
+    
+    # Garbage-collect skills whose files are gone (or no longer count as skills)
+    scanned = tuple(str(d) + os.sep for d in dirs)
+    removed = [
+        (key,) for key in existing
+        if key not in found and (key.startswith(scanned) or not os.path.exists(key))
+    ]
+    conn.executemany("DELETE FROM skills WHERE path = ?", removed)
     
     conn.commit()
+    if pending or removed or not get_lexical_index_path().exists():
+        lexical = write_lexical_index(conn)
+        print(f"Lexical index: {len(lexical['postings'])} terms "
+              f"(generation {lexical['generation']})")
     conn.close()
     
-    print(f"Done: {indexed} indexed, {updated} updated, {errors} errors")
+    updated = sum(1 for p in pending if p[0] in existing)
+    indexed = len(pending) - updated
+    print(f"Done: {indexed} indexed, {updated} updated, {len(removed)} removed, {errors} errors")
     return 0 if errors == 0 else 1
 
 
+def cmd_search_lexical(query: str) -> int:
+    """Search the BM25 lexical index (no model needed)."""
+    try:
+        with open(get_lexical_index_path()) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        print("No lexical index. Run 'skill-index.py index' first.")
+        return 1
+    
+    scores = lexical_scores(index, query)
+    ranked = sorted(scores.items(), key=lambda kv: -kv[1])[:10]
+    
+    print(f"Lexical results for: {query}")
+    print("-" * 60)
+    for doc, score in ranked:
+        path, title, category = index["docs"][doc]
+        print(f"\n[{score:.3f}] {title}")
+        print(f"  Category: {category}")
+        print(f"  Path: {path}")
+    if not ranked:
+        print("No relevant skills found.")
+    return 0
+
+
 def cmd_search(args) -> int:
     """Search skills by semantic similarity."""
     query = ' '.join(args.query)
@@ -341,25 +671,27 @@ def cmd_search(args) -> int:
         print("Usage: skill-index.py search <query>")
         return 1
     
+    if args.lexical:
+        return cmd_search_lexical(query)
+    
     # Encode query
     try:
-        query_embedding = encode_text(query)
+        query_embedding = encode_query(query)
     except Exception as e:
         print(f"ERROR encoding query: {e}", file=sys.stderr)
         return 1
     
     conn = get_connection()
-    rows = conn.execute("SELECT * FROM skills").fetchall()
+    rows = conn.execute("SELECT * FROM skills WHERE embedding IS NOT NULL").fetchall()
     
     if not rows:
-        print("No skills indexed. Run 'skill-index.py index' first.")
+        print("No skills embedded. Run 'skill-index.py index' with "
+              "sentence-transformers installed, or use --lexical.")
         return 1
     
     # Compute similarities
-    results = []
-    for row in rows:
-        similarity = cosine_similarity(query_embedding, row["embedding"])
-        results.append((similarity, dict(row)))
+    scores = score_embeddings(query_embedding, rows)
+    results = [(similarity, dict(row)) for similarity, row in zip(scores, rows)]
     
     # Sort by similarity descending
     results.sort(key=lambda x: x[0], reverse=True)
@@ -453,6 +785,7 @@ def cmd_health(args) -> int:
             config = get_config()
             print(f"     Model: {config.get('model_name', 'unknown')}")
             print(f"     Threshold: {config.get('relevance_threshold', 'unknown')}")
+            print(f"     Encoding: {get_embedding_encoding()}")
         except Exception as e:
             issues.append(f"Config parse error: {e}")
             print(f"[WARN] Config parse error: {e}")
@@ -467,6 +800,13 @@ def cmd_health(args) -> int:
         conn = get_connection()
         count = conn.execute("SELECT COUNT(*) as c FROM skills").fetchone()["c"]
         print(f"     {count} skills indexed")
+        unembedded = conn.execute(
+            "SELECT COUNT(*) as c FROM skills WHERE embedding IS NULL"
+        ).fetchone()["c"]
+        if unembedded:
+            issues.append(f"{unembedded} skills without embeddings")
+            print(f"[WARN] {unembedded} skills without embeddings "
+                  "(re-run 'index' with sentence-transformers installed)")
         if count == 0:
             issues.append("No skills indexed")
         conn.close()
@@ -474,6 +814,13 @@ def cmd_health(args) -> int:
         issues.append("index.db missing - run 'index' command")
         print("[WARN] index.db not created yet")
     
+    lexical_path = get_lexical_index_path()
+    if lexical_path.exists():
+        print(f"[OK] lexical-index.json exists ({lexical_path.stat().st_size / 1024:.1f} KB)")
+    else:
+        issues.append("lexical-index.json missing - run 'index' command")
+        print("[WARN] lexical-index.json not built yet (discovery hook needs it)")
+    
     # Check skill directories
     dirs = get_skills_dirs()
     if dirs:
@@ -518,11 +865,15 @@ def main():
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
     # index command
-    subparsers.add_parser("index", help="Index all skills")
+    index_parser = subparsers.add_parser("index", help="Index all skills")
+    index_parser.add_argument("--batch-size", type=int, default=ENCODE_BATCH_SIZE,
+                              help="Descriptions per embedding batch")
     
     # search command
     search_parser = subparsers.add_parser("search", help="Search skills")
     search_parser.add_argument("query", nargs="+", help="Search query")
+    search_parser.add_argument("--lexical", action="store_true",
+                               help="Search the BM25 index only (no model)")
     
     # list command
     subparsers.add_parser("list", help="List all indexed skills")